@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+"""Startup and import-time benchmarks for the buildben CLI.
+
+Measures wall time of ``bube --help``, ``bube proj --help``, ``bube exp`` and
+``bube snp`` in fresh interpreters, captures one ``-X importtime`` tree per
+case, and compares against ``benchmarks/baselines.json``.
+
+- *cold*: every run compiles buildben's bytecode into an empty
+  ``PYTHONPYCACHEPREFIX`` (the OS page cache cannot be dropped unprivileged).
+- *warm*: runs share one primed bytecode cache.
+- ``bube exp`` runs inside a throwaway scaffold, one new experiment per run.
+- ``bube snp`` runs in a project without ``uv.lock``, so it measures startup,
+  import and dispatch up to the first snapshot check, not ``uv build``.
+
+Usage::
+
+    python benchmarks/startup.py                    # compare against baseline
+    python benchmarks/startup.py --update-baseline  # record a new baseline
+    python benchmarks/startup.py -n 20 --tolerance 0.5
+
+Exits 1 if a case is slower than ``baseline * (1 + tolerance)`` (plus
+``--slack-ms``), or imports modules the baseline did not, on the same Python
+minor version. A case that exits with an unexpected status (e.g. a traceback
+at import) aborts the run before anything is compared or recorded.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+REPO_ROOT = BENCH_DIR.parent
+BASELINE_PATH = BENCH_DIR / "baselines.json"
+RESULTS_DIR = BENCH_DIR / "results"  # < importtime trees, not committed
+ENTRYPOINT = "import sys; from buildben.cli import main; sys.exit(main())"
+
+CASES: dict[str, list[str]] = {
+    "help": ["--help"],
+    "proj-help": ["proj", "--help"],
+    "exp": ["exp", "bench_{i}"],
+    "snp": ["snp", "experiments/bench"],
+}
+# > Exit status and stderr text of cases that stop early on purpose. Any other
+#   outcome means the command crashed, and its timing must not be recorded.
+EXPECTED_EXIT: dict[str, tuple[int, str]] = {
+    "snp": (1, "env-snapshot requires uv.lock"),
+}
+
+
+# ================================================================== #
+# === Measure                                                        #
+# ================================================================== #
+
+
+def _env(pycache: Path) -> dict[str, str]:
+    """Return the environment of one benchmarked interpreter.
+
+    :param pycache: Bytecode cache directory for this run.
+    :return: Environment with buildben importable from ``src``.
+    """
+    return {
+        **os.environ,
+        "PYTHONPATH": str(REPO_ROOT / "src"),
+        "PYTHONPYCACHEPREFIX": str(pycache),
+        "PROJECT_NAME": "bench_proj",
+    }
+
+
+def _invoke(
+    argv: list[str],
+    *,
+    cwd: Path,
+    pycache: Path,
+    importtime: bool = False,
+    expect: tuple[int, str] = (0, ""),
+) -> tuple[float, str]:
+    """Run ``bube ARGV`` in a fresh interpreter.
+
+    :param argv: CLI arguments.
+    :param cwd: Working directory.
+    :param pycache: Bytecode cache directory.
+    :param importtime: Whether to pass ``-X importtime``.
+    :param expect: Required exit status and a text stderr must contain.
+    :return: Wall time in milliseconds and captured stderr.
+    :raises SystemExit: If the run ends any other way, e.g. with a traceback.
+    """
+    flags = ["-X", "importtime"] if importtime else []
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, *flags, "-c", ENTRYPOINT, *argv],
+        cwd=cwd,
+        env=_env(pycache),
+        stdin=subprocess.DEVNULL,
+        capture_output=True,
+        text=True,
+        check=False,  # < The exit status is checked against *expect* below
+    )
+    elapsed = (time.perf_counter() - started) * 1000
+    returncode, stderr_text = expect
+    if result.returncode != returncode or stderr_text not in result.stderr:
+        sys.exit(
+            f"💥  bube {' '.join(argv)} exited {result.returncode} "
+            f"(expected {returncode}):\n{result.stderr[-2000:]}"
+        )
+    return elapsed, result.stderr
+
+
+def _importtime_rows(stderr: str) -> list[tuple[str, int]]:
+    """Parse ``-X importtime`` output into rows.
+
+    :param stderr: Captured stderr of an interpreter run with importtime.
+    :return: ``(<indented module name>, <cumulative_us>)`` in output order.
+    """
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or line.count("|") != 2:
+            continue
+        _self, cumulative, name = line[len("import time:") :].split("|")
+        if cumulative.strip().isdigit():  # < Skips the header line
+            rows.append((name[1:], int(cumulative)))
+    return rows
+
+
+def parse_importtime(stderr: str) -> tuple[list[str], int]:
+    """Return the imported modules and the total import time of one run.
+
+    :param stderr: Captured stderr of an interpreter run with importtime.
+    :return: Sorted module names and the summed cumulative microseconds of
+        top-level (not nested) imports.
+    """
+    rows = _importtime_rows(stderr)
+    modules = sorted({name.strip() for name, _ in rows})
+    total = sum(us for name, us in rows if not name.startswith(" "))
+    return modules, total
+
+
+def _make_project(root: Path) -> Path:
+    """Scaffold a throwaway project to run ``exp`` and ``snp`` in.
+
+    :param root: Parent directory.
+    :return: Project root.
+    """
+    subprocess.run(
+        [sys.executable, "-c", ENTRYPOINT, "proj", "bench_proj", "-t", str(root)],
+        env=_env(root / "pycache-setup"),
+        stdin=subprocess.DEVNULL,
+        capture_output=True,
+        check=True,
+    )
+    return root / "bench_proj"
+
+
+def measure(runs: int, results_dir: Path) -> dict[str, dict]:
+    """Measure every case and write its importtime tree into *results_dir*.
+
+    :param runs: Interpreter launches per case and mode.
+    :param results_dir: Directory receiving ``<case>.importtime.txt``.
+    :return: ``{<case>: {"cold_ms", "warm_ms", "import_ms", "modules"}}``.
+    """
+    results_dir.mkdir(parents=True, exist_ok=True)
+    report: dict[str, dict] = {}
+    with tempfile.TemporaryDirectory(prefix="bube-bench-") as tmp:
+        tmp_dir = Path(tmp)
+        project_root = _make_project(tmp_dir)
+        warm_cache = tmp_dir / "pycache-warm"
+        counter = 0
+        for case, template in CASES.items():
+            cwd = project_root if case in ("exp", "snp") else tmp_dir
+            expect = EXPECTED_EXIT.get(case, (0, ""))
+
+            def _argv(template: list[str] = template) -> list[str]:
+                nonlocal counter
+                counter += 1
+                return [arg.format(i=counter) for arg in template]
+
+            cold = [
+                _invoke(
+                    _argv(),
+                    cwd=cwd,
+                    pycache=tmp_dir / f"pycache-cold-{n}",
+                    expect=expect,
+                )[0]
+                for n in range(runs)
+            ]
+            _invoke(_argv(), cwd=cwd, pycache=warm_cache, expect=expect)  # < Prime
+            warm = [
+                _invoke(_argv(), cwd=cwd, pycache=warm_cache, expect=expect)[0]
+                for _ in range(runs)
+            ]
+            _, stderr = _invoke(
+                _argv(), cwd=cwd, pycache=warm_cache, importtime=True, expect=expect
+            )
+
+            tree_path = results_dir / f"{case}.importtime.txt"
+            tree_path.write_text(stderr, encoding="utf-8")
+            modules, import_us = parse_importtime(stderr)
+            report[case] = {
+                "cold_ms": round(statistics.median(cold), 2),
+                "warm_ms": round(statistics.median(warm), 2),
+                "import_ms": round(import_us / 1000, 2),
+                "modules": modules,
+            }
+    return report
+
+
+# ================================================================== #
+# === Compare                                                        #
+# ================================================================== #
+
+
+def compare(
+    current: dict[str, dict],
+    baseline: dict,
+    *,
+    tolerance: float,
+    slack_ms: float,
+) -> list[str]:
+    """Compare measurements against a baseline.
+
+    :param current: Result of ``measure``.
+    :param baseline: Content of ``baselines.json``.
+    :param tolerance: Allowed relative slowdown, e.g. ``0.25`` for +25 %.
+    :param slack_ms: Allowed absolute slowdown on top, against timer noise.
+    :return: One message per regression; empty if none.
+    """
+    regressions: list[str] = []
+    same_python = baseline.get("python") == _python_version()
+    for case, result in current.items():
+        expected = baseline["cases"].get(case)
+        if expected is None:
+            continue
+        for metric in ("cold_ms", "warm_ms", "import_ms"):
+            limit = expected[metric] * (1 + tolerance) + slack_ms
+            if result[metric] > limit:
+                regressions.append(
+                    f"{case}: {metric} {result[metric]:.1f} > {limit:.1f} "
+                    f"(baseline {expected[metric]:.1f})"
+                )
+        new_modules = sorted(set(result["modules"]) - set(expected["modules"]))
+        if same_python and new_modules:
+            regressions.append(f"{case}: new imports {', '.join(new_modules)}")
+    return regressions
+
+
+def _python_version() -> str:
+    return f"{sys.version_info.major}.{sys.version_info.minor}"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", "--runs", type=int, default=10, help="Runs per case")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="Allowed relative slowdown against the baseline (default: 0.25)",
+    )
+    parser.add_argument(
+        "--slack-ms",
+        type=float,
+        default=5.0,
+        help="Allowed absolute slowdown on top of --tolerance (default: 5 ms)",
+    )
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help=f"Write the measurements to {BASELINE_PATH.name}",
+    )
+    parser.add_argument(
+        "--results-dir", type=Path, default=RESULTS_DIR, help="importtime tree output"
+    )
+    args = parser.parse_args()
+
+    current = measure(args.runs, args.results_dir)
+    for case, result in current.items():
+        print(
+            f"{case:<10} cold {result['cold_ms']:7.1f} ms   "
+            f"warm {result['warm_ms']:7.1f} ms   "
+            f"imports {result['import_ms']:6.1f} ms   "
+            f"{len(result['modules'])} modules"
+        )
+    print(f"📂  importtime trees in {args.results_dir}")
+
+    if args.update_baseline:
+        baseline = {"python": _python_version(), "cases": current}
+        BASELINE_PATH.write_text(
+            json.dumps(baseline, indent=2, sort_keys=True) + "\n", encoding="utf-8"
+        )
+        print(f"✓  Baseline written to {BASELINE_PATH}")
+        return
+
+    if not BASELINE_PATH.is_file():
+        sys.exit(f"💥  No {BASELINE_PATH.name}; run with --update-baseline first")
+    regressions = compare(
+        current,
+        json.loads(BASELINE_PATH.read_text(encoding="utf-8")),
+        tolerance=args.tolerance,
+        slack_ms=args.slack_ms,
+    )
+    for message in regressions:
+        print(f"✗  {message}")
+    if regressions:
+        sys.exit(1)
+    print("✓  Startup within baseline tolerance")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+"""Setuptools hook: compile the scaffold template bundles into built wheels.
+
+All metadata lives in ``pyproject.toml``. This file only extends ``build_py``
+so every wheel ships ``_templates_proj.bundle`` and ``_templates_experim.bundle``
+(see ``buildben.template_bundle``).
+"""
+
+import sys
+from pathlib import Path
+
+from setuptools import setup
+from setuptools.command.build_py import build_py
+
+sys.path.insert(0, str(Path(__file__).resolve().parent / "src"))
+from buildben.template_bundle import write_bundle
+
+TEMPLATE_DIRS = ("_templates_proj", "_templates_experim")
+
+
+class build_py_with_bundles(build_py):
+    """Build the package, then write one bundle per template directory."""
+
+    def run(self) -> None:
+        super().run()
+        pkg_src = Path(__file__).resolve().parent / "src" / "buildben"
+        pkg_out = Path(self.build_lib) / "buildben"
+        pkg_out.mkdir(parents=True, exist_ok=True)
+        for tmpl_name in TEMPLATE_DIRS:
+            write_bundle(pkg_src / tmpl_name, pkg_out)
+
+
+setup(cmdclass={"build_py": build_py_with_bundles})
@@ -3,47 +3,267 @@
 buildben.init_experim – scaffold a new experiment folder.
 
 Usage from CLI aggregator:
-    buildben add-experim -n MY_TEST [--no-venv] [--no-freeze]
+    buildben add-experim MY_TEST [--matrix grid.toml] [-j N] [--durable]
 """
 
 from __future__ import annotations
 
 import argparse
 import datetime as dt
+import functools
+import itertools
+import json
 import os
+import sys
+import tomllib
 from pathlib import Path
 
-from . import utils
+from . import commands, exp_index, manifest, template_bundle, utils
 
 
 # ================================================================== #
 # === CLI wiring                                                     #
 # ================================================================== #
 
-CMD_NAME = "add-experim"  # < Name of the CLI-command
-CMD_ALIASES = ["exp"]  # < Alias shortcut of the CLI-command
-DOC = (
-    f"Create a dated experiment scaffold inside ./experiments/. Aliases: {CMD_ALIASES}"
-)
+_COMMAND = commands.COMMANDS["add-experim"]  # < Arguments are declared statically
+CMD_NAME = _COMMAND.name  # < Name of the CLI-command
+CMD_ALIASES = list(_COMMAND.aliases)  # < Alias shortcut of the CLI-command
+DOC = _COMMAND.doc
 
 
 def _add_my_parser(subparsers: argparse._SubParsersAction) -> None:
-    p: argparse.ArgumentParser = subparsers.add_parser(
-        name=CMD_NAME,  # < the command name typed on the shell
-        aliases=CMD_ALIASES,
-        help=DOC,
-        description=DOC,
-    )
-    p.add_argument(
-        "name",
-        nargs="?",
-        default="experiment",
-        help="Experiment name (e.g. validation, benchmark, etc.)",
-    )
-    # > Entrypoint, retrieved as args.func in cli.py
+    """Attach the add-experim sub-parser to a parser (e.g. when run as a script).
+
+    :param subparsers: Parent argparse subparser registry.
+    :return: None.
+    """
+    p = commands.add_parser(subparsers, _COMMAND)
     p.set_defaults(func=_run)
 
 
+def _experiment_directories(exp_root: Path) -> list[Path]:
+    """Return directories required by the experiment scaffold.
+
+    :param exp_root: Root directory of the generated experiment.
+    :return: Directories to create before rendering templates.
+    """
+    return [
+        # exp_root / "env", # ?? This would complicate .dockerignore logic
+        exp_root / "input",
+        exp_root / "interm-output",
+        exp_root / "output",
+        exp_root / "scripts",
+    ]
+
+
+def _experiment_template_transfers(exp_root: Path) -> dict[str, Path]:
+    """Map experiment template filenames to generated output paths.
+
+    :param exp_root: Root directory of the generated experiment.
+    :return: ``{<_template_filename>: <destination_filepath>}``.
+    """
+    # fmt: off
+    return {
+        "_REPORT.md": exp_root / "REPORT.md",
+        "_run.py.tmpl": exp_root / "run.py",
+        "_paths.env": exp_root / ".paths.env",
+        "_scripts_exp.py.tmpl": exp_root / "scripts" / "exp.py",
+        "_scripts_eval.py.tmpl": exp_root / "scripts" / "eval.py",
+    }
+    # fmt: on
+
+
+def _experiment_placeholders(
+    name: str, name_full: str, today: str, project_name: str
+) -> dict[str, str]:
+    """Return placeholder replacements for experiment templates.
+
+    :param name: Short experiment name.
+    :param name_full: Dated experiment directory name.
+    :param today: ISO creation date.
+    :param project_name: Name of the enclosing project.
+    :return: Placeholder replacement mapping.
+    """
+    return {
+        "<experiment_name>": name,
+        "{experiment_name}": name,
+        "<experiment name>": name,
+        "<experiment_name_full>": name_full,
+        "{experiment_name_full}": name_full,
+        "<bb_date>": today,
+        "{bb_date}": today,
+        "<bb_today>": today,  # < bb_ makes it more unique to buildben
+        "{bb_today}": today,
+        "<my_project>": project_name,
+        "{my_project}": project_name,
+    }
+
+
+def _load_matrix(matrix_path: Path) -> list[dict]:
+    """Expand a parameter matrix file into one parameter set per run.
+
+    The TOML file may hold a ``[grid]`` table of value lists (expanded as a
+    cartesian product) and/or a ``[[runs]]`` array of explicit parameter sets,
+    which are appended after the grid.
+
+    :param matrix_path: Matrix TOML file.
+    :return: Parameter sets in run order.
+    :raises utils.ScaffoldError: If the file cannot be read, defines no runs,
+        ``[grid]`` is not a table of non-empty lists, or a ``[[runs]]`` entry
+        is not a table.
+    """
+
+    def invalid(message: str) -> utils.ScaffoldError:
+        return utils.ScaffoldError([(matrix_path, ValueError(message))])
+
+    try:
+        matrix = tomllib.loads(matrix_path.read_text(encoding="utf-8"))
+    except (OSError, tomllib.TOMLDecodeError) as exc:
+        raise utils.ScaffoldError([(matrix_path, exc)]) from exc
+    grid = matrix.get("grid", {})
+    if not isinstance(grid, dict):
+        raise invalid("grid must be a table ([grid])")
+    for key, values in grid.items():
+        if not isinstance(values, list):
+            raise invalid(f"[grid] {key} must be a list of values")
+        if not values:
+            raise invalid(f"[grid] {key} is empty, so the grid has no runs")
+    explicit = matrix.get("runs", [])
+    if not isinstance(explicit, list) or not all(
+        isinstance(params, dict) for params in explicit
+    ):
+        raise invalid("runs must be an array of tables ([[runs]])")
+    runs: list[dict] = []
+    if grid:
+        runs = [
+            dict(zip(grid, values, strict=True))
+            for values in itertools.product(*grid.values())
+        ]
+    runs.extend(explicit)
+    if not runs:
+        raise invalid("defines neither [grid] nor [[runs]]")
+    return runs
+
+
+def _scaffold_experiment(
+    pr_root: Path,
+    exp_root: Path,
+    placeholders: dict[str, str],
+    params: dict | None = None,
+    *,
+    jobs: int = 1,
+    durable: bool = False,
+) -> dict[str, dict]:
+    """Render one experiment scaffold and publish it at *exp_root*.
+
+    :param pr_root: Project root.
+    :param exp_root: Experiment directory to publish.
+    :param placeholders: Placeholder replacement mapping.
+    :param params: Parameter set written to ``params.json``, if any.
+    :param jobs: Maximum number of worker threads.
+    :param durable: Whether to fsync the scaffold before publishing it.
+    :return: Manifest file entries, relative to the project root.
+    :raises utils.ScaffoldError: If directories or files could not be created.
+    """
+    # > Manifest entries are collected while staging, merged once published
+    exp_manifest = manifest.new_manifest({})
+    prefix = exp_root.relative_to(pr_root)
+    with utils.staged_directory(exp_root, durable=durable, jobs=jobs) as exp_stage:
+        transfers = _experiment_template_transfers(exp_stage)
+        utils.create_directories(_experiment_directories(exp_stage), jobs)
+        results = template_bundle.render_templates(
+            transfers=transfers,
+            tmpl_name="_templates_experim",
+            placeholders=placeholders,
+            jobs=jobs,
+        )
+        manifest.record_renders(
+            exp_manifest,
+            exp_stage,
+            transfers,
+            results,
+            "_templates_experim",
+            template_bundle.source_hashes("_templates_experim"),
+            prefix=prefix,
+        )
+        if params is not None:
+            params_path = exp_stage / "params.json"
+            params_path.write_text(
+                json.dumps(params, indent=2) + "\n", encoding="utf-8"
+            )
+            manifest.record_files(exp_manifest, exp_stage, [params_path], prefix)
+    return exp_manifest["files"]
+
+
+def _experiment_names(name: str, today: str, runs: list[dict | None]) -> list[str]:
+    """Return the dated directory names of the experiment runs.
+
+    :param name: Short experiment name.
+    :param today: ISO creation date.
+    :param runs: Parameter set per run; ``[None]`` for a single plain experiment.
+    :return: ``{today}_{name}``, or one ``{today}_{name}_NNN`` per matrix run.
+    """
+    if runs == [None]:
+        return [f"{today}_{name}"]
+    width = max(3, len(str(len(runs))))
+    return [f"{today}_{name}_{i:0{width}d}" for i in range(len(runs))]
+
+
+def _create_experiments(
+    pr_root: Path,
+    name: str,
+    today: str,
+    runs: list[dict | None],
+    *,
+    jobs: int = 1,
+    durable: bool = False,
+    pr_name: str | None = None,
+) -> dict[Path, dict[str, dict]]:
+    """Scaffold one experiment per run and record them in the project manifest.
+
+    :param pr_root: Project root.
+    :param name: Short experiment name.
+    :param today: ISO creation date.
+    :param runs: Parameter set per run; ``[None]`` for a single plain experiment.
+    :param jobs: Maximum number of worker threads.
+    :param durable: Whether to fsync each scaffold before publishing it.
+    :param pr_name: Project name; defaults to ``$PROJECT_NAME`` or the root's name.
+    :return: Manifest file entries by experiment directory.
+    :raises utils.ScaffoldError: If any experiment could not be created.
+    """
+    pr_name = pr_name or os.getenv("PROJECT_NAME") or pr_root.name
+    names_full = _experiment_names(name, today, runs)
+
+    # > Potential use for experiments, must be manually copied into input!
+    (pr_root / "experiments" / "resources").mkdir(parents=True, exist_ok=True)
+
+    # > A matrix spreads runs over the threads, a single run spreads its files
+    per_run_jobs = 1 if len(runs) > 1 else jobs
+    manifest_files = utils.run_parallel(
+        {
+            pr_root / "experiments" / full: functools.partial(
+                _scaffold_experiment,
+                pr_root,
+                pr_root / "experiments" / full,
+                _experiment_placeholders(name, full, today, pr_name),
+                params,
+                jobs=per_run_jobs,
+                durable=durable,
+            )
+            for full, params in zip(names_full, runs, strict=True)
+        },
+        jobs=jobs,
+    )
+
+    with manifest.locked(pr_root):  # < Concurrent add-experim runs merge, not clobber
+        project_manifest = manifest.load_manifest(pr_root) or manifest.new_manifest({})
+        for files in manifest_files.values():
+            project_manifest["files"].update(files)
+        manifest.write_manifest(pr_root, project_manifest)
+    exp_index.index_experiments(pr_root, manifest_files)
+    return manifest_files
+
+
 # ================================================================== #
 # === implementation                                                 #
 # ================================================================== #
@@ -51,67 +271,35 @@ def _run(args: argparse.Namespace) -> None:
 
     # === Retrieve Variables ==========================================
     PR_ROOT: Path = utils.find_project_root()
-    PR_NAME = os.getenv("PROJECT_NAME") or PR_ROOT.name
 
-    ### Experiment directory
+    ### Experiment directories, one per matrix run
     TODAY = dt.date.today().isoformat()
-    EXP_NAME_FULL = f"{TODAY}_{args.name}"
-    EXP_ROOT = PR_ROOT / "experiments" / EXP_NAME_FULL
-    utils.warn_dir_overwrite(EXP_ROOT)
-
-    # =================================================================
-    # === Directory tree
-    # =================================================================
-
-    directories: list[Path] = [
-        # EXP_ROOT / "env", # ?? This would complicate .dockerignore logic
-        PR_ROOT
-        / "experiments"
-        / "resources",  # < Potential use for experiments, must be manually copied into input!
-        EXP_ROOT / "input",
-        EXP_ROOT / "interm-output",
-        EXP_ROOT / "output",
-        EXP_ROOT / "scripts",
+    runs: list[dict | None] = [None]
+    if args.matrix:
+        try:
+            runs = _load_matrix(Path(args.matrix).expanduser())
+        except utils.ScaffoldError as exc:
+            sys.exit(f"💥  {exc}")
+    EXP_ROOTS = [
+        PR_ROOT / "experiments" / full
+        for full in _experiment_names(args.name, TODAY, runs)
     ]
-    for dir in directories:
-        dir.mkdir(parents=True, exist_ok=True)
-
-    # =================================================================
-    # === Copy template files
-    # =================================================================
-
-    # > {<_template_filename>: <destination_filepath>}
-    # fmt: off
-    transfers: dict[str, Path] = {
-        "_REPORT.md": EXP_ROOT / "REPORT.md",
-        "_run.py.tmpl": EXP_ROOT / "run.py",
-        "_paths.env": EXP_ROOT / ".paths.env",
-        "_scripts_exp.py.tmpl": EXP_ROOT / "scripts" / "exp.py",
-        "_scripts_eval.py.tmpl": EXP_ROOT / "scripts" / "eval.py",
-    }
-    # fmt: on
-
-    tmpl_dir = Path(__file__).resolve().parent / "_templates_experim"
-    utils.copy_templates(transfers=transfers, tmpl_dir=tmpl_dir)
+    if len(EXP_ROOTS) == 1:
+        utils.warn_dir_overwrite(EXP_ROOTS[0])
+    else:
+        utils.warn_dirs_overwrite(EXP_ROOTS)
 
     # =================================================================
-    # === Placeholder substitution (same style as init_proj)
+    # === Render into staging dirs, each published once complete
     # =================================================================
+    try:
+        _create_experiments(
+            PR_ROOT, args.name, TODAY, runs, jobs=args.jobs, durable=args.durable
+        )
+    except utils.ScaffoldError as exc:
+        sys.exit(f"💥  {exc}")
 
-    placeholders = {
-        "<experiment_name>": args.name,
-        "{experiment_name}": args.name,
-        "<experiment name>": args.name,
-        "<experiment_name_full>": EXP_NAME_FULL,
-        "{experiment_name_full}": EXP_NAME_FULL,
-        "<bb_date>": TODAY,
-        "{bb_date}": TODAY,
-        "<bb_today>": TODAY,  # < bb_ makes it more unique to buildben
-        "{bb_today}": TODAY,
-        "<my_project>": PR_NAME,
-        "{my_project}": PR_NAME,
-    }
-
-    utils.substitute_placeholders(
-        filepaths=list(transfers.values()), placeholders=placeholders
-    )
+    if args.matrix:
+        print(f"✅  Created {len(runs)} experiments for matrix {args.matrix}")
+    else:
+        print(f"✓  Created {EXP_ROOTS[0].relative_to(PR_ROOT)}")
@@ -0,0 +1,373 @@
+"""In-process API for the buildben commands.
+
+The functions mirror ``bube init-proj``, ``bube add-experim``,
+``bube env-snapshot`` and ``bube env-restore`` but never prompt, print or
+exit. They return result objects and raise exceptions derived from
+``BuildbenError``, so notebooks, CI scripts and test fixtures can drive
+buildben without a subprocess::
+
+    from buildben import api
+
+    project = api.scaffold_project("demo", "/tmp")
+    experiment = api.add_experiment("baseline", project_root=project.root)
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from pathlib import Path
+
+from . import add_experim, env_restore, env_snapshot, init_proj, utils
+from .utils import (
+    BuildbenError,
+    InvalidNameError,
+    ProjectRootNotFoundError,
+    RestoreError,
+    ScaffoldError,
+    SnapshotError,
+    TargetExistsError,
+)
+
+__all__ = [
+    "BuildbenError",
+    "ExperimentResult",
+    "InvalidNameError",
+    "ProjectRootNotFoundError",
+    "RestoreError",
+    "RestoreResult",
+    "ScaffoldError",
+    "ScaffoldResult",
+    "SnapshotError",
+    "SnapshotResult",
+    "TargetExistsError",
+    "add_experiment",
+    "restore_env",
+    "scaffold_project",
+    "snapshot_env",
+    "snapshot_envs",
+]
+
+
+# ================================================================== #
+# === Results                                                        #
+# ================================================================== #
+
+
+@dataclass(frozen=True)
+class ScaffoldResult:
+    """Outcome of ``scaffold_project``."""
+
+    root: Path  # < Project directory
+    paths: tuple[Path, ...]  # < Generated files, absolute
+    bytes_written: int
+    seconds: float
+
+
+@dataclass(frozen=True)
+class ExperimentResult:
+    """Outcome of ``add_experiment``."""
+
+    roots: tuple[Path, ...]  # < One experiment directory per run
+    paths: tuple[Path, ...]  # < Generated files, absolute
+    bytes_written: int
+    seconds: float
+
+
+@dataclass(frozen=True)
+class SnapshotResult:
+    """Outcome of ``snapshot_env``, or of one experiment of ``snapshot_envs``."""
+
+    experiment_dir: Path
+    commit: str  # < Short hash of the tagged commit
+    paths: tuple[Path, ...]  # < Lock, experiment.env, artifacts, diff, wheelhouse
+    bytes_written: int
+    seconds: float
+
+
+@dataclass(frozen=True)
+class RestoreResult:
+    """Outcome of ``restore_env``."""
+
+    experiment_dir: Path
+    venv: Path
+    python: Path  # < Interpreter of the venv
+    python_version: str
+    offline: bool  # < Installed from the experiment's wheelhouse
+    reused: bool  # < A pooled venv existed, nothing was installed
+    seconds: float  # < Until the interpreter was ready
+
+
+def _manifest_totals(
+    project_root: Path, files: dict[str, dict]
+) -> tuple[tuple[Path, ...], int]:
+    """Return absolute paths and total size of manifest file entries.
+
+    :param project_root: Root the manifest paths are relative to.
+    :param files: Manifest file entries.
+    :return: Sorted absolute paths and their summed size in bytes.
+    """
+    paths = tuple(sorted(project_root / relative for relative in files))
+    return paths, sum(entry["size"] for entry in files.values())
+
+
+# ================================================================== #
+# === Commands                                                       #
+# ================================================================== #
+
+
+def scaffold_project(
+    name: str,
+    target_dir: str | Path = ".",
+    *,
+    github_user: str = "github-user",
+    git_init: bool = False,
+    jobs: int = 1,
+    durable: bool = False,
+    overwrite: bool = False,
+) -> ScaffoldResult:
+    """Scaffold a new src-layout project, like ``bube init-proj``.
+
+    :param name: Project name, must be a valid Python identifier.
+    :param target_dir: Parent directory of the project directory.
+    :param github_user: GitHub username shown in generated metadata.
+    :param git_init: Whether to initialise a git repository with one commit.
+    :param jobs: Maximum number of worker threads.
+    :param durable: Whether to fsync the scaffold before publishing it.
+    :param overwrite: Whether to merge into an existing project directory.
+    :return: Generated paths, their size and the elapsed time.
+    :raises InvalidNameError: If *name* is not a Python identifier.
+    :raises TargetExistsError: If the project directory exists and not *overwrite*.
+    :raises ScaffoldError: If directories or files could not be created, or
+        git failed.
+    """
+    started = time.perf_counter()
+    init_proj._validate_project_name(name)
+    project_root = init_proj._project_root(str(target_dir), name)
+    if project_root.exists() and not overwrite:
+        raise TargetExistsError(f"{project_root} already exists")
+
+    scaffold_manifest = init_proj._scaffold(
+        project_root, name, github_user, jobs=jobs, durable=durable
+    )
+    if git_init:
+        utils.git_init(project_root, quiet=True)
+
+    paths, n_bytes = _manifest_totals(project_root, scaffold_manifest["files"])
+    return ScaffoldResult(project_root, paths, n_bytes, time.perf_counter() - started)
+
+
+def add_experiment(
+    name: str = "experiment",
+    *,
+    project_root: str | Path | None = None,
+    matrix: str | Path | list[dict] | None = None,
+    jobs: int = 1,
+    durable: bool = False,
+    overwrite: bool = False,
+    project_name: str | None = None,
+) -> ExperimentResult:
+    """Create a dated experiment scaffold, like ``bube add-experim``.
+
+    :param name: Short experiment name.
+    :param project_root: Project root; discovered from the cwd if None.
+    :param matrix: Matrix TOML file, or parameter sets, for one run each.
+    :param jobs: Maximum number of worker threads.
+    :param durable: Whether to fsync each scaffold before publishing it.
+    :param overwrite: Whether to merge into existing experiment directories.
+    :param project_name: Name filled into the templates; defaults to
+        ``$PROJECT_NAME`` or the project directory name.
+    :return: Experiment directories, generated paths, size and elapsed time.
+    :raises ProjectRootNotFoundError: If no project root is found.
+    :raises TargetExistsError: If an experiment exists and not *overwrite*.
+    :raises ScaffoldError: If the matrix file is invalid, or any experiment
+        could not be created.
+    """
+    started = time.perf_counter()
+    pr_root = (
+        utils.find_project_root()
+        if project_root is None
+        else Path(project_root).expanduser().resolve()
+    )
+    runs: list[dict | None] = [None]
+    if isinstance(matrix, (str, Path)):
+        runs = add_experim._load_matrix(Path(matrix).expanduser())
+    elif matrix is not None:
+        runs = list(matrix)
+
+    today = dt.date.today().isoformat()
+    exp_roots = [
+        pr_root / "experiments" / full
+        for full in add_experim._experiment_names(name, today, runs)
+    ]
+    existing = [exp_root for exp_root in exp_roots if exp_root.exists()]
+    if existing and not overwrite:
+        raise TargetExistsError(f"{existing[0]} already exists")
+
+    manifest_files = add_experim._create_experiments(
+        pr_root, name, today, runs, jobs=jobs, durable=durable, pr_name=project_name
+    )
+    files = {
+        relative: entry
+        for exp_files in manifest_files.values()
+        for relative, entry in exp_files.items()
+    }
+    paths, n_bytes = _manifest_totals(pr_root, files)
+    return ExperimentResult(
+        tuple(exp_roots), paths, n_bytes, time.perf_counter() - started
+    )
+
+
+def snapshot_env(
+    experiment_dir: str | Path,
+    *,
+    project_root: str | Path | None = None,
+    project_name: str | None = None,
+    log: Callable[[str], None] | None = None,
+    build_cache: bool = True,
+    wheelhouse: bool = False,
+) -> SnapshotResult:
+    """Snapshot the environment of an experiment, like ``bube env-snapshot``.
+
+    :param experiment_dir: Experiment directory, relative to the root or absolute.
+    :param project_root: Project root; discovered from the cwd if None.
+    :param project_name: Name used for the snapshot tag; defaults to
+        ``$PROJECT_NAME`` or the project directory name.
+    :param log: Receives the progress lines ``bube env-snapshot`` prints.
+    :param build_cache: Whether to reuse cached builds and lock exports.
+    :param wheelhouse: Whether to also collect every locked wheel into the
+        experiment's ``_wheelhouse`` for offline installs.
+    :return: Tagged commit, written paths, their size and the elapsed time.
+    :raises ProjectRootNotFoundError: If no project root is found.
+    :raises SnapshotError: If git or uv fail, or ``uv.lock`` is missing.
+    """
+    started = time.perf_counter()
+    pr_root = (
+        utils.find_project_root()
+        if project_root is None
+        else Path(project_root).expanduser().resolve()
+    )
+    snapshot = env_snapshot._snapshot(
+        pr_root,
+        experiment_dir,
+        log=log,
+        project_name=project_name,
+        build_cache=build_cache,
+        with_wheelhouse=wheelhouse,
+    )
+    return _snapshot_result(snapshot, started)
+
+
+def snapshot_envs(
+    experiment_dirs: Iterable[str | Path],
+    *,
+    project_root: str | Path | None = None,
+    project_name: str | None = None,
+    log: Callable[[str], None] | None = None,
+    build_cache: bool = True,
+    jobs: int = 1,
+    wheelhouse: bool = False,
+) -> tuple[SnapshotResult, ...]:
+    """Snapshot one commit into many experiments, building and locking once.
+
+    :param experiment_dirs: Experiment directories or glob patterns such as
+        ``experiments/2026-10-*``, relative to the root or absolute.
+    :param project_root: Project root; discovered from the cwd if None.
+    :param project_name: Name used for the snapshot tag.
+    :param log: Receives the progress lines ``bube env-snapshot`` prints.
+    :param build_cache: Whether to reuse cached builds and lock exports.
+    :param jobs: Maximum number of experiments linked at a time.
+    :param wheelhouse: Whether to also collect every locked wheel into each
+        experiment's ``_wheelhouse`` for offline installs.
+    :return: One result per experiment; ``seconds`` is the shared total.
+    :raises ProjectRootNotFoundError: If no project root is found.
+    :raises SnapshotError: If git or uv fail, ``uv.lock`` is missing or a
+        pattern matches nothing.
+    :raises ScaffoldError: If the snapshot could not be linked into an
+        experiment.
+    """
+    started = time.perf_counter()
+    pr_root = (
+        utils.find_project_root()
+        if project_root is None
+        else Path(project_root).expanduser().resolve()
+    )
+    snapshots = env_snapshot._snapshot_many(
+        pr_root,
+        list(experiment_dirs),
+        log=log,
+        project_name=project_name,
+        build_cache=build_cache,
+        jobs=jobs,
+        with_wheelhouse=wheelhouse,
+    )
+    return tuple(_snapshot_result(snapshot, started) for snapshot in snapshots)
+
+
+def _snapshot_result(snapshot: env_snapshot.Snapshot, started: float) -> SnapshotResult:
+    paths = (snapshot.lock_path, snapshot.env_path, *snapshot.artifacts)
+    if snapshot.lock_diff is not None:
+        paths += (snapshot.lock_diff,)
+    if snapshot.wheelhouse is not None:
+        paths += tuple(sorted(snapshot.wheelhouse.iterdir()))
+    return SnapshotResult(
+        snapshot.experiment_dir,
+        snapshot.commit_hash,
+        paths,
+        sum(path.stat().st_size for path in paths),
+        time.perf_counter() - started,
+    )
+
+
+def restore_env(
+    experiment: str | Path,
+    *,
+    project_root: str | Path | None = None,
+    venv: str | Path | None = None,
+    python: str | None = None,
+    link_mode: str | None = None,
+    force: bool = False,
+    pool: bool = True,
+    clone: bool = False,
+    pool_quota: int | None = None,
+    log: Callable[[str], None] | None = None,
+) -> RestoreResult:
+    """Recreate the environment of a snapshot, like ``bube env-restore``.
+
+    :param experiment: Experiment path, directory name or short name.
+    :param project_root: Project root; discovered from the cwd if None.
+    :param venv: Virtual environment to create; ``<experiment>/.venv`` if None.
+    :param python: Python version or interpreter for ``uv venv``.
+    :param link_mode: uv link mode; hardlink (clone on macOS) if None.
+    :param force: Whether to replace an existing venv.
+    :param pool: Whether to link (or clone) a venv from the venv pool, built
+        once per lock and project wheel.
+    :param clone: Whether to clone the pooled venv instead of linking it.
+    :param pool_quota: Pool size limit in bytes; defaults to
+        ``$BUILDBEN_VENV_POOL_QUOTA`` or 20 GiB.
+    :param log: Receives the progress lines ``bube env-restore`` prints.
+    :return: The venv, its interpreter and the time until it was ready.
+    :raises ProjectRootNotFoundError: If no project root is found.
+    :raises RestoreError: If the experiment has no snapshot, the venv exists
+        or uv fails.
+    """
+    pr_root = (
+        utils.find_project_root()
+        if project_root is None
+        else Path(project_root).expanduser().resolve()
+    )
+    restored = env_restore._restore(
+        pr_root,
+        experiment,
+        venv=venv,
+        python=python,
+        link_mode=link_mode,
+        force=force,
+        pool=pool,
+        clone=clone,
+        quota=pool_quota,
+        log=log,
+    )
+    return RestoreResult(*restored)
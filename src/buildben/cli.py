@@ -1,16 +1,18 @@
 # buildben/cli.py
 import sys
 import argparse
-from . import init_proj
-from . import add_experim
-from . import env_snapshot
+import importlib
 
+from . import commands
 
-def main() -> None:
 
-    # =================================================================
-    # === Build Parser
-    # =================================================================
+def build_parser() -> argparse.ArgumentParser:
+    """Build the full CLI parser from the static command registry.
+
+    No command module is imported, so ``--help`` and completion stay fast.
+
+    :return: Top-level parser with one sub-parser per command.
+    """
 
     ### Top-level parser
     PARSER = argparse.ArgumentParser(
@@ -23,10 +25,19 @@ def main() -> None:
         dest="cmd", required=True
     )
 
-    ### Edit subparser in place to include script-specific parsers
-    init_proj._add_my_parser(subparsers)
-    add_experim._add_my_parser(subparsers)
-    env_snapshot._add_my_parser(subparsers)
+    ### Names, aliases and arguments are declared in commands.COMMANDS
+    for command in commands.COMMANDS.values():
+        commands.add_parser(subparsers, command)
+    return PARSER
+
+
+def main() -> None:
+
+    # =================================================================
+    # === Build Parser
+    # =================================================================
+
+    PARSER = build_parser()
 
     # =================================================================
     # === Handle Cases
@@ -41,8 +52,17 @@ def main() -> None:
     # =================================================================
 
     args = PARSER.parse_args()
-    # > args.func was set to _run()
-    args.func(args)  # < ⚠ pass the Namespace to the handler
+    command = commands.resolve(args.cmd)
+    if command.daemon:  # < A running `bube serve` answers in milliseconds
+        from . import client
+
+        status = client.forward(command.name, args)
+        if status is not None:
+            sys.exit(status)
+
+    # > Import the implementing module only now that its command was chosen
+    module = importlib.import_module(command.module)
+    module._run(args)  # < ⚠ pass the Namespace to the handler
 
 
 if __name__ == "__main__":
@@ -0,0 +1,146 @@
+"""Forward CLI commands to a running ``bube serve`` daemon.
+
+``cli.main`` imports this module before any command module, so it must stay
+cheap: ``json`` and ``socket`` are imported only once a daemon socket exists.
+Commands that start subprocesses (``env-snapshot``, ``init-proj --git-init``)
+always run locally, so uv and git see the client's environment.
+
+Protocol: one JSON object per line and connection. The client sends
+``{"command", "cwd", "project_root", "project_name", "args"}``, where
+``project_root`` and ``project_name`` carry the client's ``$PROJECT_ROOT`` and
+``$PROJECT_NAME`` so the daemon never resolves a request with its own
+environment. The daemon answers ``{"status", "stdout", "stderr"}``, or
+``{"fallback": true}`` if the command has to run locally (e.g. to ask before
+overwriting an existing directory). Only a failed connect makes the client run
+a command locally; once a request is sent, a missing reply is an error.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import socket
+
+
+def socket_path(raw: str | None = None) -> str:
+    """Return the daemon socket location.
+
+    :param raw: Explicit path, e.g. from ``bube serve --socket``.
+    :return: *raw*, ``$BUILDBEN_SOCKET``, or ``buildben-<uid>.sock`` in
+        ``$XDG_RUNTIME_DIR`` (falling back to ``$TMPDIR`` and ``/tmp``).
+        ``forward`` only uses sockets owned by the current user.
+    """
+    if raw:
+        return os.path.expanduser(raw)
+    if env_path := os.environ.get("BUILDBEN_SOCKET"):
+        return env_path
+    runtime_dir = (
+        os.environ.get("XDG_RUNTIME_DIR") or os.environ.get("TMPDIR") or "/tmp"
+    )
+    return os.path.join(runtime_dir, f"buildben-{os.getuid()}.sock")
+
+
+def _connect(path: str, timeout: float | None = None) -> socket.socket:
+    """Open a connection to the daemon.
+
+    :param path: Daemon socket.
+    :param timeout: Socket timeout in seconds; None waits indefinitely.
+    :return: Connected socket.
+    :raises OSError: If the daemon is unreachable.
+    """
+    import socket
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.settimeout(timeout)
+        sock.connect(path)
+    except OSError:
+        sock.close()
+        raise
+    return sock
+
+
+def _exchange(sock: socket.socket, message: dict) -> dict:
+    """Send one request over an open connection and wait for its reply.
+
+    :param sock: Connected socket.
+    :param message: JSON-serialisable request.
+    :return: Decoded reply.
+    :raises OSError: If the connection breaks.
+    :raises ValueError: If the reply is missing or not valid JSON.
+    """
+    import json
+    import socket
+
+    sock.sendall(json.dumps(message).encode("utf-8") + b"\n")
+    sock.shutdown(socket.SHUT_WR)
+    with sock.makefile("rb") as fh:
+        return json.loads(fh.readline())
+
+
+def request(message: dict, path: str, timeout: float | None = None) -> dict:
+    """Send one request to the daemon and wait for its reply.
+
+    :param message: JSON-serialisable request.
+    :param path: Daemon socket.
+    :param timeout: Socket timeout in seconds; None waits indefinitely.
+    :return: Decoded reply.
+    :raises OSError: If the daemon is unreachable.
+    :raises ValueError: If the reply is not valid JSON.
+    """
+    with _connect(path, timeout) as sock:
+        return _exchange(sock, message)
+
+
+def forward(command: str, args: argparse.Namespace) -> int | None:
+    """Run a command on the daemon, if one is running and can take it.
+
+    Set ``BUILDBEN_NO_DAEMON=1`` to always run locally.
+
+    :param command: Canonical command name, e.g. ``init-proj``.
+    :param args: Parsed CLI arguments.
+    :return: Exit status of the forwarded command, or None to run locally.
+    """
+    if os.environ.get("BUILDBEN_NO_DAEMON"):
+        return None
+    if command == "env-snapshot":
+        return None  # < uv must run with the client's environment
+    if command == "init-proj" and (
+        args.from_spec or args.update or args.git_init or not args.name
+    ):
+        return None  # < Batch, update and git runs stay local
+    path = socket_path()
+    try:
+        owner = os.stat(path).st_uid
+    except OSError:
+        return None  # < No daemon
+    if owner != os.getuid():
+        return None  # < Planted by another user, e.g. in a shared /tmp
+
+    message = {
+        "command": command,
+        "cwd": os.getcwd(),
+        "project_root": os.environ.get("PROJECT_ROOT"),
+        "project_name": os.environ.get("PROJECT_NAME"),
+        "args": {key: value for key, value in vars(args).items() if key != "cmd"},
+    }
+    try:
+        sock = _connect(path)
+    except OSError:
+        return None  # < Stale socket or daemon gone: run locally
+    try:
+        with sock:
+            reply = _exchange(sock, message)
+    except (OSError, ValueError) as exc:
+        # > The daemon may have run part of the command: never repeat it here
+        sys.stderr.write(f"💥  buildben daemon gave no reply: {exc}\n")
+        return 1
+    if reply.get("fallback"):
+        return None
+    sys.stdout.write(reply["stdout"])
+    sys.stderr.write(reply["stderr"])
+    return reply["status"]
@@ -0,0 +1,399 @@
+"""Static registry of the buildben subcommands.
+
+Names, aliases, help texts and argument specs of every subcommand live here,
+so ``bube --help``, ``bube proj --help`` and shell completion build the full
+parser without importing the command modules (and ``utils`` with them). The
+implementing module is imported only when its command is dispatched.
+
+This module must stay cheap to import: standard library only, no ``utils``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import re
+from typing import Any, NamedTuple
+
+
+def positive_int(value: str) -> int:
+    """Parse a CLI value as an integer >= 1 (argparse ``type=``)."""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be >= 1, got {value}")
+    return number
+
+
+def size_bytes(value: str) -> int:
+    """Parse a CLI size such as ``500M``, ``20G`` or ``1.5GiB`` (1024-based)."""
+    match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([KMGT]?)(?:I?B)?\s*", value.upper())
+    if match is None:
+        raise argparse.ArgumentTypeError(f"not a size like 500M or 20G: {value}")
+    number, unit = match.groups()
+    return int(float(number) * 1024 ** " KMGT".index(unit or " "))
+
+
+class Arg(NamedTuple):
+    """One ``add_argument`` call: positional flags plus keyword options."""
+
+    flags: tuple[str, ...]
+    options: dict[str, Any]
+
+
+class Command(NamedTuple):
+    """Declaration of one subcommand."""
+
+    name: str
+    aliases: tuple[str, ...]
+    doc: str
+    module: str  # < Implementing module, must define ``_run(args)``
+    args: tuple[Arg, ...]
+    daemon: bool = False  # < Forwarded to a running ``bube serve``
+
+
+def _arg(*flags: str, **options: Any) -> Arg:
+    return Arg(flags, options)
+
+
+_JOBS_HELP = "Create directories and render files on N threads (slow storage)"
+_DURABLE_HELP = "fsync the rendered scaffold once before publishing it"
+_REINDEX_HELP = "Rebuild the experiment index by scanning experiments/ first"
+_QUOTA_HELP = (
+    "Evict least recently used pooled venvs above this size, e.g. 20G "
+    "(default: $BUILDBEN_VENV_POOL_QUOTA or 20G)"
+)
+
+COMMANDS: dict[str, Command] = {
+    command.name: command
+    for command in (
+        Command(
+            name="init-proj",
+            aliases=("proj",),
+            doc="Scaffolds a new src-layout Python project. Aliases: ['proj']",
+            module="buildben.init_proj",
+            daemon=True,
+            args=(
+                _arg("name", nargs="?", help="Project name"),
+                _arg(
+                    "-t",
+                    "--target-dir",
+                    default=".",
+                    help="(Parent-)Directory in which to create a project-directory",
+                ),
+                _arg(
+                    "-g", "--git-init", action="store_true", help="Initialise git repo"
+                ),
+                _arg(
+                    "-u",
+                    "--github-user",
+                    default="github-user",
+                    help="Github Username",
+                ),
+                _arg("-j", "--jobs", type=positive_int, default=1, help=_JOBS_HELP),
+                _arg("--durable", action="store_true", help=_DURABLE_HELP),
+                _arg(
+                    "--update",
+                    action="store_true",
+                    help="Re-render only templates that changed since the project "
+                    "was scaffolded",
+                ),
+                _arg(
+                    "--force",
+                    action="store_true",
+                    help="With --update, also overwrite files edited after scaffolding",
+                ),
+                _arg(
+                    "--from-spec",
+                    metavar="SPEC",
+                    help="Scaffold every project listed in a .toml or .jsonl spec file "
+                    "(-t/-u/-g act as defaults, -j sets the number of concurrent "
+                    "projects)",
+                ),
+            ),
+        ),
+        Command(
+            name="add-experim",
+            aliases=("exp",),
+            doc="Create a dated experiment scaffold inside ./experiments/. "
+            "Aliases: ['exp']",
+            module="buildben.add_experim",
+            daemon=True,
+            args=(
+                _arg(
+                    "name",
+                    nargs="?",
+                    default="experiment",
+                    help="Experiment name (e.g. validation, benchmark, etc.)",
+                ),
+                _arg("-j", "--jobs", type=positive_int, default=1, help=_JOBS_HELP),
+                _arg("--durable", action="store_true", help=_DURABLE_HELP),
+                _arg(
+                    "-m",
+                    "--matrix",
+                    metavar="GRID_TOML",
+                    help="Create one experiment per parameter set of a [grid] / "
+                    "[[runs]] TOML file, each with a params.json",
+                ),
+            ),
+        ),
+        Command(
+            name="env-snapshot",
+            aliases=("snp",),
+            doc="Snapshot a Python project into experiment requirements.lock, "
+            "experiment.env, wheel, and sdist files. Aliases: ['snp']",
+            module="buildben.env_snapshot",
+            daemon=True,
+            args=(
+                _arg(
+                    "experiment_dir",
+                    nargs="+",
+                    help="Experiment directories or glob patterns (e.g. "
+                    "'experiments/2026-10-*') to write lock and environment "
+                    "files into; commit, build and lock are shared.",
+                ),
+                _arg(
+                    "-j",
+                    "--jobs",
+                    type=positive_int,
+                    default=os.cpu_count() or 1,
+                    help="Link the snapshot into N experiments at a time "
+                    "(default: CPU count)",
+                ),
+                _arg(
+                    "--no-build-cache",
+                    dest="build_cache",
+                    action="store_false",
+                    help="Always run uv build and uv export instead of reusing "
+                    "a cached build of the same git tree (.buildben/build-cache) "
+                    "or export of the same uv.lock (.buildben/export-cache)",
+                ),
+                _arg(
+                    "--wheelhouse",
+                    action="store_true",
+                    help="Also collect a wheel of every locked package from the "
+                    "uv cache (fetching or building missing ones) into "
+                    "_wheelhouse/ with a hash-pinned requirements.txt, for "
+                    "offline installs",
+                ),
+            ),
+        ),
+        Command(
+            name="env-restore",
+            aliases=(),
+            doc="Recreate the virtual environment of an experiment snapshot from "
+            "its requirements.lock and project wheel, linking packages from the "
+            "uv cache.",
+            module="buildben.env_restore",
+            args=(
+                _arg(
+                    "experiment_dir",
+                    metavar="EXPERIMENT",
+                    help="Experiment path, directory name or short name (the "
+                    "most recent experiment with that name)",
+                ),
+                _arg(
+                    "--venv",
+                    metavar="PATH",
+                    help="Virtual environment to create (default: EXPERIMENT/.venv)",
+                ),
+                _arg(
+                    "-p",
+                    "--python",
+                    metavar="VERSION",
+                    help="Python version or interpreter for uv venv",
+                ),
+                _arg(
+                    "--link-mode",
+                    choices=("clone", "hardlink", "copy", "symlink"),
+                    help="How uv links packages from its cache (default: "
+                    "hardlink, clone on macOS)",
+                ),
+                _arg(
+                    "--force",
+                    action="store_true",
+                    help="Replace the virtual environment if it exists",
+                ),
+                _arg(
+                    "--clone",
+                    action="store_true",
+                    help="Clone the pooled venv (copy-on-write where the "
+                    "filesystem supports it) instead of symlinking to it",
+                ),
+                _arg(
+                    "--no-pool",
+                    dest="pool",
+                    action="store_false",
+                    help="Install into the venv directly instead of reusing a "
+                    "pooled venv with the same lock (.buildben/venv-pool)",
+                ),
+                _arg("--pool-quota", type=size_bytes, metavar="SIZE", help=_QUOTA_HELP),
+            ),
+        ),
+        Command(
+            name="exp-run",
+            aliases=(),
+            doc="Run a command in the snapshot venv of an experiment, reusing a "
+            "pooled venv with the same lock and building it only on a miss.",
+            module="buildben.exp_run",
+            args=(
+                _arg(
+                    "experiment_dir",
+                    metavar="EXPERIMENT",
+                    help="Experiment path, directory name or short name (the "
+                    "most recent experiment with that name)",
+                ),
+                _arg(
+                    "command",
+                    nargs=argparse.REMAINDER,
+                    help="Command to run in the experiment directory (default: "
+                    "python run.py)",
+                ),
+                _arg(
+                    "-p",
+                    "--python",
+                    metavar="VERSION",
+                    help="Python version or interpreter for uv venv",
+                ),
+                _arg("--pool-quota", type=size_bytes, metavar="SIZE", help=_QUOTA_HELP),
+            ),
+        ),
+        Command(
+            name="exp-list",
+            aliases=(),
+            doc="List the project's experiments with their snapshot commit, lock "
+            "file and artifact sizes, answered from .buildben/experiments.sqlite.",
+            module="buildben.exp_list",
+            args=(
+                _arg("--reindex", action="store_true", help=_REINDEX_HELP),
+                _arg(
+                    "-j",
+                    "--jobs",
+                    type=positive_int,
+                    default=os.cpu_count() or 1,
+                    help="Scan experiments on N threads with --reindex "
+                    "(default: CPU count)",
+                ),
+                _arg(
+                    "--snapshotted",
+                    action="store_true",
+                    help="Only list experiments with an experiment.env snapshot",
+                ),
+            ),
+        ),
+        Command(
+            name="exp-show",
+            aliases=(),
+            doc="Show the indexed details of one experiment.",
+            module="buildben.exp_show",
+            args=(
+                _arg(
+                    "experiment_dir",
+                    metavar="EXPERIMENT",
+                    help="Experiment path, directory name or short name (the "
+                    "most recent experiment with that name)",
+                ),
+                _arg("--reindex", action="store_true", help=_REINDEX_HELP),
+            ),
+        ),
+        Command(
+            name="store",
+            aliases=(),
+            doc="Maintain the content-addressed store of snapshot wheels and "
+            "sdists (.buildben/store); gc removes blobs no experiment links to.",
+            module="buildben.store",
+            args=(
+                _arg("action", choices=("gc",), help="Store action to run"),
+                _arg(
+                    "--dry-run",
+                    action="store_true",
+                    help="Only report what gc would remove",
+                ),
+            ),
+        ),
+        Command(
+            name="verify",
+            aliases=(),
+            doc="Check which generated files still match the scaffold manifest "
+            "(.buildben/manifest.json).",
+            module="buildben.verify",
+            args=(
+                _arg(
+                    "-j",
+                    "--jobs",
+                    type=positive_int,
+                    default=os.cpu_count() or 1,
+                    help="Hash files on N threads (default: CPU count)",
+                ),
+                _arg(
+                    "--refresh",
+                    action="store_true",
+                    help="Record new mtimes of files whose content still matches",
+                ),
+            ),
+        ),
+        Command(
+            name="serve",
+            aliases=(),
+            doc="Run a warm daemon that answers init-proj and add-experim "
+            "requests over a Unix socket; bube forwards to it while it runs.",
+            module="buildben.serve",
+            args=(
+                _arg(
+                    "--socket",
+                    metavar="PATH",
+                    help="Socket to listen on (default: $BUILDBEN_SOCKET or "
+                    "$XDG_RUNTIME_DIR/buildben-<uid>.sock)",
+                ),
+                _arg(
+                    "--idle-timeout",
+                    type=float,
+                    default=0,
+                    metavar="SECONDS",
+                    help="Exit after this long without requests (default: never)",
+                ),
+                _arg("--stop", action="store_true", help="Stop a running daemon"),
+            ),
+        ),
+        Command(
+            name="completion",
+            aliases=(),
+            doc="Print a static completion script for bash, zsh or fish; "
+            "completing never starts Python.",
+            module="buildben.completion",
+            args=(_arg("shell", choices=("bash", "zsh", "fish"), help="Target shell"),),
+        ),
+    )
+}
+
+
+def resolve(name: str) -> Command:
+    """Return the command registered under a name or alias.
+
+    :param name: Command name or alias as typed on the shell.
+    :return: The matching command.
+    :raises KeyError: If no command has this name or alias.
+    """
+    for command in COMMANDS.values():
+        if name == command.name or name in command.aliases:
+            return command
+    raise KeyError(name)
+
+
+def add_parser(
+    subparsers: argparse._SubParsersAction, command: Command
+) -> argparse.ArgumentParser:
+    """Attach the sub-parser of one command, without importing its module.
+
+    :param subparsers: Parent argparse subparser registry.
+    :param command: Command declaration.
+    :return: The new sub-parser.
+    """
+    p: argparse.ArgumentParser = subparsers.add_parser(
+        name=command.name,
+        aliases=list(command.aliases),
+        help=command.doc,
+        description=command.doc,
+    )
+    for arg in command.args:
+        p.add_argument(*arg.flags, **arg.options)
+    return p
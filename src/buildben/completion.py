@@ -0,0 +1,348 @@
+#!/usr/bin/env python3
+"""
+buildben.completion – static shell completion scripts for bube/buildben.
+
+The scripts are generated from the parser that ``cli.build_parser`` builds,
+so they list every subcommand, alias and flag. Completing never starts
+Python: experiment directories for ``env-snapshot``, ``env-restore``,
+``exp-run`` and ``exp-show`` are read from ``.buildben/experiments.idx``, which
+the experiment index (``exp_index``) rewrites whenever it changes.
+
+Usage from CLI aggregator:
+    bube completion bash > ~/.local/share/bash-completion/completions/bube
+    bube completion zsh > "${fpath[1]}/_bube"
+    bube completion fish > ~/.config/fish/completions/bube.fish
+"""
+
+from __future__ import annotations
+
+import argparse
+from typing import NamedTuple
+
+from . import cli, commands, exp_index
+
+_COMMAND = commands.COMMANDS["completion"]  # < Arguments are declared statically
+CMD_NAME = _COMMAND.name  # < Name of the CLI-command
+CMD_ALIASES = list(_COMMAND.aliases)  # < Alias shortcut of the CLI-command
+DOC = _COMMAND.doc
+
+PROGS = ("bube", "buildben")
+INDEX_RELPATH = exp_index.COMPLETION_RELPATH
+_EXPERIMENT_DESTS = {"experiment_dir"}  # < Positionals completed from the index
+_PATH_DESTS = {"target_dir", "from_spec", "matrix", "socket"}  # < Complete files
+
+
+def _add_my_parser(subparsers: argparse._SubParsersAction) -> None:
+    """Attach the completion sub-parser to a parser (e.g. when run as a script).
+
+    :param subparsers: Parent argparse subparser registry.
+    :return: None.
+    """
+    p = commands.add_parser(subparsers, _COMMAND)
+    p.set_defaults(func=_run)
+
+
+# ================================================================== #
+# === Parser tree                                                    #
+# ================================================================== #
+
+
+class _Option(NamedTuple):
+    flags: tuple[str, ...]
+    dest: str
+    takes_value: bool
+    help: str
+
+
+class _Positional(NamedTuple):
+    dest: str
+    optional: bool
+    choices: tuple[str, ...]
+
+
+class _Sub(NamedTuple):
+    names: tuple[str, ...]  # < Command name first, then aliases
+    help: str
+    options: tuple[_Option, ...]
+    positionals: tuple[_Positional, ...]
+
+
+def _options(parser: argparse.ArgumentParser) -> tuple[_Option, ...]:
+    return tuple(
+        _Option(
+            tuple(action.option_strings),
+            action.dest,
+            action.nargs != 0,
+            action.help or "",
+        )
+        for action in parser._actions
+        if action.option_strings
+    )
+
+
+def _subcommands(parser: argparse.ArgumentParser) -> list[_Sub]:
+    """Collect subcommands, aliases, flags and positionals from a parser.
+
+    :param parser: Top-level CLI parser.
+    :return: One entry per subcommand, in registration order.
+    """
+    action = next(
+        a for a in parser._actions if isinstance(a, argparse._SubParsersAction)
+    )
+    helps = {choice.dest: choice.help or "" for choice in action._choices_actions}
+    names: dict[int, list[str]] = {}
+    parsers: dict[int, argparse.ArgumentParser] = {}
+    for name, sub in action.choices.items():  # < Aliases map to the same parser
+        names.setdefault(id(sub), []).append(name)
+        parsers[id(sub)] = sub
+    return [
+        _Sub(
+            tuple(names[key]),
+            helps.get(names[key][0], ""),
+            _options(sub),
+            tuple(
+                _Positional(a.dest, a.nargs == "?", tuple(a.choices or ()))
+                for a in sub._actions
+                if not a.option_strings
+            ),
+        )
+        for key, sub in parsers.items()
+    ]
+
+
+# ================================================================== #
+# === Scripts                                                        #
+# ================================================================== #
+
+
+def _header(shell: str) -> list[str]:
+    return [
+        (
+            f"# {shell} completion for {'/'.join(PROGS)}, "
+            f"generated by `bube completion {shell}`."
+        ),
+        "# Static: completing never starts Python. Experiment directories come",
+        f"# from the nearest {INDEX_RELPATH.as_posix()}, kept current by bube.",
+        "",
+    ]
+
+
+def bash_script(parser: argparse.ArgumentParser) -> str:
+    """Return a bash completion script for *parser*.
+
+    :param parser: Top-level CLI parser.
+    :return: Script text.
+    """
+    subs = _subcommands(parser)
+    top = [name for sub in subs for name in sub.names]
+    top += [flag for option in _options(parser) for flag in option.flags]
+    lines = _header("bash") + [
+        "_bube_experiments() {",
+        "    local dir=$PWD",
+        "    while :; do",
+        f"        if [[ -f $dir/{INDEX_RELPATH.as_posix()} ]]; then",
+        f'            cat -- "$dir/{INDEX_RELPATH.as_posix()}"',
+        "            return",
+        "        fi",
+        "        [[ -z $dir || $dir == / ]] && return",
+        "        dir=${dir%/*}",
+        "    done",
+        "}",
+        "",
+        "_bube() {",
+        "    local cur=${COMP_WORDS[COMP_CWORD]} prev=${COMP_WORDS[COMP_CWORD-1]}",
+        "    local words='' values=''",
+        "    COMPREPLY=()",
+        "    if (( COMP_CWORD == 1 )); then",
+        f'        COMPREPLY=($(compgen -W "{" ".join(top)}" -- "$cur"))',
+        "        return",
+        "    fi",
+        "    case ${COMP_WORDS[1]} in",
+    ]
+    for sub in subs:
+        flags = " ".join(flag for option in sub.options for flag in option.flags)
+        valued = [option for option in sub.options if option.takes_value]
+        values = " ".join(flag for option in valued for flag in option.flags)
+        lines.append(f"        {'|'.join(sub.names)})")
+        lines.append(f"            words='{flags}' values='{values}'")
+        for positional in sub.positionals:
+            if positional.choices:
+                lines.append(f"            words+=' {' '.join(positional.choices)}'")
+            elif positional.dest in _EXPERIMENT_DESTS:
+                lines.append(
+                    '            [[ $cur != -* ]] && words+=" $(_bube_experiments)"'
+                )
+        lines.append("            ;;")
+    lines += [
+        "    esac",
+        '    [[ " $values " == *" $prev "* ]] && return  # < Paths via -o default',
+        '    COMPREPLY=($(compgen -W "$words" -- "$cur"))',
+        "}",
+        "",
+        f"complete -o default -F _bube {' '.join(PROGS)}",
+    ]
+    return "\n".join(lines) + "\n"
+
+
+def _zsh_quote(text: str, *, spec: bool = True) -> str:
+    """Escape text for a single-quoted zsh word.
+
+    :param text: Text to quote.
+    :param spec: Whether the word is an ``_arguments`` spec, where ``[]:``
+        are special.
+    :return: Escaped text, without the enclosing quotes.
+    """
+    text = text.replace("'", "'\\''")
+    if not spec:
+        return text
+    for char in "[]:":
+        text = text.replace(char, f"\\{char}")
+    return text
+
+
+def zsh_script(parser: argparse.ArgumentParser) -> str:
+    """Return a zsh completion script for *parser*.
+
+    :param parser: Top-level CLI parser.
+    :return: Script text, usable from ``fpath`` or via ``source``.
+    """
+    subs = _subcommands(parser)
+    lines = (
+        ["#compdef " + " ".join(PROGS)]
+        + _header("zsh")
+        + [
+            "_bube_experiments() {",
+            "    local dir=$PWD",
+            "    while true; do",
+            f"        if [[ -f $dir/{INDEX_RELPATH.as_posix()} ]]; then",
+            f'            compadd -- ${{(f)"$(<$dir/{INDEX_RELPATH.as_posix()})"}}',
+            "            return",
+            "        fi",
+            "        [[ $dir == / ]] && return 1",
+            "        dir=${dir:h}",
+            "    done",
+            "}",
+            "",
+            "_bube() {",
+            "    local -a commands",
+            "    commands=(",
+        ]
+    )
+    for sub in subs:
+        for name in sub.names:
+            lines.append(f"        '{name}:{_zsh_quote(sub.help, spec=False)}'")
+    lines += [
+        "    )",
+        "    if (( CURRENT == 2 )); then",
+        "        _describe -t commands 'bube command' commands",
+        "        return",
+        "    fi",
+        "    shift words",
+        "    (( CURRENT-- ))",
+        "    case $words[1] in",
+    ]
+    for sub in subs:
+        specs = []
+        for option in sub.options:
+            value = ""
+            if option.takes_value:
+                action = "_files" if option.dest in _PATH_DESTS else " "
+                value = f":{option.dest}:{action}"
+            for flag in option.flags:
+                specs.append(f"'{flag}[{_zsh_quote(option.help)}]{value}'")
+        for positional in sub.positionals:
+            if positional.choices:
+                action = f"({' '.join(positional.choices)})"
+            elif positional.dest in _EXPERIMENT_DESTS:
+                action = "_bube_experiments"
+            else:
+                action = " "
+            colon = "::" if positional.optional else ":"
+            specs.append(f"'{colon}{positional.dest}:{action}'")
+        lines.append(f"        {'|'.join(sub.names)})")
+        lines.append("            _arguments \\")
+        lines += [f"                {spec} \\" for spec in specs[:-1]]
+        lines.append(f"                {specs[-1]}")
+        lines.append("            ;;")
+    lines += [
+        "    esac",
+        "}",
+        "",
+        "if [[ $funcstack[1] == _bube ]]; then",
+        '    _bube "$@"',
+        "else",
+        f"    compdef _bube {' '.join(PROGS)}",
+        "fi",
+    ]
+    return "\n".join(lines) + "\n"
+
+
+def _fish_quote(text: str) -> str:
+    return "'" + text.replace("\\", "\\\\").replace("'", "\\'") + "'"
+
+
+def fish_script(parser: argparse.ArgumentParser) -> str:
+    """Return a fish completion script for *parser*.
+
+    :param parser: Top-level CLI parser.
+    :return: Script text.
+    """
+    subs = _subcommands(parser)
+    lines = _header("fish") + [
+        "function __bube_experiments",
+        "    set -l dir $PWD",
+        "    while true",
+        f"        if test -f $dir/{INDEX_RELPATH.as_posix()}",
+        f"            cat $dir/{INDEX_RELPATH.as_posix()}",
+        "            return",
+        "        end",
+        "        test $dir = /; and return 1",
+        "        set dir (dirname $dir)",
+        "    end",
+        "end",
+        "",
+        "complete -c bube -f",
+        "complete -c bube -n __fish_use_subcommand -s h -l help -d 'show help'",
+    ]
+    for sub in subs:
+        for name in sub.names:
+            lines.append(
+                f"complete -c bube -n __fish_use_subcommand -a {name} "
+                f"-d {_fish_quote(sub.help)}"
+            )
+    for sub in subs:
+        cond = _fish_quote(f"__fish_seen_subcommand_from {' '.join(sub.names)}")
+        for option in sub.options:
+            parts = [f"complete -c bube -n {cond}"]
+            for flag in option.flags:
+                kind = "-l" if flag.startswith("--") else "-s"
+                parts.append(f"{kind} {flag.lstrip('-')}")
+            if option.takes_value:
+                parts.append("-r -F" if option.dest in _PATH_DESTS else "-x")
+            parts.append(f"-d {_fish_quote(option.help)}")
+            lines.append(" ".join(parts))
+        for positional in sub.positionals:
+            if positional.choices:
+                choices = _fish_quote(" ".join(positional.choices))
+                lines.append(f"complete -c bube -n {cond} -a {choices}")
+            elif positional.dest in _EXPERIMENT_DESTS:
+                lines.append(f"complete -c bube -n {cond} -a '(__bube_experiments)'")
+    lines += ["", *(f"complete -c {prog} -w bube" for prog in PROGS[1:])]
+    return "\n".join(lines) + "\n"
+
+
+_SCRIPTS = {"bash": bash_script, "zsh": zsh_script, "fish": fish_script}
+
+
+# ================================================================== #
+# === implementation                                                 #
+# ================================================================== #
+def _run(args: argparse.Namespace) -> None:
+    print(_SCRIPTS[args.shell](cli.build_parser()), end="")
+
+
+if __name__ == "__main__":
+    _parser = argparse.ArgumentParser()
+    _add_my_parser(_parser.add_subparsers(dest="cmd", required=True))
+    parsed_args = _parser.parse_args()
+    parsed_args.func(parsed_args)
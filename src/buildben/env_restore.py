@@ -0,0 +1,455 @@
+#!/usr/bin/env python3
+"""
+buildben.env_restore – recreate the virtual environment of a snapshot.
+
+Reads an experiment's ``experiment.env`` and builds a venv from its
+``requirements.lock`` plus the project wheel in ``_setup``. Packages are
+linked from the uv cache (``--link-mode hardlink``, ``clone`` on macOS)
+instead of copied, and a ``_wheelhouse`` captured by ``env-snapshot
+--wheelhouse`` is installed from offline.
+
+The venv is built once per lock and project wheel in the venv pool (see
+``venv_pool``); the experiment's ``.venv`` links to it, or is a
+copy-on-write clone of it with ``--clone``.
+
+Usage from CLI aggregator:
+    bube env-restore EXPERIMENT [--venv PATH] [--python VERSION] [--force]
+                                [--clone | --no-pool] [--pool-quota SIZE]
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import os
+import shutil
+import sys
+import time
+from collections.abc import Callable, Iterator
+from pathlib import Path
+from typing import NamedTuple
+
+from . import commands, exp_index, utils, venv_pool, wheelhouse
+
+_COMMAND = commands.COMMANDS["env-restore"]  # < Arguments are declared statically
+CMD_NAME = _COMMAND.name  # < Name of the CLI-command
+CMD_ALIASES = list(_COMMAND.aliases)  # < Alias shortcut of the CLI-command
+DOC = _COMMAND.doc
+
+DEFAULT_LINK_MODE = "clone" if sys.platform == "darwin" else "hardlink"
+_VERSION_PROBE = "import platform; print(platform.python_version())"
+
+
+def _add_my_parser(subparsers: argparse._SubParsersAction) -> None:
+    """Attach the env-restore sub-parser to a parser (e.g. when run as a script).
+
+    :param subparsers: Parent argparse subparser registry.
+    :return: None.
+    """
+    p = commands.add_parser(subparsers, _COMMAND)
+    p.set_defaults(func=_run)
+
+
+class Restored(NamedTuple):
+    """A restored snapshot environment."""
+
+    experiment_dir: Path
+    venv: Path
+    python: Path  # < Interpreter of the venv
+    python_version: str
+    offline: bool  # < Installed from the experiment's wheelhouse
+    reused: bool  # < A pooled venv existed, nothing was installed
+    seconds: float  # < Until the interpreter was ready
+
+
+def venv_python(venv: Path) -> Path:
+    """Return the interpreter path of a virtual environment.
+
+    :param venv: Virtual environment directory.
+    :return: ``bin/python``, or ``Scripts/python.exe`` on Windows.
+    """
+    if os.name == "nt":
+        return venv / "Scripts" / "python.exe"
+    return venv / "bin" / "python"
+
+
+def _resolve_experiment(project_root: Path, key: str) -> Path:
+    """Resolve an experiment path, directory name or short name.
+
+    :param project_root: Project root directory.
+    :param key: Path relative to the cwd or project root, or a name known to
+        the experiment index.
+    :return: Absolute experiment directory, with symlinks resolved.
+    :raises utils.RestoreError: If no such experiment exists.
+    """
+    for candidate in (Path(key).expanduser(), project_root / key):
+        if candidate.is_dir():
+            return candidate.resolve()
+    try:
+        exp_index.ensure_index(project_root)
+    except utils.ScaffoldError as exc:
+        raise utils.RestoreError(f"env-restore: {exc}") from exc
+    row = exp_index.find_experiment(project_root, key)
+    if row is None:
+        raise utils.RestoreError(f"env-restore: no experiment '{key}'.")
+    return (project_root / row["path"]).resolve()
+
+
+def _experiment_relative(project_root: Path, experiment_dir: Path) -> Path:
+    """Return an experiment directory relative to the project root.
+
+    :param project_root: Project root directory, possibly through a symlink.
+    :param experiment_dir: Resolved experiment directory.
+    :return: Relative path.
+    :raises utils.RestoreError: If the experiment lies outside the project.
+    """
+    try:
+        return experiment_dir.relative_to(project_root.resolve())
+    except ValueError:
+        raise utils.RestoreError(
+            f"env-restore: {experiment_dir} is not inside the project {project_root}."
+        ) from None
+
+
+class SnapshotFiles(NamedTuple):
+    """What an experiment's ``experiment.env`` says to install."""
+
+    experiment_dir: Path
+    commit_hash: str | None
+    lock_path: Path
+    requirements: Path  # < The lock, or the wheelhouse's hash-pinned copy
+    find_links: Path | None  # < Wheelhouse to install from offline, if any
+    wheels: list[Path]  # < Project wheels in ``_setup``
+
+
+def read_snapshot(project_root: Path, experiment: str | Path) -> SnapshotFiles:
+    """Locate the files an experiment's snapshot environment is built from.
+
+    :param project_root: Project root directory.
+    :param experiment: Experiment path, directory name or short name.
+    :return: Lock, requirements, wheelhouse and project wheels.
+    :raises utils.RestoreError: If the experiment or its snapshot is missing,
+        or the experiment lies outside the project.
+    """
+    experiment_dir = _resolve_experiment(project_root, str(experiment))
+    experiment_relative = _experiment_relative(project_root, experiment_dir)
+    env_path = experiment_dir / "experiment.env"
+    if not env_path.is_file():
+        raise utils.RestoreError(
+            f"env-restore: {experiment_relative} has no experiment.env. "
+            f"Run `bube env-snapshot {experiment_relative}` first."
+        )
+    env = exp_index.read_env(env_path)
+    lock_path = project_root / env.get("LOCK_FILE", "")
+    if not env.get("LOCK_FILE") or not lock_path.is_file():
+        raise utils.RestoreError(
+            f"env-restore: the lock file of {experiment_relative} is missing."
+        )
+
+    requirements, find_links = lock_path, None
+    wheelhouse_dir = project_root / env["WHEELHOUSE"] if "WHEELHOUSE" in env else None
+    if wheelhouse_dir and (wheelhouse_dir / wheelhouse.REQUIREMENTS_NAME).is_file():
+        requirements = wheelhouse_dir / wheelhouse.REQUIREMENTS_NAME
+        find_links = wheelhouse_dir
+    return SnapshotFiles(
+        experiment_dir,
+        env.get("COMMIT_HASH"),
+        lock_path,
+        requirements,
+        find_links,
+        sorted((experiment_dir / "_setup").glob("*.whl")),
+    )
+
+
+async def _install(
+    project_root: Path,
+    venv: Path,
+    snapshot: SnapshotFiles,
+    *,
+    python: str | None,
+    link_mode: str,
+) -> None:
+    """Create the venv, install the locked requirements and the project wheel.
+
+    :param project_root: Project root, used as working directory.
+    :param venv: Virtual environment to create.
+    :param snapshot: Files to install, see ``read_snapshot``.
+    :param python: Python version or interpreter for ``uv venv``.
+    :param link_mode: uv link mode, e.g. ``hardlink`` or ``clone``.
+    :return: None.
+    :raises utils.RestoreError: If uv fails.
+    """
+    find_links = snapshot.find_links
+    offline = ["--offline"] if find_links is not None else []
+    await utils.run_checked(
+        [
+            "uv",
+            "venv",
+            str(venv),
+            *offline,
+            *(["--python", python] if python else []),
+        ],
+        cwd=project_root,
+        failure_hint="env-restore could not create the virtual environment with uv.",
+        error=utils.RestoreError,
+    )
+    install = [
+        "uv",
+        "pip",
+        "install",
+        "--python",
+        str(venv_python(venv)),
+        "--link-mode",
+        link_mode,
+        *offline,
+        *(["--find-links", str(find_links)] if find_links is not None else []),
+    ]
+    await utils.run_checked(
+        [*install, "-r", str(snapshot.requirements)],
+        cwd=project_root,
+        failure_hint=f"env-restore could not install {snapshot.requirements.name}.",
+        error=utils.RestoreError,
+    )
+    if snapshot.wheels:  # < Not hash-pinned, so not part of the requirements run
+        await utils.run_checked(
+            [*install, "--no-deps", *map(str, snapshot.wheels)],
+            cwd=project_root,
+            failure_hint="env-restore could not install the project wheel.",
+            error=utils.RestoreError,
+        )
+
+
+async def _probe(project_root: Path, venv: Path) -> str:
+    """Start the venv's interpreter and return its Python version."""
+    return await utils.run_checked(
+        [str(venv_python(venv)), "-c", _VERSION_PROBE],
+        cwd=project_root,
+        failure_hint=f"env-restore: the interpreter of {venv} does not start.",
+        error=utils.RestoreError,
+    )
+
+
+def _describe(snapshot: SnapshotFiles, link_mode: str) -> str:
+    source = "offline wheelhouse" if snapshot.find_links else snapshot.requirements.name
+    return f"from {source} (link mode: {link_mode})"
+
+
+def _build_pooled(
+    project_root: Path,
+    key: str,
+    snapshot: SnapshotFiles,
+    python: str | None,
+    link_mode: str,
+    log: Callable[[str], None],
+) -> Path:
+    """Build a pooled venv in its staging directory and move it into the pool.
+
+    Call it while holding ``venv_pool.building`` for *key*.
+
+    :return: The pooled venv.
+    :raises utils.RestoreError: If uv fails.
+    """
+    staging = venv_pool.staging_path(project_root, key)
+    shutil.rmtree(staging, ignore_errors=True)  # < Left over by an interrupted build
+    log(f"🐍  Creating pooled venv {key[:12]} {_describe(snapshot, link_mode)}")
+    try:
+        utils.run_phases(
+            _install(
+                project_root, staging, snapshot, python=python, link_mode=link_mode
+            )
+        )
+        return venv_pool.add(project_root, key, staging)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+
+@contextlib.contextmanager
+def pooled_venv(
+    project_root: Path,
+    snapshot: SnapshotFiles,
+    *,
+    python: str | None = None,
+    link_mode: str | None = None,
+    quota: int | None = None,
+    log: Callable[[str], None] | None = None,
+) -> Iterator[tuple[Path, bool]]:
+    """Hold the pooled venv of a snapshot, building it on a pool miss.
+
+    The venv is not evicted while the block runs (see ``venv_pool.in_use``).
+    Concurrent builds of one venv wait for each other, and a build is moved
+    into the pool only once it is complete. After a build, least recently
+    used venvs are evicted down to *quota*.
+
+    :param project_root: Project root directory.
+    :param snapshot: Files to install, see ``read_snapshot``.
+    :param python: Python version or interpreter for ``uv venv``.
+    :param link_mode: uv link mode; ``DEFAULT_LINK_MODE`` if None.
+    :param quota: Pool size limit in bytes; ``venv_pool.default_quota()``
+        if None.
+    :param log: Receives progress lines; silent if None.
+    :return: Context manager yielding the pooled venv and whether it already
+        existed.
+    :raises utils.RestoreError: If uv fails.
+    """
+    log = log or (lambda _line: None)
+    key = venv_pool.pool_key(snapshot.lock_path, snapshot.wheels, python)
+    with venv_pool.in_use(project_root, key):
+        with venv_pool.building(project_root, key):
+            venv = venv_pool.lookup(project_root, key)
+            reused = venv is not None
+            if reused:
+                log(f"♻️  Reusing pooled venv {key[:12]}")
+            else:
+                venv = _build_pooled(
+                    project_root,
+                    key,
+                    snapshot,
+                    python,
+                    link_mode or DEFAULT_LINK_MODE,
+                    log,
+                )
+
+        if not reused:
+            quota = venv_pool.default_quota() if quota is None else quota
+            removed, freed = venv_pool.evict(project_root, quota, keep=[key])
+            if removed:
+                log(
+                    f"🧹  Evicted {removed} pooled venvs "
+                    f"({exp_index.format_size(freed)}) "
+                    f"over the {exp_index.format_size(quota)} quota"
+                )
+        yield venv, reused
+
+
+def _restore(
+    project_root: Path,
+    experiment: str | Path,
+    *,
+    venv: str | Path | None = None,
+    python: str | None = None,
+    link_mode: str | None = None,
+    force: bool = False,
+    pool: bool = True,
+    clone: bool = False,
+    quota: int | None = None,
+    log: Callable[[str], None] | None = None,
+) -> Restored:
+    """Restore the snapshot environment of an experiment into a new venv.
+
+    With *pool*, the venv is a symlink to (or with *clone*, a copy-on-write
+    clone of) a pooled venv shared by every experiment with the same lock
+    and project wheel; see ``venv_pool``.
+
+    :param project_root: Project root directory.
+    :param experiment: Experiment path, directory name or short name.
+    :param venv: Virtual environment to create; ``<experiment>/.venv`` if None.
+    :param python: Python version or interpreter for ``uv venv``.
+    :param link_mode: uv link mode; ``DEFAULT_LINK_MODE`` if None.
+    :param force: Whether to replace an existing venv.
+    :param pool: Whether to go through the venv pool.
+    :param clone: Whether to clone the pooled venv instead of linking it.
+    :param quota: Pool size limit in bytes; see ``pooled_venv``.
+    :param log: Receives progress lines; silent if None.
+    :return: The restored environment and the time until it was ready.
+    :raises utils.RestoreError: If the experiment has no snapshot, the venv
+        exists, or uv fails.
+    """
+    started = time.perf_counter()
+    log = log or (lambda _line: None)
+    snapshot = read_snapshot(project_root, experiment)
+    experiment_dir = snapshot.experiment_dir
+
+    venv_dir = Path(venv).expanduser() if venv else experiment_dir / ".venv"
+    venv_dir = venv_dir if venv_dir.is_absolute() else Path.cwd() / venv_dir
+    if venv_dir.is_symlink() or venv_dir.exists():
+        if not force:
+            raise utils.RestoreError(
+                f"env-restore: {venv_dir} exists. Pass --force to recreate it."
+            )
+        if venv_dir.is_symlink():
+            venv_dir.unlink()  # < A pooled venv; leave it in the pool
+        else:
+            shutil.rmtree(venv_dir)
+
+    link_mode = link_mode or DEFAULT_LINK_MODE
+    experiment_relative = _experiment_relative(project_root, experiment_dir)
+    log(f"🔖  Restoring {experiment_relative} at commit {snapshot.commit_hash}")
+    with contextlib.ExitStack() as held:
+        reused = False
+        if pool:
+            pooled, reused = held.enter_context(
+                pooled_venv(
+                    project_root,
+                    snapshot,
+                    python=python,
+                    link_mode=link_mode,
+                    quota=quota,
+                    log=log,
+                )
+            )
+            venv_dir.parent.mkdir(parents=True, exist_ok=True)
+            if clone:
+                log(f"🐑  Cloning it into {venv_dir}")
+                venv_pool.clone_venv(pooled, venv_dir)
+            else:
+                log(f"🔗  Linking {venv_dir} to it")
+                venv_dir.symlink_to(pooled, target_is_directory=True)
+        else:
+            log(f"🐍  Creating {venv_dir} {_describe(snapshot, link_mode)}")
+            utils.run_phases(
+                _install(
+                    project_root, venv_dir, snapshot, python=python, link_mode=link_mode
+                )
+            )
+        version = utils.run_phases(_probe(project_root, venv_dir))
+    return Restored(
+        experiment_dir,
+        venv_dir,
+        venv_python(venv_dir),
+        version,
+        snapshot.find_links is not None,
+        reused,
+        time.perf_counter() - started,
+    )
+
+
+# ================================================================== #
+# === implementation                                                 #
+# ================================================================== #
+def _run(args: argparse.Namespace) -> None:
+    """Restore the snapshot environment of one experiment.
+
+    :param args: Parsed CLI arguments.
+    :return: None.
+    """
+    try:
+        project_root = utils.find_project_root()
+        restored = _restore(
+            project_root,
+            args.experiment_dir,
+            venv=args.venv,
+            python=args.python,
+            link_mode=args.link_mode,
+            force=args.force,
+            pool=args.pool,
+            clone=args.clone,
+            quota=args.pool_quota,
+            log=print,
+        )
+    except utils.BuildbenError as exc:
+        raise SystemExit(str(exc)) from exc
+
+    print(
+        f"✅  Python {restored.python_version} ready after "
+        f"{restored.seconds:.2f} s: {restored.python}"
+    )
+    activate = restored.venv / ("Scripts" if os.name == "nt" else "bin") / "activate"
+    print(f"Activate with:\n  source {activate}")
+
+
+if __name__ == "__main__":
+    _parser = argparse.ArgumentParser()
+    _add_my_parser(_parser.add_subparsers(dest="cmd", required=True))
+    parsed_args = _parser.parse_args()
+    parsed_args.func(parsed_args)
@@ -3,37 +3,51 @@
 from __future__ import annotations
 
 import argparse
+import asyncio
+import functools
+import glob
+import hashlib
+import json
 import os
-import subprocess
+import shutil
+import sqlite3
+import tempfile
+from collections.abc import Callable
 from pathlib import Path
-
-from . import utils
-
-CMD_NAME = "env-snapshot"
-CMD_ALIASES = ["snp"]
-DOC = (
-    "Snapshot a Python project into an experiment requirements.lock, "
-    "experiment.env, wheel, and sdist. "
-    f"Aliases: {CMD_ALIASES}"
+from typing import Any, NamedTuple
+
+from . import commands, exp_index, git_meta, lock_diff, store, utils, wheelhouse
+
+_COMMAND = commands.COMMANDS["env-snapshot"]  # < Arguments are declared statically
+CMD_NAME = _COMMAND.name  # < Name of the CLI-command
+CMD_ALIASES = list(_COMMAND.aliases)  # < Alias shortcut of the CLI-command
+DOC = _COMMAND.doc
+
+BUILD_CACHE_RELPATH = store.BUILD_CACHE_RELPATH
+_BUILD_COMMAND = ("uv", "build", "--no-sources")  # < Part of the cache key
+_CACHE_IGNORED_PATHS = ("experiments/", ".buildben/")  # < add-experim writes here
+EXPORT_CACHE_RELPATH = store.EXPORT_CACHE_RELPATH
+WHEELHOUSE_CACHE_RELPATH = store.WHEELHOUSE_CACHE_RELPATH
+_EXPORT_COMMAND = (  # < Part of the cache key
+    "uv",
+    "export",
+    "--format",
+    "requirements.txt",
+    "--all-extras",
+    "--all-groups",
+    "--no-emit-project",
+    "--locked",
 )
+_EXPORT_INPUTS = ("uv.lock", "pyproject.toml")  # < ``--locked`` checks both
 
 
 def _add_my_parser(subparsers: argparse._SubParsersAction) -> None:
-    """Attach the env-snapshot sub-parser to the CLI aggregator.
+    """Attach the env-snapshot sub-parser to a parser (e.g. when run as a script).
 
     :param subparsers: Parent argparse subparser registry.
     :return: None.
     """
-    p: argparse.ArgumentParser = subparsers.add_parser(
-        name=CMD_NAME,
-        aliases=CMD_ALIASES,
-        help=DOC,
-        description=DOC,
-    )
-    p.add_argument(
-        "experiment_dir",
-        help="Experiment directory to write lock and environment files into.",
-    )
+    p = commands.add_parser(subparsers, _COMMAND)
     p.set_defaults(func=_run)
 
 
@@ -52,7 +66,7 @@ def _resolve_experiment_dir(project_root: Path, raw_path: str) -> Path:
     :param project_root: Discovered project root.
     :param raw_path: CLI argument supplied as ``experiment_dir``.
     :return: Absolute experiment directory path.
-    :raises SystemExit: If the path resolves outside the project root.
+    :raises utils.SnapshotError: If the path resolves outside the project root.
     """
     candidate = Path(raw_path).expanduser()
     if not candidate.is_absolute():
@@ -61,49 +75,52 @@ def _resolve_experiment_dir(project_root: Path, raw_path: str) -> Path:
     try:
         experiment_dir.relative_to(project_root)
     except ValueError as exc:
-        raise SystemExit(
+        raise utils.SnapshotError(
             "env-snapshot: experiment_dir must resolve inside the project root."
         ) from exc
     return experiment_dir
 
 
-def _run_checked(command: list[str], *, cwd: Path, failure_hint: str) -> str:
-    """Run a required command and convert failures into CLI-friendly exits.
+# ================================================================== #
+# === Concurrent phases                                              #
+# ================================================================== #
 
-    :param command: Executable and arguments to run.
-    :param cwd: Working directory for the command.
-    :param failure_hint: Message shown if the command fails.
-    :return: Captured stdout.
-    :raises SystemExit: If the command exits non-zero.
-    """
-    try:
-        return utils.run_command(command, cwd=cwd)
-    except subprocess.CalledProcessError as exc:
-        stderr = (exc.stderr or "").strip()
-        detail = f"\n{stderr}" if stderr else ""
-        raise SystemExit(f"{failure_hint}{detail}") from exc
+
+class Commit(NamedTuple):
+    """HEAD metadata needed by a snapshot."""
+
+    hash: str  # < Abbreviated
+    date: str  # < ISO-like, as ``git log --date=iso``
+    tree_hash: str
 
 
-def _current_commit(project_root: Path) -> tuple[str, str]:
-    """Return the current short commit hash and ISO commit date.
+async def _current_commit(project_root: Path) -> Commit:
+    """Read hash, date and tree of HEAD.
+
+    ``.git`` is read directly (see ``git_meta``); repositories it cannot
+    handle cost one ``git log`` call.
 
     :param project_root: Git-backed project root.
-    :return: Short commit hash and commit date text.
+    :return: HEAD commit metadata.
+    :raises utils.SnapshotError: If there is no repository or commit.
     """
-    commit_hash = _run_checked(
-        ["git", "rev-parse", "--short", "HEAD"],
+    head = git_meta.read_head(project_root)
+    if head is not None:
+        return Commit(head.short_hash, head.date, head.tree_hash)
+    output = await utils.run_checked(
+        ["git", "log", "-1", "--format=%h%x00%cd%x00%T", "--date=iso"],
         cwd=project_root,
         failure_hint="env-snapshot requires a git repository with at least one commit.",
     )
-    commit_date = _run_checked(
-        ["git", "show", "-s", "--format=%cd", "--date=iso", commit_hash],
-        cwd=project_root,
-        failure_hint="env-snapshot could not inspect the current git commit.",
-    )
-    return commit_hash, commit_date
+    parts = output.split("\0")
+    if len(parts) != 3:
+        raise utils.SnapshotError(
+            "env-snapshot requires a git repository with at least one commit."
+        )
+    return Commit(*parts)
 
 
-def _tag_commit(project_root: Path, project_name: str, commit_hash: str) -> None:
+async def _tag_commit(project_root: Path, project_name: str, commit_hash: str) -> None:
     """Create an annotated snapshot tag if it does not already exist.
 
     :param project_root: Git-backed project root.
@@ -112,15 +129,17 @@ def _tag_commit(project_root: Path, project_name: str, commit_hash: str) -> None
     :return: None.
     """
     tag = f"env-snapshot-{commit_hash}"
+    if git_meta.tag_exists(project_root, tag):
+        return
     message = f"Snapshot of {project_name} at {commit_hash}"
-    subprocess.run(
-        ["git", "tag", "-a", tag, "-m", message],
-        cwd=project_root,
-        check=False,
-        stdout=subprocess.DEVNULL,
-        stderr=subprocess.DEVNULL,
-        text=True,
-    )
+    try:
+        await utils.run_checked(
+            ["git", "tag", "-a", tag, "-m", message],
+            cwd=project_root,
+            failure_hint="",
+        )
+    except utils.SnapshotError:
+        pass  # < Tag exists already
 
 
 def _write_experiment_env(
@@ -129,6 +148,7 @@ def _write_experiment_env(
     commit_hash: str,
     lock_path: Path,
     project_root: Path,
+    wheelhouse_dir: Path | None = None,
 ) -> None:
     """Write reproducibility metadata for the experiment snapshot.
 
@@ -136,13 +156,14 @@ def _write_experiment_env(
     :param commit_hash: Short git commit hash being snapshotted.
     :param lock_path: Requirements lock file path.
     :param project_root: Project root used to compute relative paths.
+    :param wheelhouse_dir: Offline wheelhouse, if one was captured.
     :return: None.
     """
     lock_relative = lock_path.relative_to(project_root)
-    env_path.write_text(
-        f"COMMIT_HASH={commit_hash}\nLOCK_FILE={lock_relative}\n",
-        encoding="utf-8",
-    )
+    content = f"COMMIT_HASH={commit_hash}\nLOCK_FILE={lock_relative}\n"
+    if wheelhouse_dir is not None:
+        content += f"WHEELHOUSE={wheelhouse_dir.relative_to(project_root)}\n"
+    env_path.write_text(content, encoding="utf-8")
 
 
 def _ensure_uv_lock(project_root: Path) -> None:
@@ -150,77 +171,728 @@ def _ensure_uv_lock(project_root: Path) -> None:
 
     :param project_root: Project root expected to contain ``uv.lock``.
     :return: None.
-    :raises SystemExit: If ``uv.lock`` is missing.
+    :raises utils.SnapshotError: If ``uv.lock`` is missing.
     """
     if not (project_root / "uv.lock").is_file():
-        raise SystemExit(
+        raise utils.SnapshotError(
             "env-snapshot requires uv.lock. Run `uv lock` in the project root first."
         )
 
 
-def _run(args: argparse.Namespace) -> None:
-    """Create a reproducibility snapshot for one experiment directory.
+# ================================================================== #
+# === Build cache                                                    #
+# ================================================================== #
 
-    :param args: Parsed CLI arguments.
-    :return: None.
-    """
-    project_root = utils.find_project_root()
-    project_name = _project_name(project_root)
-    experiment_dir = _resolve_experiment_dir(project_root, args.experiment_dir)
-    setup_dir = experiment_dir / "_setup"
-    lock_path = setup_dir / "requirements.lock"
-    env_path = experiment_dir / "experiment.env"
 
-    experiment_dir.mkdir(parents=True, exist_ok=True)
-    setup_dir.mkdir(parents=True, exist_ok=True)
-    _ensure_uv_lock(project_root)
+async def _build_cache_key(project_root: Path, tree_hash: str) -> str | None:
+    """Return the build cache key of the current checkout.
 
-    experiment_relative = experiment_dir.relative_to(project_root)
-    print(f"📂  Project '{project_name}' in '{project_root}'")
-    print(f"🔍  Targeting experiment directory: '{experiment_relative}'")
+    The key hashes the git tree of HEAD, the build command and the uv version.
+    ``uv build`` packages the working tree, so uncommitted changes outside
+    ``experiments/`` and ``.buildben/`` make a build uncacheable.
 
-    commit_hash, commit_date = _current_commit(project_root)
-    print(f"🔖  Using commit: {commit_hash} ({commit_date})")
-    _tag_commit(project_root, project_name, commit_hash)
+    :param project_root: Git-backed project root.
+    :param tree_hash: Tree hash of HEAD.
+    :return: Hex digest, or None if the working tree has uncommitted changes.
+    """
+    if git_meta.index_changes(project_root, exclude=_CACHE_IGNORED_PATHS):
+        return None  # < A tracked file changed; no need to ask git status
+    changes_query = utils.run_checked(
+        [
+            "git",
+            "status",
+            "--porcelain",
+            "--",
+            ".",
+            *(f":(exclude){path}" for path in _CACHE_IGNORED_PATHS),
+        ],
+        cwd=project_root,
+        failure_hint="env-snapshot could not inspect the git working tree.",
+    )
+    version_query = utils.run_checked(
+        ["uv", "--version"],
+        cwd=project_root,
+        failure_hint="env-snapshot requires uv on PATH.",
+    )
+    changes, uv_version = await utils.gather_phases(changes_query, version_query)
+    if changes:
+        return None
+    key_parts = (tree_hash, *_BUILD_COMMAND, uv_version)
+    return hashlib.sha256("\0".join(key_parts).encode("utf-8")).hexdigest()
+
+
+async def _uv_build(project_root: Path, out_dir: Path) -> None:
+    """Build the project's wheel and sdist into *out_dir*.
 
-    print(f"📦  Building source distribution and wheel into {setup_dir}")
-    _run_checked(
-        ["uv", "build", "--out-dir", str(setup_dir), "--no-sources"],
+    :param project_root: Project root containing ``pyproject.toml``.
+    :param out_dir: Output directory for the artifacts.
+    :return: None.
+    :raises utils.SnapshotError: If ``uv build`` fails.
+    """
+    await utils.run_checked(
+        [*_BUILD_COMMAND[:2], "--out-dir", str(out_dir), *_BUILD_COMMAND[2:]],
         cwd=project_root,
         failure_hint="env-snapshot could not build release artifacts with uv.",
     )
 
-    print(f"📌  Exporting locked requirements to {lock_path}")
-    _run_checked(
+
+def _read_cache(
+    project_root: Path, cache_relpath: Path, key: str
+) -> dict[str, str] | None:
+    """Return the store digests cached under a key.
+
+    :param project_root: Project root directory.
+    :param cache_relpath: Cache directory, e.g. ``BUILD_CACHE_RELPATH``.
+    :param key: Cache key, see ``_build_cache_key`` and ``_export_cache_key``.
+    :return: Store digests by file name, or None on a cache miss (including
+        entries whose blobs ``bube store gc`` removed).
+    """
+    path = project_root / cache_relpath / f"{key}.json"
+    try:
+        files = json.loads(path.read_text(encoding="utf-8"))
+    except (FileNotFoundError, ValueError):
+        return None
+    return files if store.has_blobs(project_root, files.values()) else None
+
+
+def _write_cache(
+    project_root: Path, cache_relpath: Path, key: str, files: dict[str, str]
+) -> None:
+    """Record store digests under a cache key."""
+    path = project_root / cache_relpath / f"{key}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp_path.write_text(json.dumps(files, sort_keys=True) + "\n", encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+async def _build_into_store(project_root: Path) -> dict[str, str]:
+    """Build the wheel and sdist and move them into the artifact store.
+
+    :param project_root: Project root containing ``pyproject.toml``.
+    :return: Store digests by artifact file name.
+    :raises utils.SnapshotError: If ``uv build`` fails.
+    """
+    store_dir = project_root / store.STORE_RELPATH
+    store_dir.mkdir(parents=True, exist_ok=True)
+    staging = Path(tempfile.mkdtemp(prefix=".build-", dir=store_dir))
+    try:
+        await _uv_build(project_root, staging)
+        return {
+            artifact.name: store.add(project_root, artifact)
+            for artifact in sorted(staging.iterdir())
+            if artifact.name.endswith((".whl", ".tar.gz"))
+        }
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+
+
+async def _build_artifacts(
+    project_root: Path,
+    tree_hash: str,
+    log: Callable[[str], None],
+    build_cache: bool = True,
+) -> dict[str, str]:
+    """Build the wheel and sdist of the current commit into the store.
+
+    Artifacts live in the content-addressed store (see ``store``). Builds are
+    cached by ``_build_cache_key`` in ``.buildben/build-cache/<key>.json``, so
+    snapshots of one commit build once.
+
+    :param project_root: Git-backed project root.
+    :param tree_hash: Tree hash of HEAD.
+    :param log: Receives progress lines.
+    :param build_cache: Whether to use the build cache.
+    :return: Store digests by artifact file name.
+    :raises utils.SnapshotError: If ``uv build`` fails.
+    """
+    key = await _build_cache_key(project_root, tree_hash) if build_cache else None
+    artifacts = _read_cache(project_root, BUILD_CACHE_RELPATH, key) if key else None
+    if artifacts is not None:
+        log(f"♻️  Reusing cached build {key[:12]}")
+        return artifacts
+
+    if build_cache and key is None:
+        log("⚠️  Uncommitted changes, building without the build cache")
+    log("📦  Building source distribution and wheel")
+    artifacts = await _build_into_store(project_root)
+    if key is not None:
+        _write_cache(project_root, BUILD_CACHE_RELPATH, key, artifacts)
+    return artifacts
+
+
+# ================================================================== #
+# === Snapshot                                                       #
+# ================================================================== #
+
+
+def _store_text(project_root: Path, text: str) -> str:
+    """Write a small generated file into the artifact store.
+
+    :param project_root: Project root directory.
+    :param text: File content.
+    :return: Store digest of the content.
+    """
+    store_dir = project_root / store.STORE_RELPATH
+    store_dir.mkdir(parents=True, exist_ok=True)
+    fd, raw_path = tempfile.mkstemp(prefix=".text-", dir=store_dir)
+    with os.fdopen(fd, "w", encoding="utf-8") as text_file:
+        text_file.write(text)
+    return store.add(project_root, Path(raw_path))
+
+
+def _export_cache_key(project_root: Path) -> str:
+    """Return the export cache key of the current lock.
+
+    The key hashes ``uv.lock``, ``pyproject.toml`` (``--locked`` fails when
+    the lock is stale) and the export command.
+
+    :param project_root: Project root containing ``uv.lock``.
+    :return: Hex digest.
+    """
+    key_parts = [
+        f"{name}={utils.sha256_file(project_root / name)}"
+        for name in _EXPORT_INPUTS
+        if (project_root / name).is_file()
+    ]
+    key_parts += _EXPORT_COMMAND
+    return hashlib.sha256("\0".join(key_parts).encode("utf-8")).hexdigest()
+
+
+async def _export_lock(
+    project_root: Path, log: Callable[[str], None], export_cache: bool = True
+) -> str:
+    """Export the locked requirements of ``uv.lock`` into the store.
+
+    Exports are cached by ``_export_cache_key`` in
+    ``.buildben/export-cache/<key>.json``, so ``uv export`` only runs after
+    the lock changed.
+
+    :param project_root: Project root containing ``uv.lock``.
+    :param log: Receives progress lines.
+    :param export_cache: Whether to use the export cache.
+    :return: Store digest of the ``requirements.lock`` content.
+    :raises utils.SnapshotError: If ``uv export`` fails.
+    """
+    key = _export_cache_key(project_root) if export_cache else None
+    cached = _read_cache(project_root, EXPORT_CACHE_RELPATH, key) if key else None
+    if cached is not None:
+        log(f"♻️  Reusing exported requirements {key[:12]}")
+        return cached["requirements.lock"]
+
+    log("📌  Exporting locked requirements")
+    store_dir = project_root / store.STORE_RELPATH
+    store_dir.mkdir(parents=True, exist_ok=True)
+    fd, raw_path = tempfile.mkstemp(prefix=".lock-", dir=store_dir)
+    os.close(fd)
+    lock_path = Path(raw_path)
+    try:
+        await utils.run_checked(
+            [*_EXPORT_COMMAND, "--output-file", str(lock_path)],
+            cwd=project_root,
+            failure_hint=(
+                "env-snapshot could not export requirements from uv.lock. "
+                "Run `uv lock` if pyproject.toml changed."
+            ),
+        )
+        digest = store.add(project_root, lock_path)
+    finally:
+        lock_path.unlink(missing_ok=True)  # < Only left over on failure
+    if key is not None:
+        _write_cache(
+            project_root, EXPORT_CACHE_RELPATH, key, {"requirements.lock": digest}
+        )
+    return digest
+
+
+def _diff_previous_lock(
+    project_root: Path,
+    previous: sqlite3.Row | None,
+    lock_digest: str,
+    log: Callable[[str], None],
+) -> str | None:
+    """Diff the new requirements lock against the previous snapshot's.
+
+    :param project_root: Project root.
+    :param previous: Index row of the previous snapshot, see
+        ``exp_index.latest_snapshot``.
+    :param lock_digest: Store digest of the new ``requirements.lock``.
+    :param log: Receives the diff summary.
+    :return: Store digest of a ``lock-diff.json``, or None without a previous
+        snapshot or if the lock did not change.
+    """
+    if previous is None:
+        return None
+    previous_lock = project_root / previous["lock_file"]
+    try:
+        old_text = previous_lock.read_text(encoding="utf-8")
+    except (FileNotFoundError, UnicodeDecodeError):
+        return None
+    new_text = store.blob_path(project_root, lock_digest).read_text(encoding="utf-8")
+    if old_text == new_text:
+        return None
+
+    diff = lock_diff.diff_requirements(
+        lock_diff.parse_requirements(old_text), lock_diff.parse_requirements(new_text)
+    )
+    summary, *details = lock_diff.format_diff(diff)
+    log(f"🔀  Lock changed since {previous['path']}: {summary}")
+    for line in details:
+        log(line)
+
+    content = json.dumps({"previous": previous["lock_file"], **diff}, indent=2)
+    return _store_text(project_root, content + "\n")
+
+
+# ================================================================== #
+# === Wheelhouse                                                     #
+# ================================================================== #
+
+
+async def _fill_uv_cache(project_root: Path, pins: list[lock_diff.Pin]) -> None:
+    """Let uv download or build wheels for pins missing from its cache.
+
+    The pins are installed without dependencies into a throwaway target;
+    only the wheels uv unpacks into its cache on the way are kept. Pins whose
+    marker excludes this platform are skipped by uv.
+
+    :param project_root: Project root, used as working directory.
+    :param pins: Pins without a cached wheel.
+    :return: None.
+    :raises utils.SnapshotError: If uv cannot fetch or build a wheel.
+    """
+    staging = Path(
+        tempfile.mkdtemp(prefix=".wheels-", dir=project_root / store.STORE_RELPATH)
+    )
+    try:
+        requirements = staging / "missing.txt"
+        requirements.write_text(
+            "".join(
+                f"{pin.name}=={pin.version}"
+                + (f" ; {pin.marker}" if pin.marker else "")
+                + "\n"
+                for pin in pins
+            ),
+            encoding="utf-8",
+        )
+        await utils.run_checked(
+            [
+                "uv",
+                "pip",
+                "install",
+                "--no-deps",
+                "--target",
+                str(staging / "target"),
+                "-r",
+                str(requirements),
+            ],
+            cwd=project_root,
+            failure_hint="env-snapshot --wheelhouse could not fetch or build the "
+            "wheels missing from the uv cache.",
+        )
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+
+
+async def _capture_wheelhouse(
+    project_root: Path,
+    lock_digest: str,
+    log: Callable[[str], None],
+    wheelhouse_cache: bool = True,
+) -> dict[str, str]:
+    """Collect a wheel of every locked distribution into the store.
+
+    Wheels are rebuilt from the unpacked wheels in the uv cache (see
+    ``wheelhouse``); missing ones are fetched or built by uv first. The
+    result is cached by lock digest in ``.buildben/wheelhouse-cache``.
+
+    :param project_root: Project root directory.
+    :param lock_digest: Store digest of the exported ``requirements.lock``.
+    :param log: Receives progress lines.
+    :param wheelhouse_cache: Whether to use the wheelhouse cache.
+    :return: Store digests by wheelhouse file name, including the hash-pinned
+        ``requirements.txt`` and ``SHA256SUMS``.
+    :raises utils.SnapshotError: If a required wheel cannot be provided.
+    """
+    if wheelhouse_cache:
+        cached = _read_cache(project_root, WHEELHOUSE_CACHE_RELPATH, lock_digest)
+        if cached is not None:
+            log(f"♻️  Reusing wheelhouse {lock_digest[:12]}")
+            return cached
+
+    log("🛞  Collecting wheels from the uv cache")
+    lock_text = store.blob_path(project_root, lock_digest).read_text(encoding="utf-8")
+    pins = []
+    for pin in lock_diff.iter_pins(lock_text):
+        if pin.direct:
+            log(f"⚠️  Skipping direct reference {pin.name} @ {pin.version}")
+        else:
+            pins.append(pin)
+    cache_dir = Path(
+        await utils.run_checked(
+            ["uv", "cache", "dir"],
+            cwd=project_root,
+            failure_hint="env-snapshot --wheelhouse requires uv on PATH.",
+        )
+    )
+    cached_wheels = wheelhouse.find_cached_wheels(cache_dir)
+    missing = [pin for pin in pins if (pin.name, pin.version) not in cached_wheels]
+    if missing:
+        log(f"🔨  Fetching or building {len(missing)} wheels not in the uv cache")
+        await _fill_uv_cache(project_root, missing)
+        cached_wheels = wheelhouse.find_cached_wheels(cache_dir)
+
+    found = []
+    for pin in pins:
+        if (pin.name, pin.version) in cached_wheels:
+            found.append(pin)
+        elif pin.marker:
+            log(f"⚠️  No wheel for {pin.name}=={pin.version} ; {pin.marker}")
+        else:
+            raise utils.SnapshotError(
+                f"env-snapshot --wheelhouse found no wheel for "
+                f"{pin.name}=={pin.version} in the uv cache ({cache_dir})."
+            )
+
+    staging = Path(
+        tempfile.mkdtemp(prefix=".wheels-", dir=project_root / store.STORE_RELPATH)
+    )
+    try:
+
+        def pack(wheel: wheelhouse.CachedWheel) -> str:
+            return store.add(project_root, wheelhouse.pack_wheel(wheel, staging))
+
+        wheels = {
+            wheel.root / wheel.dist_info: wheel
+            for pin in found
+            for wheel in cached_wheels[pin.name, pin.version]
+        }
+        digests = await asyncio.to_thread(
+            utils.run_parallel,
+            {path: functools.partial(pack, wheel) for path, wheel in wheels.items()},
+            os.cpu_count() or 1,
+        )
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+
+    files = {wheel.filename: digests[path] for path, wheel in wheels.items()}
+    pin_digests = {
+        (pin.name, pin.version): [
+            digests[wheel.root / wheel.dist_info]
+            for wheel in cached_wheels[pin.name, pin.version]
+        ]
+        for pin in found
+    }
+    sha256sums = wheelhouse.sha256sums_text(files)
+    files[wheelhouse.REQUIREMENTS_NAME] = _store_text(
+        project_root, wheelhouse.requirements_text(found, pin_digests)
+    )
+    files[wheelhouse.SHA256SUMS_NAME] = _store_text(project_root, sha256sums)
+    _write_cache(project_root, WHEELHOUSE_CACHE_RELPATH, lock_digest, files)
+    log(f"🛞  Collected {len(digests)} wheels")
+    return files
+
+
+# ================================================================== #
+# === Fan-out                                                        #
+# ================================================================== #
+
+
+class Snapshot(NamedTuple):
+    """Files and commit captured by one snapshot."""
+
+    experiment_dir: Path
+    commit_hash: str
+    commit_date: str
+    lock_path: Path
+    env_path: Path
+    artifacts: list[Path]  # < Wheel and sdist in ``_setup``
+    lock_diff: Path | None = None  # < ``lock-diff.json`` if the lock changed
+    wheelhouse: Path | None = None  # < ``_wheelhouse`` with ``--wheelhouse``
+
+
+def _resolve_experiment_dirs(project_root: Path, raw_paths: list[str]) -> list[Path]:
+    """Resolve experiment directories and glob patterns.
+
+    Patterns such as ``experiments/2026-10-*`` are matched against existing
+    directories, relative to the project root unless absolute.
+
+    :param project_root: Discovered project root.
+    :param raw_paths: CLI arguments supplied as ``experiment_dir``.
+    :return: Absolute experiment directories, without duplicates.
+    :raises utils.SnapshotError: If a pattern matches nothing or a path
+        resolves outside the project root.
+    """
+    experiment_dirs: dict[Path, None] = {}
+    for raw_path in raw_paths:
+        if not any(char in raw_path for char in "*?["):
+            experiment_dirs[_resolve_experiment_dir(project_root, raw_path)] = None
+            continue
+        pattern = os.path.join(project_root, os.path.expanduser(raw_path))
+        matches = sorted(Path(match) for match in glob.glob(pattern))
+        matches = [match for match in matches if match.is_dir()]
+        if not matches:
+            raise utils.SnapshotError(
+                f"env-snapshot: '{raw_path}' matched no experiment directories."
+            )
+        for match in matches:
+            experiment_dirs[_resolve_experiment_dir(project_root, str(match))] = None
+    return list(experiment_dirs)
+
+
+def _fan_out(
+    project_root: Path,
+    experiment_dirs: list[Path],
+    commit: Commit,
+    files: dict[str, str],
+    jobs: int,
+) -> list[Snapshot]:
+    """Link one set of snapshot files into every experiment.
+
+    :param project_root: Project root.
+    :param experiment_dirs: Target experiment directories.
+    :param commit: Snapshotted commit.
+    :param files: Store digests by path relative to the experiment, including
+        ``_setup/requirements.lock``.
+    :param jobs: Maximum number of experiments linked at a time.
+    :return: One snapshot per experiment, in order.
+    :raises utils.ScaffoldError: If any experiment could not be written.
+    """
+    diff_relative = f"_setup/{lock_diff.LOCK_DIFF_NAME}"
+    wheelhouse_prefix = f"{wheelhouse.WHEELHOUSE_DIRNAME}/"
+    with_wheelhouse = any(relative.startswith(wheelhouse_prefix) for relative in files)
+
+    def clear(experiment_dir: Path) -> None:
+        wheelhouse_dir = experiment_dir / wheelhouse.WHEELHOUSE_DIRNAME
+        if with_wheelhouse and wheelhouse_dir.is_dir():
+            shutil.rmtree(wheelhouse_dir)  # < Wheels of an older lock
+        for relative in files:
+            (experiment_dir / relative).parent.mkdir(parents=True, exist_ok=True)
+
+    def publish(experiment_dir: Path) -> Snapshot:
+        setup_dir = experiment_dir / "_setup"
+        wheelhouse_dir = experiment_dir / wheelhouse.WHEELHOUSE_DIRNAME
+        diff_path = experiment_dir / diff_relative
+        if diff_relative not in files:
+            diff_path.unlink(missing_ok=True)  # < Describes an older lock
+        env_path = experiment_dir / "experiment.env"
+        lock_path = setup_dir / "requirements.lock"
+        _write_experiment_env(
+            env_path,
+            commit_hash=commit.hash,
+            lock_path=lock_path,
+            project_root=project_root,
+            wheelhouse_dir=wheelhouse_dir if with_wheelhouse else None,
+        )
+        artifacts = sorted([*setup_dir.glob("*.whl"), *setup_dir.glob("*.tar.gz")])
+        return Snapshot(
+            experiment_dir,
+            commit.hash,
+            commit.date,
+            lock_path,
+            env_path,
+            artifacts,
+            diff_path if diff_path.is_file() else None,
+            wheelhouse_dir if with_wheelhouse else None,
+        )
+
+    def each_experiment(task: Callable[[Path], Any]) -> dict[Path, Any]:
+        return utils.run_parallel(
+            {
+                experiment_dir: functools.partial(task, experiment_dir)
+                for experiment_dir in experiment_dirs
+            },
+            jobs=jobs,
+        )
+
+    each_experiment(clear)
+    store.link_many(
+        project_root,
         [
-            "uv",
-            "export",
-            "--format",
-            "requirements.txt",
-            "--all-extras",
-            "--all-groups",
-            "--no-emit-project",
-            "--output-file",
-            str(lock_path),
-            "--locked",
+            (experiment_dir / relative, digest)
+            for experiment_dir in experiment_dirs
+            for relative, digest in files.items()
         ],
-        cwd=project_root,
-        failure_hint=(
-            "env-snapshot could not export requirements from uv.lock. "
-            "Run `uv lock` if pyproject.toml changed."
-        ),
+        jobs=jobs,
+    )
+    snapshots = each_experiment(publish)
+    exp_index.index_experiments(project_root, experiment_dirs)
+    return list(snapshots.values())
+
+
+def _snapshot_many(
+    project_root: Path,
+    raw_experiment_dirs: list[str | Path],
+    log: Callable[[str], None] | None = None,
+    project_name: str | None = None,
+    build_cache: bool = True,
+    jobs: int = 1,
+    with_wheelhouse: bool = False,
+) -> list[Snapshot]:
+    """Snapshot the current commit into several experiment directories.
+
+    Commit, artifacts and requirements lock are produced once and then
+    hardlinked into every experiment's ``_setup``. If the lock differs from
+    the previous snapshot's, a ``lock-diff.json`` is linked next to it.
+
+    :param project_root: Git-backed project root containing ``uv.lock``.
+    :param raw_experiment_dirs: Experiment directories or glob patterns,
+        relative to the root or absolute.
+    :param log: Receives progress lines; silent if None.
+    :param project_name: Name used for the snapshot tag; see ``_project_name``.
+    :param build_cache: Whether to reuse cached builds of the same tree and
+        cached exports of the same lock.
+    :param jobs: Maximum number of experiments linked at a time.
+    :param with_wheelhouse: Whether to also capture an offline wheelhouse
+        into each experiment's ``_wheelhouse``.
+    :return: One snapshot per experiment directory.
+    :raises utils.SnapshotError: If a snapshot step fails.
+    :raises utils.ScaffoldError: If linking into an experiment fails.
+    """
+    log = log or (lambda _line: None)
+    project_name = project_name or _project_name(project_root)
+    experiment_dirs = _resolve_experiment_dirs(
+        project_root, [str(raw) for raw in raw_experiment_dirs]
     )
+    for experiment_dir in experiment_dirs:
+        (experiment_dir / "_setup").mkdir(parents=True, exist_ok=True)
+    _ensure_uv_lock(project_root)
+
+    log(f"📂  Project '{project_name}' in '{project_root}'")
+    if len(experiment_dirs) == 1:
+        experiment_relative = experiment_dirs[0].relative_to(project_root)
+        log(f"🔍  Targeting experiment directory: '{experiment_relative}'")
+    else:
+        log(f"🔍  Targeting {len(experiment_dirs)} experiment directories:")
+        for experiment_dir in experiment_dirs:
+            log(f"    {experiment_dir.relative_to(project_root)}")
+
+    async def commit_phases() -> tuple[Commit, dict[str, str]]:
+        commit = await _current_commit(project_root)
+        log(f"🔖  Using commit: {commit.hash} ({commit.date})")
+        _, artifacts = await utils.gather_phases(
+            _tag_commit(project_root, project_name, commit.hash),
+            _build_artifacts(project_root, commit.tree_hash, log, build_cache),
+        )
+        return commit, artifacts
+
+    async def lock_phases() -> tuple[str, dict[str, str]]:
+        lock_digest = await _export_lock(project_root, log, export_cache=build_cache)
+        if not with_wheelhouse:
+            return lock_digest, {}
+        wheels = await _capture_wheelhouse(project_root, lock_digest, log, build_cache)
+        return lock_digest, wheels
+
+    # > Blobs stay unreferenced until the fan-out; keep gc out until then
+    with store.locked(project_root):
+        # > The lock export needs no commit; it runs alongside tag and build
+        (commit, artifacts), (lock_digest, wheels) = utils.run_phases(
+            utils.gather_phases(commit_phases(), lock_phases())
+        )
+
+        setup_files = {"requirements.lock": lock_digest, **artifacts}
+        previous = exp_index.latest_snapshot(project_root)  # < Before the fan-out
+        diff_digest = _diff_previous_lock(project_root, previous, lock_digest, log)
+        if diff_digest is not None:
+            setup_files[lock_diff.LOCK_DIFF_NAME] = diff_digest
+        files = {f"_setup/{name}": digest for name, digest in setup_files.items()}
+        files.update(
+            (f"{wheelhouse.WHEELHOUSE_DIRNAME}/{name}", digest)
+            for name, digest in wheels.items()
+        )
+
+        if len(experiment_dirs) == 1:
+            log("🔖  Writing experiment.env")
+        else:
+            log(f"🔗  Linking the snapshot into {len(experiment_dirs)} experiments")
+        return _fan_out(project_root, experiment_dirs, commit, files, jobs)
+
+
+def _snapshot(
+    project_root: Path,
+    raw_experiment_dir: str | Path,
+    log: Callable[[str], None] | None = None,
+    project_name: str | None = None,
+    build_cache: bool = True,
+    with_wheelhouse: bool = False,
+) -> Snapshot:
+    """Create a reproducibility snapshot for one experiment directory.
 
-    print(f"🔖  Writing {env_path.name}")
-    _write_experiment_env(
-        env_path,
-        commit_hash=commit_hash,
-        lock_path=lock_path,
-        project_root=project_root,
+    :param project_root: Git-backed project root containing ``uv.lock``.
+    :param raw_experiment_dir: Experiment directory, relative to the root or absolute.
+    :param log: Receives progress lines; silent if None.
+    :param project_name: Name used for the snapshot tag; see ``_project_name``.
+    :param build_cache: Whether to reuse cached builds and lock exports.
+    :param with_wheelhouse: Whether to also capture an offline wheelhouse.
+    :return: The captured snapshot.
+    :raises utils.SnapshotError: If a snapshot step fails.
+    """
+    (snapshot,) = _snapshot_many(
+        project_root,
+        [raw_experiment_dir],
+        log=log,
+        project_name=project_name,
+        build_cache=build_cache,
+        with_wheelhouse=with_wheelhouse,
     )
+    return snapshot
+
+
+def install_hint(project_root: Path, env_path: Path) -> str:
+    """Return the command that installs a snapshot's requirements.
+
+    :param project_root: Project root.
+    :param env_path: The snapshot's ``experiment.env``.
+    :return: A ``uv pip install`` command line, offline if the snapshot has a
+        wheelhouse.
+    """
+    env = exp_index.read_env(env_path)
+    wheelhouse_dir = env.get("WHEELHOUSE")
+    if wheelhouse_dir:
+        requirements = f"{wheelhouse_dir}/{wheelhouse.REQUIREMENTS_NAME}"
+        return (
+            f"uv pip install --offline --find-links {wheelhouse_dir} -r {requirements}"
+        )
+    return f"uv pip install -r {env['LOCK_FILE']}"
+
+
+def next_steps(project_root: Path, env_paths: list[Path]) -> list[str]:
+    """Return the "Next steps" lines printed after snapshotting.
+
+    :param project_root: Project root.
+    :param env_paths: ``experiment.env`` of each snapshot.
+    :return: Lines without trailing newlines.
+    """
+    lines = ["Next steps:"]
+    for env_path in env_paths:
+        experiment_relative = env_path.parent.relative_to(project_root)
+        lines.append(f"  bube env-restore {experiment_relative}")
+        hint = install_hint(project_root, env_path)
+        lines.append(f"    (or in an active venv: {hint})")
+    return lines
+
+
+def _run(args: argparse.Namespace) -> None:
+    """Create reproducibility snapshots for the given experiment directories.
+
+    :param args: Parsed CLI arguments.
+    :return: None.
+    """
+    try:
+        project_root = utils.find_project_root()
+        snapshots = _snapshot_many(
+            project_root,
+            args.experiment_dir,
+            log=print,
+            build_cache=args.build_cache,
+            jobs=args.jobs,
+            with_wheelhouse=args.wheelhouse,
+        )
+    except utils.BuildbenError as exc:
+        raise SystemExit(str(exc)) from exc
 
-    print("Next steps:")
-    print(f"  uv pip install -r {lock_path.relative_to(project_root)}")
+    for line in next_steps(project_root, [snapshot.env_path for snapshot in snapshots]):
+        print(line)
 
 
 if __name__ == "__main__":
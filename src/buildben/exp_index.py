@@ -0,0 +1,297 @@
+"""Persistent SQLite index of a project's experiments.
+
+The index lives at ``<project_root>/.buildben/experiments.sqlite`` and holds
+one row per experiment directory: creation date, name, snapshot commit, lock
+file and artifact sizes. ``add-experim`` and ``env-snapshot`` update the rows
+they touch, so ``bube exp-list`` / ``bube exp-show`` answer without walking
+``experiments/``. ``rebuild`` re-scans all experiments in parallel.
+
+Every update also rewrites ``.buildben/experiments.idx``, the plain list of
+experiment paths that the static completion scripts read (shells cannot
+query SQLite).
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import functools
+import json
+import os
+import re
+import sqlite3
+from collections.abc import Iterable
+from pathlib import Path
+
+from . import utils
+
+INDEX_RELPATH = Path(".buildben") / "experiments.sqlite"
+COMPLETION_RELPATH = Path(".buildben") / "experiments.idx"  # < One path per line
+SCHEMA_VERSION = 1
+_DATED_RE = re.compile(r"^(\d{4}-\d{2}-\d{2})_(.+)$")
+_COLUMNS = (
+    "path",  # < Relative to the project root, primary key
+    "name_full",
+    "name",
+    "created",
+    "snapshot_commit",
+    "snapshot_at",
+    "lock_file",
+    "lock_size",
+    "artifacts",  # < JSON ``{<filename>: <size>}``
+    "artifacts_size",
+)
+
+
+def index_path(project_root: Path) -> Path:
+    """Return the index location for a project.
+
+    :param project_root: Project root directory.
+    :return: Path of ``.buildben/experiments.sqlite``.
+    """
+    return project_root / INDEX_RELPATH
+
+
+def _connect(project_root: Path) -> sqlite3.Connection:
+    """Open the index, creating or migrating its schema.
+
+    :param project_root: Project root directory.
+    :return: Open connection with ``sqlite3.Row`` rows.
+    """
+    path = index_path(project_root)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path, timeout=10)
+    conn.row_factory = sqlite3.Row
+    (version,) = conn.execute("PRAGMA user_version").fetchone()
+    if version != SCHEMA_VERSION:
+        with conn:
+            conn.execute("DROP TABLE IF EXISTS experiments")
+            conn.execute(
+                "CREATE TABLE experiments ("
+                "path TEXT PRIMARY KEY, name_full TEXT NOT NULL, name TEXT NOT NULL,"
+                " created TEXT NOT NULL, snapshot_commit TEXT, snapshot_at TEXT,"
+                " lock_file TEXT, lock_size INTEGER, artifacts TEXT NOT NULL,"
+                " artifacts_size INTEGER NOT NULL)"
+            )
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    return conn
+
+
+def read_env(env_path: Path) -> dict[str, str]:
+    """Parse the ``KEY=value`` lines of an ``experiment.env``.
+
+    :param env_path: Path of the ``experiment.env``.
+    :return: Values by key, e.g. ``COMMIT_HASH`` and ``LOCK_FILE``.
+    """
+    values = {}
+    for line in env_path.read_text(encoding="utf-8").splitlines():
+        key, sep, value = line.partition("=")
+        if sep:
+            values[key.strip()] = value.strip()
+    return values
+
+
+def inspect_experiment(project_root: Path, exp_root: Path) -> dict:
+    """Collect the index row of one experiment directory from disk.
+
+    :param project_root: Project root directory.
+    :param exp_root: Experiment directory.
+    :return: Row values keyed by column name.
+    """
+    match = _DATED_RE.match(exp_root.name)
+    if match:
+        created, name = match.groups()
+    else:
+        mtime = exp_root.stat().st_mtime
+        created, name = dt.date.fromtimestamp(mtime).isoformat(), exp_root.name
+    row: dict = {
+        "path": exp_root.relative_to(project_root).as_posix(),
+        "name_full": exp_root.name,
+        "name": name,
+        "created": created,
+        "snapshot_commit": None,
+        "snapshot_at": None,
+        "lock_file": None,
+        "lock_size": None,
+    }
+
+    env_path = exp_root / "experiment.env"
+    if env_path.is_file():
+        env = read_env(env_path)
+        snapshot_at = dt.datetime.fromtimestamp(env_path.stat().st_mtime)
+        row["snapshot_commit"] = env.get("COMMIT_HASH")
+        row["snapshot_at"] = snapshot_at.isoformat(timespec="seconds")
+        row["lock_file"] = env.get("LOCK_FILE")
+        if row["lock_file"] and (project_root / row["lock_file"]).is_file():
+            row["lock_size"] = (project_root / row["lock_file"]).stat().st_size
+
+    artifacts: dict[str, int] = {}
+    setup_dir = exp_root / "_setup"
+    if setup_dir.is_dir():
+        with os.scandir(setup_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith((".whl", ".tar.gz")) and entry.is_file():
+                    artifacts[entry.name] = entry.stat().st_size
+    row["artifacts"] = json.dumps(dict(sorted(artifacts.items())))
+    row["artifacts_size"] = sum(artifacts.values())
+    return row
+
+
+def _upsert(conn: sqlite3.Connection, rows: Iterable[dict]) -> None:
+    placeholders = ", ".join(f":{column}" for column in _COLUMNS)
+    conn.executemany(
+        f"INSERT OR REPLACE INTO experiments ({', '.join(_COLUMNS)}) "
+        f"VALUES ({placeholders})",
+        rows,
+    )
+
+
+def _write_completion_list(project_root: Path, conn: sqlite3.Connection) -> None:
+    """Rewrite ``experiments.idx`` from the index rows."""
+    paths = [row["path"] for row in conn.execute("SELECT path FROM experiments")]
+    path = project_root / COMPLETION_RELPATH
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp_path.write_text("".join(f"{p}\n" for p in sorted(paths)), "utf-8")
+    os.replace(tmp_path, path)
+
+
+def index_experiments(project_root: Path, exp_roots: Iterable[Path]) -> None:
+    """Add or refresh the index rows of some experiments.
+
+    Without an index yet, all of ``experiments/`` is scanned instead, so
+    experiments created before the index existed are not left out.
+
+    :param project_root: Project root directory.
+    :param exp_roots: Experiment directories that were created or changed.
+    :return: None.
+    :raises utils.ScaffoldError: If a full scan could not inspect an experiment.
+    """
+    if not index_path(project_root).is_file():
+        rebuild(project_root)
+        return
+    rows = [inspect_experiment(project_root, exp_root) for exp_root in exp_roots]
+    conn = _connect(project_root)
+    try:
+        with conn:
+            _upsert(conn, rows)
+        _write_completion_list(project_root, conn)
+    finally:
+        conn.close()
+
+
+def _experiment_dirs(project_root: Path) -> list[Path]:
+    """Return all experiment directories below ``experiments/``."""
+    exp_dir = project_root / "experiments"
+    if not exp_dir.is_dir():
+        return []
+    with os.scandir(exp_dir) as entries:
+        return sorted(
+            Path(entry.path)
+            for entry in entries
+            if entry.is_dir()
+            and entry.name != "resources"
+            and not entry.name.startswith(".")  # < e.g. staging dirs
+        )
+
+
+def rebuild(project_root: Path, jobs: int = 1) -> int:
+    """Rebuild the index by scanning ``experiments/`` in parallel.
+
+    :param project_root: Project root directory.
+    :param jobs: Maximum number of scanning threads.
+    :return: Number of indexed experiments.
+    :raises utils.ScaffoldError: If any experiment could not be inspected.
+    """
+    rows = utils.run_parallel(
+        {
+            exp_root: functools.partial(inspect_experiment, project_root, exp_root)
+            for exp_root in _experiment_dirs(project_root)
+        },
+        jobs=jobs,
+    )
+    conn = _connect(project_root)
+    try:
+        with conn:
+            conn.execute("DELETE FROM experiments")
+            _upsert(conn, rows.values())
+        _write_completion_list(project_root, conn)
+    finally:
+        conn.close()
+    return len(rows)
+
+
+def list_experiments(project_root: Path) -> list[sqlite3.Row]:
+    """Return all indexed experiments, oldest first.
+
+    :param project_root: Project root directory.
+    :return: Index rows.
+    """
+    conn = _connect(project_root)
+    try:
+        return conn.execute(
+            "SELECT * FROM experiments ORDER BY created, name_full"
+        ).fetchall()
+    finally:
+        conn.close()
+
+
+def find_experiment(project_root: Path, key: str) -> sqlite3.Row | None:
+    """Look up one experiment by path, directory name or short name.
+
+    A short name matches the most recently created experiment with that name.
+
+    :param project_root: Project root directory.
+    :param key: e.g. ``experiments/2026-01-01_smoke``, ``2026-01-01_smoke``
+        or ``smoke``.
+    :return: Matching row, or None.
+    """
+    conn = _connect(project_root)
+    try:
+        return conn.execute(
+            "SELECT * FROM experiments WHERE path = :key OR name_full = :key "
+            "OR name = :key ORDER BY path = :key DESC, name_full = :key DESC, "
+            "created DESC, name_full DESC LIMIT 1",
+            {"key": key.rstrip("/")},
+        ).fetchone()
+    finally:
+        conn.close()
+
+
+def latest_snapshot(project_root: Path) -> sqlite3.Row | None:
+    """Return the most recently snapshotted experiment that has a lock file.
+
+    :param project_root: Project root directory.
+    :return: Matching row, or None.
+    """
+    conn = _connect(project_root)
+    try:
+        return conn.execute(
+            "SELECT * FROM experiments WHERE lock_file IS NOT NULL "
+            "AND lock_size IS NOT NULL ORDER BY snapshot_at DESC, path DESC LIMIT 1"
+        ).fetchone()
+    finally:
+        conn.close()
+
+
+def format_size(size: int | None) -> str:
+    """Render a byte count for humans, e.g. ``12.3 KiB``; ``-`` for None."""
+    if size is None:
+        return "-"
+    value = float(size)
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if value < 1024 or unit == "GiB":
+            break
+        value /= 1024
+    return f"{size} B" if unit == "B" else f"{value:.1f} {unit}"
+
+
+def ensure_index(project_root: Path, reindex: bool = False, jobs: int = 1) -> None:
+    """Make sure the index exists, rebuilding it if asked or missing.
+
+    :param project_root: Project root directory.
+    :param reindex: Whether to rescan ``experiments/`` even if indexed.
+    :param jobs: Maximum number of scanning threads.
+    :return: None.
+    :raises utils.ScaffoldError: If any experiment could not be inspected.
+    """
+    if reindex or not index_path(project_root).is_file():
+        rebuild(project_root, jobs=jobs)
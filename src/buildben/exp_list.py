@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+
+from . import commands, exp_index, utils
+
+_COMMAND = commands.COMMANDS["exp-list"]  # < Arguments are declared statically
+CMD_NAME = _COMMAND.name  # < Name of the CLI-command
+CMD_ALIASES = list(_COMMAND.aliases)  # < Alias shortcut of the CLI-command
+DOC = _COMMAND.doc
+
+
+def _add_my_parser(subparsers: argparse._SubParsersAction) -> None:
+    """Attach the exp-list sub-parser to a parser (e.g. when run as a script).
+
+    :param subparsers: Parent argparse subparser registry.
+    :return: None.
+    """
+    p = commands.add_parser(subparsers, _COMMAND)
+    p.set_defaults(func=_run)
+
+
+def _run(args: argparse.Namespace) -> None:
+    """Print one line per indexed experiment.
+
+    :param args: Parsed CLI arguments.
+    :return: None.
+    """
+    project_root = utils.find_project_root()
+    try:
+        exp_index.ensure_index(project_root, reindex=args.reindex, jobs=args.jobs)
+    except utils.ScaffoldError as exc:
+        sys.exit(f"💥  {exc}")
+
+    rows = exp_index.list_experiments(project_root)
+    if args.snapshotted:
+        rows = [row for row in rows if row["snapshot_commit"]]
+    if not rows:
+        print("No experiments yet (create one with `bube exp NAME`)")
+        return
+
+    table = [("EXPERIMENT", "CREATED", "SNAPSHOT", "LOCK", "ARTIFACTS")]
+    for row in rows:
+        n_artifacts = len(json.loads(row["artifacts"]))
+        artifacts = exp_index.format_size(row["artifacts_size"])
+        table.append(
+            (
+                row["path"],
+                row["created"],
+                row["snapshot_commit"] or "-",
+                exp_index.format_size(row["lock_size"]),
+                f"{n_artifacts} ({artifacts})" if n_artifacts else "-",
+            )
+        )
+    widths = [max(len(line[i]) for line in table) for i in range(len(table[0]))]
+    for line in table:
+        cells = (cell.ljust(width) for cell, width in zip(line, widths))
+        print("  ".join(cells).rstrip())
+
+
+if __name__ == "__main__":
+    _parser = argparse.ArgumentParser()
+    _add_my_parser(_parser.add_subparsers(dest="cmd", required=True))
+    parsed_args = _parser.parse_args()
+    parsed_args.func(parsed_args)
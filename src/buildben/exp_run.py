@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+buildben.exp_run – run a command in an experiment's snapshot venv.
+
+The venv comes from the venv pool (see ``venv_pool``): experiments whose
+snapshots share ``requirements.lock`` and project wheel share one venv, so
+only the first run installs anything.
+
+Usage from CLI aggregator:
+    bube exp-run [--python VERSION] EXPERIMENT [COMMAND ...]
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import os
+import subprocess
+import sys
+import time
+
+from . import commands, env_restore, utils
+
+_COMMAND = commands.COMMANDS["exp-run"]  # < Arguments are declared statically
+CMD_NAME = _COMMAND.name  # < Name of the CLI-command
+CMD_ALIASES = list(_COMMAND.aliases)  # < Alias shortcut of the CLI-command
+DOC = _COMMAND.doc
+
+DEFAULT_COMMAND = ("python", "run.py")
+
+
+def _add_my_parser(subparsers: argparse._SubParsersAction) -> None:
+    """Attach the exp-run sub-parser to a parser (e.g. when run as a script).
+
+    :param subparsers: Parent argparse subparser registry.
+    :return: None.
+    """
+    p = commands.add_parser(subparsers, _COMMAND)
+    p.set_defaults(func=_run)
+
+
+def venv_environ(venv: os.PathLike | str) -> dict[str, str]:
+    """Return the process environment with a venv activated.
+
+    :param venv: Virtual environment directory.
+    :return: Copy of ``os.environ`` with ``VIRTUAL_ENV`` set and the venv's
+        scripts first on ``PATH``.
+    """
+    scripts = env_restore.venv_python(venv).parent
+    environ = dict(os.environ)
+    environ.pop("PYTHONHOME", None)
+    environ["VIRTUAL_ENV"] = os.fspath(venv)
+    path = environ.get("PATH")
+    environ["PATH"] = os.fspath(scripts) + (os.pathsep + path if path else "")
+    return environ
+
+
+# ================================================================== #
+# === implementation                                                 #
+# ================================================================== #
+def _run(args: argparse.Namespace) -> None:
+    """Run a command in the pooled snapshot venv of an experiment.
+
+    :param args: Parsed CLI arguments.
+    :return: None.
+    :raises SystemExit: With the command's exit status.
+    """
+    started = time.perf_counter()
+    with contextlib.ExitStack() as held:
+        try:
+            project_root = utils.find_project_root()
+            snapshot = env_restore.read_snapshot(project_root, args.experiment_dir)
+            venv, _reused = held.enter_context(
+                env_restore.pooled_venv(
+                    project_root,
+                    snapshot,
+                    python=args.python,
+                    quota=args.pool_quota,
+                    log=print,
+                )
+            )
+        except utils.BuildbenError as exc:
+            raise SystemExit(str(exc)) from exc
+
+        command = list(args.command)
+        if command[:1] == ["--"]:
+            command = command[1:]
+        command = command or list(DEFAULT_COMMAND)
+        print(f"🚀  Venv ready after {time.perf_counter() - started:.2f} s, running:")
+        print(f"    {subprocess.list2cmdline(command)}")
+        sys.stdout.flush()
+        try:  # < Still holding the venv, so no eviction removes it meanwhile
+            completed = subprocess.run(
+                command,
+                cwd=snapshot.experiment_dir,
+                env=venv_environ(venv),
+                check=False,
+            )
+        except FileNotFoundError:
+            sys.exit(f"💥  {command[0]}: not found in {venv}")
+        except OSError as exc:  # < e.g. PermissionError for a non-executable file
+            sys.exit(f"💥  {command[0]}: {exc.strerror or exc}")
+    sys.exit(completed.returncode)
+
+
+if __name__ == "__main__":
+    _parser = argparse.ArgumentParser()
+    _add_my_parser(_parser.add_subparsers(dest="cmd", required=True))
+    parsed_args = _parser.parse_args()
+    parsed_args.func(parsed_args)
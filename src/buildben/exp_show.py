@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+
+from . import commands, exp_index, utils
+
+_COMMAND = commands.COMMANDS["exp-show"]  # < Arguments are declared statically
+CMD_NAME = _COMMAND.name  # < Name of the CLI-command
+CMD_ALIASES = list(_COMMAND.aliases)  # < Alias shortcut of the CLI-command
+DOC = _COMMAND.doc
+
+
+def _add_my_parser(subparsers: argparse._SubParsersAction) -> None:
+    """Attach the exp-show sub-parser to a parser (e.g. when run as a script).
+
+    :param subparsers: Parent argparse subparser registry.
+    :return: None.
+    """
+    p = commands.add_parser(subparsers, _COMMAND)
+    p.set_defaults(func=_run)
+
+
+def _run(args: argparse.Namespace) -> None:
+    """Print the index entry of one experiment.
+
+    :param args: Parsed CLI arguments.
+    :return: None.
+    :raises SystemExit: If the experiment is not indexed.
+    """
+    project_root = utils.find_project_root()
+    try:
+        exp_index.ensure_index(project_root, reindex=args.reindex)
+    except utils.ScaffoldError as exc:
+        sys.exit(f"💥  {exc}")
+
+    row = exp_index.find_experiment(project_root, args.experiment_dir)
+    if row is None:
+        sys.exit(
+            f"💥  No indexed experiment '{args.experiment_dir}' "
+            "(run with --reindex if it was created by hand)"
+        )
+
+    print(f"📂  {row['path']}")
+    print(f"    name:      {row['name']}")
+    print(f"    created:   {row['created']}")
+    if row["snapshot_commit"]:
+        print(f"    snapshot:  {row['snapshot_commit']} (taken {row['snapshot_at']})")
+        lock_size = exp_index.format_size(row["lock_size"])
+        print(f"    lock file: {row['lock_file']} ({lock_size})")
+    else:
+        print("    snapshot:  - (run `bube snp` to capture one)")
+    artifacts = json.loads(row["artifacts"])
+    for i, (filename, size) in enumerate(artifacts.items()):
+        label = "artifacts:" if i == 0 else ""
+        print(f"    {label:<10} {filename} ({exp_index.format_size(size)})")
+
+
+if __name__ == "__main__":
+    _parser = argparse.ArgumentParser()
+    _add_my_parser(_parser.add_subparsers(dest="cmd", required=True))
+    parsed_args = _parser.parse_args()
+    parsed_args.func(parsed_args)
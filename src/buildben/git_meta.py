@@ -0,0 +1,340 @@
+"""Read git metadata straight from ``.git`` without starting ``git``.
+
+Covers what snapshots need on their hot path: the HEAD commit (hash, short
+hash, committer date, tree) from ``HEAD``, loose or packed refs and loose
+zlib-compressed commit objects; whether a tag exists; and a cheap
+dirty-state hint from the stat data in ``.git/index``.
+
+Every reader returns None when the answer needs more than this module
+understands (commits only stored in packfiles, reftable refs, index v4,
+``$GIT_DIR`` overrides, ...). Callers then fall back to the git CLI.
+"""
+
+from __future__ import annotations
+
+import bisect
+import datetime as dt
+import os
+import struct
+import zlib
+from pathlib import Path
+from typing import NamedTuple
+
+_DEFAULT_ABBREV = 7
+_GIT_ENV_OVERRIDES = ("GIT_DIR", "GIT_COMMON_DIR", "GIT_OBJECT_DIRECTORY")
+_INDEX_ENTRY = struct.Struct(">10I20sH")  # < Stat data, object id and flags
+_INDEX_ASSUME_VALID = 0x8000
+_INDEX_EXTENDED = 0x4000
+_INDEX_SKIP_WORKTREE = 0x4000  # < In the extended flags
+_GITLINK_MODE = 0o160000
+
+
+class GitDirs(NamedTuple):
+    """Locations of one work tree's repository."""
+
+    worktree: Path
+    git_dir: Path  # < Holds ``HEAD`` and ``index``
+    common_dir: Path  # < Holds refs, objects and config (differs for worktrees)
+
+
+class HeadCommit(NamedTuple):
+    """Metadata of the commit HEAD points to."""
+
+    hash: str
+    short_hash: str  # < Abbreviated like ``git log --format=%h``
+    date: str  # < Committer date like ``git log --date=iso``
+    tree_hash: str
+
+
+def find_git_dirs(start: Path) -> GitDirs | None:
+    """Locate the repository of the work tree containing *start*.
+
+    :param start: Directory inside the work tree.
+    :return: Repository locations, or None if there is none or git is
+        redirected through environment variables.
+    """
+    if any(os.environ.get(name) for name in _GIT_ENV_OVERRIDES):
+        return None
+    start = Path(os.path.abspath(start))
+    for directory in (start, *start.parents):
+        dot_git = directory / ".git"
+        if dot_git.is_dir():
+            return GitDirs(directory, dot_git, _common_dir(dot_git))
+        if dot_git.is_file():  # < Linked worktree or submodule
+            content = dot_git.read_text(encoding="utf-8").strip()
+            if not content.startswith("gitdir:"):
+                return None
+            git_dir = directory / content.partition(":")[2].strip()
+            return GitDirs(directory, git_dir, _common_dir(git_dir))
+    return None
+
+
+def _common_dir(git_dir: Path) -> Path:
+    commondir = git_dir / "commondir"
+    if commondir.is_file():
+        return (git_dir / commondir.read_text(encoding="utf-8").strip()).resolve()
+    return git_dir
+
+
+def _packed_refs(common_dir: Path) -> dict[str, str]:
+    """Return the ``packed-refs`` entries by ref name."""
+    refs = {}
+    try:
+        lines = (common_dir / "packed-refs").read_text(encoding="utf-8").splitlines()
+    except FileNotFoundError:
+        return refs
+    for line in lines:
+        if line and line[0] not in "#^":  # < Skip header and peeled tags
+            object_id, _, name = line.partition(" ")
+            refs[name] = object_id
+    return refs
+
+
+def resolve_ref(dirs: GitDirs, name: str) -> str | None:
+    """Resolve a ref name (or ``HEAD``) to an object id.
+
+    :param dirs: Repository locations.
+    :param name: e.g. ``HEAD`` or ``refs/tags/v1``.
+    :return: Object id, or None if the ref does not exist as a file or
+        packed ref.
+    """
+    for _ in range(5):  # < Follow a short chain of symbolic refs
+        base = dirs.git_dir if name == "HEAD" else dirs.common_dir
+        try:
+            content = (base / name).read_text(encoding="utf-8").strip()
+        except (FileNotFoundError, NotADirectoryError, IsADirectoryError):
+            return _packed_refs(dirs.common_dir).get(name)
+        if not content.startswith("ref:"):
+            return content or None
+        name = content[4:].strip()
+    return None
+
+
+def _read_object(dirs: GitDirs, object_id: str) -> tuple[str, bytes] | None:
+    """Read a loose object.
+
+    :param dirs: Repository locations.
+    :param object_id: Full object id.
+    :return: Object type and body, or None if the object is not loose.
+    """
+    path = dirs.common_dir / "objects" / object_id[:2] / object_id[2:]
+    try:
+        raw = zlib.decompress(path.read_bytes())
+    except (FileNotFoundError, zlib.error):
+        return None
+    header, _, body = raw.partition(b"\0")
+    object_type, _, _size = header.decode("ascii").partition(" ")
+    return object_type, body
+
+
+def _format_date(timestamp: str, offset: str) -> str:
+    """Format a committer timestamp like ``git log --date=iso``."""
+    sign = -1 if offset.startswith("-") else 1
+    delta = dt.timedelta(hours=int(offset[1:3]), minutes=int(offset[3:5]))
+    moment = dt.datetime.fromtimestamp(int(timestamp), dt.timezone(sign * delta))
+    return f"{moment:%Y-%m-%d %H:%M:%S} {offset}"
+
+
+def _config_abbrev(dirs: GitDirs) -> int | None:
+    """Return ``core.abbrev`` from the repository, user or XDG git config."""
+    xdg = Path(os.environ.get("XDG_CONFIG_HOME") or Path.home() / ".config")
+    abbrev = None
+    for path in (xdg / "git" / "config", Path.home() / ".gitconfig"):
+        abbrev = _read_abbrev(path) or abbrev
+    return _read_abbrev(dirs.common_dir / "config") or abbrev
+
+
+def _read_abbrev(path: Path) -> int | None:
+    try:
+        lines = path.read_text(encoding="utf-8").splitlines()
+    except (FileNotFoundError, UnicodeDecodeError):
+        return None
+    section, abbrev = "", None
+    for raw_line in lines:
+        line = raw_line.split("#")[0].split(";")[0].strip()
+        if line.startswith("["):
+            section = line.strip("[]").strip().lower()
+        elif section == "core" and line.partition("=")[0].strip().lower() == "abbrev":
+            value = line.partition("=")[2].strip()
+            abbrev = int(value) if value.isdigit() else abbrev
+    return abbrev
+
+
+def _abbrev_length(dirs: GitDirs) -> int:
+    """Return the abbreviation length ``git`` uses by default.
+
+    Like ``core.abbrev=auto``: about half the bits needed to count the packed
+    objects, in hex digits, but at least 7.
+    """
+    configured = _config_abbrev(dirs)
+    if configured:
+        return configured
+    count = 0
+    for idx_path in (dirs.common_dir / "objects" / "pack").glob("*.idx"):
+        with idx_path.open("rb") as idx:
+            header = idx.read(8)
+            offset = 8 + 255 * 4 if header[:4] == b"\377tOc" else 255 * 4
+            idx.seek(offset)
+            count += struct.unpack(">I", idx.read(4))[0]  # < Last fanout entry
+    if count == 0:
+        return _DEFAULT_ABBREV
+    return max(_DEFAULT_ABBREV, (count.bit_length() + 1) // 2)
+
+
+def _packed_neighbours(dirs: GitDirs, object_id: str) -> list[str]:
+    """Return the packed object ids sorting right next to *object_id*.
+
+    Pack indexes list their object ids sorted, with a fanout table by first
+    byte, so only that byte's slice of each index is read. The closest
+    neighbours share the longest prefix with *object_id*.
+    """
+    raw = bytes.fromhex(object_id)
+    neighbours = []
+    for idx_path in (dirs.common_dir / "objects" / "pack").glob("*.idx"):
+        with idx_path.open("rb") as idx:
+            if idx.read(4) == b"\377tOc":  # < Version 2: fanout, then ids
+                fanout_at, width, id_at = 8, len(raw), 0
+            else:  # < Version 1: fanout, then (offset, id) entries
+                fanout_at, width, id_at = 0, 24, 4
+            idx.seek(fanout_at + max(raw[0] - 1, 0) * 4)
+            bounds = struct.unpack(">II", idx.read(8))
+            start, end = (0, bounds[0]) if raw[0] == 0 else bounds
+            idx.seek(fanout_at + 256 * 4 + start * width)
+            chunk = idx.read((end - start) * width)
+        ids = [
+            chunk[pos + id_at : pos + id_at + len(raw)]
+            for pos in range(0, len(chunk), width)
+        ]
+        index = bisect.bisect_left(ids, raw)
+        for near in ids[max(index - 1, 0) : index + 2]:
+            if near != raw:
+                neighbours.append(near.hex())
+    return neighbours
+
+
+def _abbreviate(dirs: GitDirs, object_id: str) -> str:
+    """Shorten an object id, keeping it unique among loose and packed objects."""
+    try:
+        others = [
+            object_id[:2] + name
+            for name in os.listdir(dirs.common_dir / "objects" / object_id[:2])
+            if object_id[:2] + name != object_id
+        ]
+    except FileNotFoundError:
+        others = []
+    others += _packed_neighbours(dirs, object_id)
+    length = _abbrev_length(dirs)
+    for other in others:
+        shared = len(os.path.commonprefix([object_id, other]))
+        length = max(length, shared + 1)
+    return object_id[:length]
+
+
+def read_head(start: Path) -> HeadCommit | None:
+    """Read the HEAD commit of the repository containing *start*.
+
+    :param start: Directory inside the work tree.
+    :return: HEAD commit metadata, or None if the git CLI must answer (no
+        repository, unborn branch, packed commit object, ...).
+    """
+    dirs = find_git_dirs(start)
+    if dirs is None:
+        return None
+    object_id = resolve_ref(dirs, "HEAD")
+    if object_id is None:
+        return None
+    obj = _read_object(dirs, object_id)
+    if obj is None or obj[0] != "commit":
+        return None
+
+    tree_hash = committer = None
+    for line in obj[1].split(b"\n"):
+        if not line:
+            break  # < End of the header, the message follows
+        key, _, value = line.decode("utf-8", errors="replace").partition(" ")
+        if key == "tree":
+            tree_hash = value
+        elif key == "committer":
+            committer = value
+    if tree_hash is None or committer is None:
+        return None
+    _ident, timestamp, offset = committer.rsplit(" ", 2)
+    return HeadCommit(
+        object_id,
+        _abbreviate(dirs, object_id),
+        _format_date(timestamp, offset),
+        tree_hash,
+    )
+
+
+def tag_exists(start: Path, tag: str) -> bool | None:
+    """Tell whether a tag exists, as a loose or packed ref.
+
+    :param start: Directory inside the work tree.
+    :param tag: Tag name without ``refs/tags/``.
+    :return: Whether it exists, or None without a readable repository.
+    """
+    dirs = find_git_dirs(start)
+    if dirs is None:
+        return None
+    return resolve_ref(dirs, f"refs/tags/{tag}") is not None
+
+
+def index_changes(start: Path, exclude: tuple[str, ...] = ()) -> bool | None:
+    """Hint whether tracked files changed, from the stat data in the index.
+
+    Only definite changes are reported: a tracked file is missing or its size
+    differs from the index. Matching stat data proves nothing (untracked
+    files, same-size edits), so the answer is then None. Like
+    ``git status -- .``, only files below *start* are considered.
+
+    :param start: Directory inside the work tree.
+    :param exclude: Path prefixes relative to *start* to ignore, e.g.
+        ``("experiments/",)``.
+    :return: True if a tracked file definitely changed, None otherwise.
+    """
+    dirs = find_git_dirs(start)
+    if dirs is None:
+        return None
+    try:
+        data = (dirs.git_dir / "index").read_bytes()
+    except FileNotFoundError:
+        return None
+    if data[:4] != b"DIRC":
+        return None
+    version, n_entries = struct.unpack(">II", data[4:12])
+    if version not in (2, 3):
+        return None  # < Version 4 compresses paths; leave it to git
+    prefix = Path(os.path.abspath(start)).relative_to(dirs.worktree).as_posix()
+    prefix = "" if prefix == "." else prefix + "/"
+
+    offset = 12
+    for _ in range(n_entries):
+        fields = _INDEX_ENTRY.unpack_from(data, offset)
+        mode, size, flags = fields[6], fields[9], fields[11]
+        start_path = offset + _INDEX_ENTRY.size
+        extended_flags = 0
+        if flags & _INDEX_EXTENDED:
+            (extended_flags,) = struct.unpack_from(">H", data, start_path)
+            start_path += 2
+        end_path = data.index(b"\0", start_path)
+        entry_length = end_path - offset
+        offset += entry_length + 8 - entry_length % 8  # < NUL padded to 8 bytes
+
+        relative = data[start_path:end_path].decode("utf-8", errors="replace")
+        if (
+            mode == _GITLINK_MODE
+            or flags & _INDEX_ASSUME_VALID
+            or extended_flags & _INDEX_SKIP_WORKTREE
+            or (flags >> 12) & 3  # < Merge stage: git status will explain
+            or not relative.startswith(prefix)
+            or relative[len(prefix) :].startswith(exclude)
+        ):
+            continue
+        try:
+            stat = os.lstat(dirs.worktree / relative)
+        except (FileNotFoundError, NotADirectoryError):
+            return True
+        if stat.st_size & 0xFFFFFFFF != size:
+            return True
+    return None
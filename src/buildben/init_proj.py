@@ -4,45 +4,37 @@ from __future__ import annotations
 
 import argparse
 import datetime as dt
+import functools
+import json
 import re
 
 # import shutil
 import sys
+import tomllib
 from pathlib import Path
 from textwrap import dedent
 
-from . import utils
+from . import commands, manifest, template_bundle, utils
 
 # ================================================================== #
 # === CLI wiring                                                     #
 # ================================================================== #
 
-CMD_NAME = "init-proj"  # < Name of the CLI-command
-CMD_ALIASES = ["proj"]  # < Alias shortcut of the CLI-command
-DOC = f"Scaffolds a new src-layout Python project. Aliases: {CMD_ALIASES}"
+_COMMAND = commands.COMMANDS["init-proj"]  # < Arguments are declared statically
+CMD_NAME = _COMMAND.name  # < Name of the CLI-command
+CMD_ALIASES = list(_COMMAND.aliases)  # < Alias shortcut of the CLI-command
+DOC = _COMMAND.doc
 IDENT_RE = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
 
 
 def _add_my_parser(subparsers: argparse._SubParsersAction) -> None:
-    """Attach the init-proj sub-parser to the CLI aggregator."""
+    """Attach the init-proj sub-parser to a parser (e.g. when run as a script).
 
-    p: argparse.ArgumentParser = subparsers.add_parser(
-        name=CMD_NAME,
-        aliases=CMD_ALIASES,
-        help=DOC,
-        description=DOC,
-    )
-    p.add_argument("name", help="Project name")
-    p.add_argument(
-        "-t",
-        "--target-dir",
-        default=".",
-        help="(Parent-)Directory in which to create a project-directory",
-    )
-    p.add_argument("-g", "--git-init", action="store_true", help="Initialise git repo")
-    p.add_argument("-u", "--github-user", default="github-user", help="Github Username")
-    # > Entrypoint, retrieved as args.func in cli.py
-    p.set_defaults(func=_run)  # !! call _run(args) when chosen
+    :param subparsers: Parent argparse subparser registry.
+    :return: None.
+    """
+    p = commands.add_parser(subparsers, _COMMAND)
+    p.set_defaults(func=_run)
 
 
 def _validate_project_name(name: str) -> None:
@@ -50,9 +42,12 @@ def _validate_project_name(name: str) -> None:
 
     :param name: Requested project/package name.
     :return: None.
+    :raises utils.InvalidNameError: If *name* is not a Python identifier.
     """
     if not IDENT_RE.match(name):
-        sys.exit("💥  Project name must be a valid Python identifier")
+        raise utils.InvalidNameError(
+            f"Project name must be a valid Python identifier: {name!r}"
+        )
 
 
 def _project_root(target_dir: str, name: str) -> Path:
@@ -95,7 +90,7 @@ def _project_template_transfers(project_root: Path, name: str) -> dict[str, Path
 
     :param project_root: Root directory of the generated project.
     :param name: Import package name.
-    :return: Template transfer mapping consumed by ``utils.copy_templates``.
+    :return: Template transfer mapping consumed by ``template_bundle.render_templates``.
     """
     return {
         "_gitignore": project_root / ".gitignore",
@@ -186,23 +181,23 @@ def _project_placeholders(name: str, github_user: str) -> dict[str, str]:
     }
 
 
-def _create_project_directories(project_root: Path, name: str) -> None:
+def _create_project_directories(project_root: Path, name: str, jobs: int = 1) -> None:
     """Create the directory tree for a generated project.
 
     :param project_root: Root directory of the generated project.
     :param name: Import package name.
+    :param jobs: Maximum number of worker threads.
     :return: None.
     """
-    for directory in _project_directories(project_root, name):
-        directory.mkdir(parents=True, exist_ok=True)
+    utils.create_directories(_project_directories(project_root, name), jobs=jobs)
 
 
-def _create_init_files(project_root: Path, name: str) -> None:
+def _create_init_files(project_root: Path, name: str) -> list[Path]:
     """Create generated package ``__init__.py`` files.
 
     :param project_root: Root directory of the generated project.
     :param name: Import package name.
-    :return: None.
+    :return: Created ``__init__.py`` paths.
     """
     package_root = project_root / "src" / name
     utils.create_init_dot_py(package_root)
@@ -212,28 +207,320 @@ def _create_init_files(project_root: Path, name: str) -> None:
         imports=["stdlib"],
         flatten_functions=True,
     )
+    return [
+        package_root / "__init__.py",
+        package_root / "cli" / "__init__.py",
+        package_root / "utils" / "__init__.py",
+    ]
+
+
+def _stale_templates(
+    project_root: Path,
+    transfers: dict[str, Path],
+    scaffold_manifest: dict,
+    source_hashes: dict[str, str],
+    force: bool,
+) -> tuple[dict[str, Path], list[str]]:
+    """Select templates whose source changed since the project was scaffolded.
 
+    Files with an unchanged template are skipped without reading them. Files
+    edited or removed by the user are kept unless *force* is set.
 
-def _print_success(project_root: Path, name: str) -> None:
-    """Print the final scaffold success message.
+    :param project_root: Root directory of the generated project.
+    :param transfers: Current template transfer mapping.
+    :param scaffold_manifest: Manifest written by the previous scaffold.
+    :param source_hashes: ``{<template_filename>: <sha256>}`` of current templates.
+    :param force: Whether to overwrite files edited by the user.
+    :return: Transfers to re-render and relative paths kept as user-edited.
+    """
+    stale: dict[str, Path] = {}
+    kept: list[str] = []
+    for tmpl_fn, dst_fp in transfers.items():
+        relative = dst_fp.relative_to(project_root).as_posix()
+        entry = scaffold_manifest["files"].get(relative)
+        if entry is not None and entry["source_sha256"] == source_hashes[tmpl_fn]:
+            continue  # < Template unchanged
+        if not force:
+            if entry is None:
+                user_owned = dst_fp.exists()  # < New template, path already taken
+            else:
+                user_owned = (
+                    not dst_fp.is_file() or utils.sha256_file(dst_fp) != entry["sha256"]
+                )
+            if user_owned:
+                kept.append(relative)
+                continue
+        stale[tmpl_fn] = dst_fp
+    return stale, kept
+
+
+def _update(
+    project_root: Path,
+    name: str,
+    github_user: str,
+    *,
+    force: bool = False,
+    durable: bool = False,
+    jobs: int = 1,
+) -> tuple[list[Path], list[str]]:
+    """Re-render changed templates into an existing scaffold.
+
+    :param project_root: Root directory of the scaffolded project.
+    :param name: Import package name.
+    :param github_user: GitHub username shown in generated metadata.
+    :param force: Whether to overwrite files edited since scaffolding.
+    :param durable: Whether to fsync the updated files before publishing them.
+    :param jobs: Maximum number of worker threads.
+    :return: Updated files, and the files kept because they were edited.
+    :raises utils.ScaffoldError: If the project has no manifest, or templates
+        could not be rendered.
+    """
+    with manifest.locked(project_root):  # < Held until the update is published
+        scaffold_manifest = manifest.load_manifest(project_root)
+        if scaffold_manifest is None:
+            raise utils.ScaffoldError(
+                [
+                    (
+                        project_root,
+                        FileNotFoundError(f"no {manifest.MANIFEST_RELPATH} to update"),
+                    )
+                ]
+            )
+
+        source_hashes = template_bundle.source_hashes("_templates_proj")
+        stale, kept = _stale_templates(
+            project_root,
+            _project_template_transfers(project_root, name),
+            scaffold_manifest,
+            source_hashes,
+            force=force,
+        )
+        if not stale:
+            return [], kept
+
+        # > Keep the original values, e.g. the scaffold date
+        placeholders = {
+            **_project_placeholders(name, github_user),
+            **scaffold_manifest["placeholders"],
+        }
+        with utils.staged_directory(
+            project_root, durable=durable, jobs=jobs
+        ) as staging_root:
+            transfers = {
+                tmpl_fn: staging_root / dst_fp.relative_to(project_root)
+                for tmpl_fn, dst_fp in stale.items()
+            }
+            utils.create_directories(
+                {dst_fp.parent for dst_fp in transfers.values()}, jobs=jobs
+            )
+            results = template_bundle.render_templates(
+                transfers=transfers,
+                tmpl_name="_templates_proj",
+                placeholders=placeholders,
+                jobs=jobs,
+            )
+            scaffold_manifest["placeholders"] = placeholders
+            manifest.record_renders(
+                scaffold_manifest,
+                staging_root,
+                transfers,
+                results,
+                "_templates_proj",
+                source_hashes,
+            )
+            manifest.write_manifest(staging_root, scaffold_manifest)
+        return list(stale.values()), kept
+
+
+def _scaffold(
+    project_root: Path,
+    name: str,
+    github_user: str,
+    *,
+    jobs: int = 1,
+    durable: bool = False,
+) -> dict:
+    """Render a complete project scaffold and publish it at *project_root*.
 
     :param project_root: Root directory of the generated project.
     :param name: Import package name.
+    :param github_user: GitHub username shown in generated metadata.
+    :param jobs: Maximum number of worker threads.
+    :param durable: Whether to fsync the scaffold before publishing it.
+    :return: The manifest written into the project.
+    :raises utils.ScaffoldError: If directories or files could not be created.
+    """
+    # > Render into a sibling staging dir; the project appears only when complete
+    with utils.staged_directory(
+        project_root, durable=durable, jobs=jobs
+    ) as staging_root:
+        transfers = _project_template_transfers(staging_root, name)
+        placeholders = _project_placeholders(name, github_user)
+        _create_project_directories(staging_root, name, jobs=jobs)
+        results = template_bundle.render_templates(
+            transfers=transfers,
+            tmpl_name="_templates_proj",
+            placeholders=placeholders,
+            jobs=jobs,
+        )
+        init_files = _create_init_files(staging_root, name)
+
+        scaffold_manifest = manifest.new_manifest(placeholders)
+        manifest.record_renders(
+            scaffold_manifest,
+            staging_root,
+            transfers,
+            results,
+            "_templates_proj",
+            template_bundle.source_hashes("_templates_proj"),
+        )
+        manifest.record_files(scaffold_manifest, staging_root, init_files)
+        manifest.write_manifest(staging_root, scaffold_manifest)
+    return scaffold_manifest
+
+
+def _load_spec(spec_path: Path, defaults: dict) -> list[dict]:
+    """Read a batch spec of projects to scaffold.
+
+    TOML specs hold an optional ``[defaults]`` table and ``[[project]]``
+    entries; JSONL specs hold one project object per line. Keys are ``name``,
+    ``target_dir``, ``github_user`` and ``git_init``. Relative ``target_dir``
+    values are resolved against the spec file's directory.
+
+    :param spec_path: ``.toml`` or ``.jsonl`` spec file.
+    :param defaults: Values for keys a project does not set.
+    :return: One complete settings dict per project.
+    """
+    text = spec_path.read_text(encoding="utf-8")
+    if spec_path.suffix == ".toml":
+        spec = tomllib.loads(text)
+        defaults = {**defaults, **spec.get("defaults", {})}
+        entries = spec.get("project", [])
+    else:
+        entries = [json.loads(line) for line in text.splitlines() if line.strip()]
+
+    projects = []
+    for entry in entries:
+        project = {**defaults, **entry}
+        if "target_dir" in entry or "target_dir" in defaults:
+            target = Path(project["target_dir"]).expanduser()
+            project["target_dir"] = str(spec_path.parent / target)
+        projects.append(project)
+    return projects
+
+
+def _scaffold_spec_project(project: dict, jobs: int, durable: bool) -> None:
+    """Scaffold one project of a batch spec (worker thread body).
+
+    git runs quietly, so the output of concurrent projects does not interleave.
+
+    :param project: Settings dict from ``_load_spec``.
+    :param jobs: Threads for this project's own files.
+    :param durable: Whether to fsync the scaffold before publishing it.
     :return: None.
     """
-    print(
-        dedent(
-            f"""
-            ✅  {name} scaffold complete!
-            
-            👉 Next Steps:
-                cd "{project_root}"
-                direnv allow       # Trust .envrc
-                just               # List available recipes
-            
-            Happy hacking 🎉
-            """
+    project_root = _project_root(project["target_dir"], project["name"])
+    _scaffold(
+        project_root,
+        project["name"],
+        project["github_user"],
+        jobs=jobs,
+        durable=durable,
+    )
+    if project["git_init"]:
+        utils.git_init(project_root, quiet=True)
+
+
+def _run_spec(args: argparse.Namespace) -> None:
+    """Scaffold every project of a batch spec concurrently.
+
+    Compiled templates and placeholder matchers are shared by all projects.
+
+    :param args: Parsed CLI arguments.
+    :return: None.
+    """
+    spec_path = Path(args.from_spec).expanduser().resolve()
+    projects = _load_spec(
+        spec_path,
+        defaults={
+            "target_dir": str(Path(args.target_dir).expanduser().resolve()),
+            "github_user": args.github_user,
+            "git_init": args.git_init,
+        },
+    )
+    names = [project.get("name", "") for project in projects]
+    try:
+        for name in names:
+            _validate_project_name(name)
+    except utils.InvalidNameError as exc:
+        sys.exit(f"💥  {exc}")
+    roots = {
+        _project_root(project["target_dir"], project["name"]): project
+        for project in projects
+    }
+    if len(roots) < len(projects):
+        sys.exit("💥  The spec lists the same project directory more than once")
+    utils.warn_dirs_overwrite(roots)
+
+    try:
+        utils.run_parallel(
+            {
+                project_root: functools.partial(
+                    _scaffold_spec_project, project, 1, args.durable
+                )
+                for project_root, project in roots.items()
+            },
+            jobs=args.jobs,
         )
+    except utils.ScaffoldError as exc:
+        sys.exit(f"💥  {exc}")
+    print(f"✅  Scaffolded {len(roots)} projects from {spec_path.name}")
+
+
+def _run_update(args: argparse.Namespace) -> None:
+    """Update an existing scaffold and report what changed.
+
+    :param args: Parsed CLI arguments.
+    :return: None.
+    """
+    project_root = _project_root(args.target_dir, args.name)
+    try:
+        updated, kept = _update(
+            project_root,
+            args.name,
+            args.github_user,
+            force=args.force,
+            durable=args.durable,
+            jobs=args.jobs,
+        )
+    except utils.ScaffoldError as exc:
+        sys.exit(f"💥  {exc}")
+    for relative in kept:
+        print(f"⚠️  Kept {relative}, edited since scaffolding (--force overwrites)")
+    if not updated:
+        print(f"✓  {args.name} is up to date with the buildben templates")
+    for dst_fp in updated:
+        print(f"🔄  Updated {dst_fp.relative_to(project_root)}")
+
+
+def _success_message(project_root: Path, name: str) -> str:
+    """Return the final scaffold success message.
+
+    :param project_root: Root directory of the generated project.
+    :param name: Import package name.
+    :return: Message text.
+    """
+    return dedent(
+        f"""
+        ✅  {name} scaffold complete!
+        
+        👉 Next Steps:
+            cd "{project_root}"
+            direnv allow       # Trust .envrc
+            just               # List available recipes
+        
+        Happy hacking 🎉
+        """
     )
 
 
@@ -241,21 +528,32 @@ def _print_success(project_root: Path, name: str) -> None:
 # === implementation                                                 #
 # ================================================================== #
 def _run(args: argparse.Namespace) -> None:
-    _validate_project_name(args.name)
+    if args.from_spec:
+        _run_spec(args)
+        return
+    if args.name is None:
+        sys.exit("💥  Give a project name or --from-spec")
+    try:
+        _validate_project_name(args.name)
+    except utils.InvalidNameError as exc:
+        sys.exit(f"💥  {exc}")
+    if args.update:
+        _run_update(args)
+        return
+
     project_root = _project_root(args.target_dir, args.name)
     utils.warn_dir_overwrite(project_root)
-    _create_project_directories(project_root, args.name)
-
-    transfers = _project_template_transfers(project_root, args.name)
-    tmpl_dir = Path(__file__).resolve().parent / "_templates_proj"
-    utils.copy_templates(transfers=transfers, tmpl_dir=tmpl_dir)
-    _create_init_files(project_root, args.name)
-    utils.substitute_placeholders(
-        filepaths=list(transfers.values()),
-        placeholders=_project_placeholders(args.name, args.github_user),
-    )
-
-    if args.git_init:
-        utils.git_init(project_root)
+    try:
+        _scaffold(
+            project_root,
+            args.name,
+            args.github_user,
+            jobs=args.jobs,
+            durable=args.durable,
+        )
+        if args.git_init:
+            utils.git_init(project_root)
+    except utils.ScaffoldError as exc:
+        sys.exit(f"💥  {exc}")
 
-    _print_success(project_root, args.name)
+    print(_success_message(project_root, args.name))
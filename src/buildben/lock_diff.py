@@ -0,0 +1,170 @@
+"""Compare two exported ``requirements.lock`` files package by package.
+
+``env-snapshot`` uses this when ``uv.lock`` changed since the previous
+snapshot and writes the result next to the new lock as ``lock-diff.json``::
+
+    {
+      "previous": "experiments/2026-10-01_baseline/_setup/requirements.lock",
+      "added": {"rich": "13.9.4"},
+      "removed": {"tqdm": "4.66.5"},
+      "upgraded": {"numpy": ["2.0.2", "2.1.3"]},
+      "downgraded": {},
+      "changed": {"demo": ["https://example.com/demo-1.tar.gz", "1.0"]}
+    }
+
+Package names are normalized (PEP 503). Versions are ordered with a small
+PEP 440 approximation (release segments, pre-, post- and dev-releases); no
+third-party ``packaging`` is needed. Direct references (``name @ url``) have
+no order: a different URL, or a switch to or from a URL, is ``changed``.
+"""
+
+from __future__ import annotations
+
+import re
+from collections.abc import Iterator
+from typing import NamedTuple
+
+LOCK_DIFF_NAME = "lock-diff.json"
+_NAME_RE = re.compile(r"^([A-Za-z0-9][A-Za-z0-9._-]*)(\[[^\]]*\])?\s*(.*)$")
+_PRE_RELEASE_RANK = {"dev": 0, "a": 1, "alpha": 1, "b": 2, "beta": 2}
+
+
+def normalize_name(name: str) -> str:
+    """Normalize a distribution name like pip does (PEP 503)."""
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+
+class Pin(NamedTuple):
+    """One pinned requirement of an exported lock."""
+
+    name: str  # < Normalized
+    version: str  # < The URL for direct references
+    marker: str | None  # < Environment marker, e.g. ``sys_platform == 'win32'``
+    direct: bool = False  # < ``name @ url`` instead of ``name==version``
+
+
+def iter_pins(text: str) -> Iterator[Pin]:
+    """Yield the pinned requirements of a requirements file.
+
+    Hash continuation lines, comments and options (``-e``, ``--index-url``)
+    are skipped.
+
+    :param text: Content of a ``uv export --format requirements.txt`` file.
+    :return: Pins in file order.
+    """
+    for raw_line in text.replace("\\\n", " ").splitlines():
+        line = raw_line.split(" #")[0].strip()
+        if not line or line.startswith(("#", "-")):
+            continue
+        requirement, _, marker = line.split(" --hash")[0].partition(";")
+        match = _NAME_RE.match(requirement.strip())
+        if match is None:
+            continue
+        name, _extras, spec = match.groups()
+        if spec.startswith("=="):
+            version, direct = spec[2:].strip(), False
+        elif spec.startswith("@"):
+            version, direct = spec[1:].strip(), True
+        else:
+            continue  # < Not pinned; uv export always pins
+        yield Pin(normalize_name(name), version, marker.strip() or None, direct)
+
+
+def parse_requirements(text: str) -> dict[str, str]:
+    """Map each pinned package of a requirements file to its version.
+
+    A package pinned more than once (e.g. per platform marker) maps to its
+    versions joined with `` | ``.
+
+    :param text: Content of a ``uv export --format requirements.txt`` file.
+    :return: Versions (or URLs for direct references) by normalized name.
+    """
+    pins: dict[str, set[str]] = {}
+    for pin in iter_pins(text):
+        pins.setdefault(pin.name, set()).add(pin.version)
+    return {name: " | ".join(sorted(versions)) for name, versions in pins.items()}
+
+
+def _version_key(version: str) -> tuple[tuple[int, int], ...]:
+    """Return a sort key approximating PEP 440 ordering.
+
+    Trailing zeros of the release are dropped, so ``1.0`` and ``1.0.0`` get
+    the same key.
+    """
+    key = []
+    for part in re.findall(r"\d+|[a-z]+", version.split("+")[0].lower()):
+        if part.isdigit():
+            key.append((3, int(part)))
+        elif part in ("post", "rev", "r"):
+            key.append((2, 0))
+        else:
+            key.append((0, _PRE_RELEASE_RANK.get(part, 3)))  # < rc, c, pre, ...
+    release = next((i for i, (kind, _) in enumerate(key) if kind != 3), len(key))
+    while release > 1 and key[release - 1] == (3, 0):
+        del key[release - 1]
+        release -= 1
+    return tuple(key)
+
+
+def _is_reference(version: str) -> bool:
+    """Tell whether a parsed version is, or includes, a direct reference URL."""
+    return ":" in version  # < URLs have a scheme; PEP 440 versions never do
+
+
+def _compare(old: str, new: str) -> int:
+    """Return -1, 0 or 1 as *new* sorts before, equal to or after *old*."""
+    old_key, new_key = _version_key(old), _version_key(new)
+    width = max(len(old_key), len(new_key))
+    padding = (1, 0)  # < Between pre-releases and post-releases
+    old_key += (padding,) * (width - len(old_key))
+    new_key += (padding,) * (width - len(new_key))
+    return (new_key > old_key) - (new_key < old_key)
+
+
+def diff_requirements(old: dict[str, str], new: dict[str, str]) -> dict[str, dict]:
+    """Classify the package changes between two parsed requirements files.
+
+    :param old: Result of ``parse_requirements`` for the previous lock.
+    :param new: Result of ``parse_requirements`` for the new lock.
+    :return: ``added`` and ``removed`` map names to versions; ``upgraded``,
+        ``downgraded`` and ``changed`` (direct references, compared as
+        strings) map names to ``[old, new]``.
+    """
+    diff: dict[str, dict] = {
+        "added": {name: new[name] for name in sorted(new.keys() - old.keys())},
+        "removed": {name: old[name] for name in sorted(old.keys() - new.keys())},
+        "upgraded": {},
+        "downgraded": {},
+        "changed": {},
+    }
+    for name in sorted(old.keys() & new.keys()):
+        if _is_reference(old[name]) or _is_reference(new[name]):
+            if old[name] != new[name]:
+                diff["changed"][name] = [old[name], new[name]]
+            continue
+        order = _compare(old[name], new[name])
+        if order:  # < Equal versions such as 1.0 and 1.0.0 are unchanged
+            kind = "upgraded" if order > 0 else "downgraded"
+            diff[kind][name] = [old[name], new[name]]
+    return diff
+
+
+def format_diff(diff: dict[str, dict]) -> list[str]:
+    """Render a diff as one summary line plus one line per package.
+
+    :param diff: Result of ``diff_requirements``.
+    :return: Lines without trailing newlines.
+    """
+    counts = ", ".join(
+        f"{len(diff[kind])} {kind}"
+        for kind in ("added", "removed", "upgraded", "downgraded", "changed")
+    )
+    lines = [counts]
+    lines += [f"    + {name} {version}" for name, version in diff["added"].items()]
+    lines += [f"    - {name} {version}" for name, version in diff["removed"].items()]
+    for kind, arrow in (("upgraded", "↑"), ("downgraded", "↓"), ("changed", "~")):
+        lines += [
+            f"    {arrow} {name} {old} → {new}"
+            for name, (old, new) in diff[kind].items()
+        ]
+    return lines
@@ -0,0 +1,160 @@
+"""Scaffold manifest: what buildben generated, from which template, with which hash.
+
+The manifest lives at ``<project_root>/.buildben/manifest.json``::
+
+    {
+      "format": 1,
+      "placeholders": {"<my_project>": "demo", ...},
+      "files": {
+        "pyproject.toml": {
+          "template": "_templates_proj/_pyproject.toml",
+          "source_sha256": "<hash of the template>",
+          "sha256": "<hash of the generated file>",
+          "size": 4711,
+          "mtime_ns": 1760000000000000000
+        }
+      }
+    }
+
+Paths are relative to the project root and use forward slashes. Generated
+files without a template (e.g. ``__init__.py``) have ``template`` and
+``source_sha256`` set to null. ``size`` and ``mtime_ns`` let ``bube verify``
+skip hashing files whose stat metadata is unchanged. Commands that read,
+modify and rewrite the manifest hold :func:`locked` around all three steps.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import os
+from collections.abc import Iterator
+from pathlib import Path
+
+from . import utils
+
+try:
+    import fcntl
+except ImportError:  # < Windows
+    fcntl = None  # type: ignore[assignment]
+
+MANIFEST_RELPATH = Path(".buildben") / "manifest.json"
+
+
+def manifest_path(project_root: Path) -> Path:
+    """Return the manifest location for a project.
+
+    :param project_root: Project root directory.
+    :return: Path of ``.buildben/manifest.json``.
+    """
+    return project_root / MANIFEST_RELPATH
+
+
+@contextlib.contextmanager
+def locked(project_root: Path) -> Iterator[None]:
+    """Hold the manifest lock exclusively for the duration of the block.
+
+    The lock file sits next to the manifest, so it survives the atomic
+    replace in :func:`write_manifest`. Without ``fcntl`` (Windows) nothing
+    is locked.
+
+    :param project_root: Project root directory.
+    :return: Context manager.
+    """
+    path = manifest_path(project_root)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path.with_name(f".{path.name}.lock"), "ab") as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        yield  # < Closing the file releases the lock
+
+
+def new_manifest(placeholders: dict[str, str]) -> dict:
+    """Return an empty manifest for a fresh scaffold.
+
+    :param placeholders: Placeholder values the scaffold was rendered with.
+    :return: Manifest without file entries.
+    """
+    return {"format": 1, "placeholders": dict(placeholders), "files": {}}
+
+
+def load_manifest(project_root: Path) -> dict | None:
+    """Read the manifest of a project.
+
+    :param project_root: Project root directory.
+    :return: Parsed manifest, or None if the project has none.
+    """
+    path = manifest_path(project_root)
+    if not path.is_file():
+        return None
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def write_manifest(project_root: Path, manifest: dict) -> Path:
+    """Write the manifest of a project.
+
+    :param project_root: Project root directory (or its staging directory).
+    :param manifest: Manifest to write.
+    :return: Path of the written manifest.
+    """
+    path = manifest_path(project_root)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp_path.write_text(
+        json.dumps(manifest, indent=2, sort_keys=True) + "\n", encoding="utf-8"
+    )
+    os.replace(tmp_path, path)  # < Readers never see a half-written manifest
+    return path
+
+
+def record_renders(
+    manifest: dict,
+    root: Path,
+    transfers: dict[str, Path],
+    results: dict[Path, utils.RenderResult],
+    tmpl_name: str,
+    source_hashes: dict[str, str],
+    prefix: Path = Path(),
+) -> None:
+    """Add or refresh manifest entries for rendered templates.
+
+    :param manifest: Manifest to update in place.
+    :param root: Directory the transfer destinations are relative to.
+    :param transfers: ``{<template_filename>: <destination_filepath>}``.
+    :param results: Render results by destination path.
+    :param tmpl_name: Template directory name, e.g. ``_templates_proj``.
+    :param source_hashes: ``{<template_filename>: <sha256>}``.
+    :param prefix: Location of *root* relative to the project root.
+    :return: None.
+    """
+    for tmpl_fn, dst_fp in transfers.items():
+        result = results[dst_fp]
+        manifest["files"][(prefix / dst_fp.relative_to(root)).as_posix()] = {
+            "template": f"{tmpl_name}/{tmpl_fn}",
+            "source_sha256": source_hashes[tmpl_fn],
+            "sha256": result.sha256,
+            "size": result.size,
+            "mtime_ns": dst_fp.stat().st_mtime_ns,
+        }
+
+
+def record_files(
+    manifest: dict, root: Path, paths: list[Path], prefix: Path = Path()
+) -> None:
+    """Add manifest entries for generated files that have no template.
+
+    :param manifest: Manifest to update in place.
+    :param root: Directory *paths* are relative to.
+    :param paths: Generated files.
+    :param prefix: Location of *root* relative to the project root.
+    :return: None.
+    """
+    for path in paths:
+        stat = path.stat()
+        manifest["files"][(prefix / path.relative_to(root)).as_posix()] = {
+            "template": None,
+            "source_sha256": None,
+            "sha256": utils.sha256_file(path),
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+        }
@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+buildben.serve – warm daemon answering scaffold requests over a Unix socket.
+
+The daemon keeps both template bundles, the compiled placeholder matchers and
+resolved project roots in memory. While it runs, ``bube init-proj`` and
+``bube add-experim`` forward to it (see ``client.py``). Requests are handled
+one at a time, so concurrent clients never race on the same scaffold manifest.
+Nothing the daemon runs starts a subprocess: ``env-snapshot`` (uv) and
+``init-proj --git-init`` (git) stay in the client, with its environment.
+
+Usage from CLI aggregator:
+    bube serve [--socket PATH] [--idle-timeout SECONDS]
+    bube serve --stop
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import socketserver
+import sys
+from pathlib import Path
+
+from . import (
+    add_experim,
+    api,
+    client,
+    commands,
+    init_proj,
+    template_bundle,
+    utils,
+)
+
+_COMMAND = commands.COMMANDS["serve"]  # < Arguments are declared statically
+CMD_NAME = _COMMAND.name  # < Name of the CLI-command
+CMD_ALIASES = list(_COMMAND.aliases)  # < Alias shortcut of the CLI-command
+DOC = _COMMAND.doc
+
+
+def _add_my_parser(subparsers: argparse._SubParsersAction) -> None:
+    """Attach the serve sub-parser to a parser (e.g. when run as a script).
+
+    :param subparsers: Parent argparse subparser registry.
+    :return: None.
+    """
+    p = commands.add_parser(subparsers, _COMMAND)
+    p.set_defaults(func=_run)
+
+
+# ================================================================== #
+# === Request handling                                               #
+# ================================================================== #
+
+
+class _Fallback(Exception):
+    """Raised when a request must run in the client's own process."""
+
+
+class _Server(socketserver.UnixStreamServer):
+    """Serial Unix socket server holding the per-daemon caches."""
+
+    stopping = False
+
+    def handle_timeout(self) -> None:
+        self.stopping = True  # < --idle-timeout elapsed without a request
+
+    def project_root(self, message: dict) -> Path:
+        """Return the project root of a client request.
+
+        The client's ``$PROJECT_ROOT`` wins, as in the CLI; the daemon's own
+        environment is never consulted. Otherwise the root above the client's
+        cwd is looked up; lookups stay in memory for the daemon's lifetime and
+        are revalidated by directory mtimes (see ``utils.locate_project_root``).
+
+        :param message: Decoded request with the client's cwd and environment.
+        :return: Project root.
+        :raises _Fallback: If there is none, so the CLI reports it as usual.
+        """
+        env_root = message.get("project_root")
+        environ = {"PROJECT_ROOT": env_root} if env_root else {}
+        try:
+            return utils.find_project_root(Path(message["cwd"]), environ=environ)
+        except utils.ProjectRootNotFoundError as exc:
+            raise _Fallback from exc
+
+
+def _resolve(cwd: str, raw: str) -> Path:
+    """Resolve a client path argument against the client's working directory.
+
+    :param cwd: Client working directory.
+    :param raw: Path as typed by the user.
+    :return: Absolute path.
+    """
+    path = Path(raw).expanduser()
+    return path if path.is_absolute() else Path(cwd) / path
+
+
+def _init_proj(server: _Server, message: dict, out: list[str]) -> None:
+    """Scaffold a project; output lines are appended to *out*."""
+    args = message["args"]
+    if args["git_init"]:
+        raise _Fallback  # < git must see the client's environment and config
+    try:
+        result = api.scaffold_project(
+            args["name"],
+            _resolve(message["cwd"], args["target_dir"]),
+            github_user=args["github_user"],
+            git_init=args["git_init"],
+            jobs=args["jobs"],
+            durable=args["durable"],
+        )
+    except utils.TargetExistsError as exc:
+        raise _Fallback from exc  # < The CLI asks before overwriting
+    out.append(init_proj._success_message(result.root, args["name"]) + "\n")
+
+
+def _add_experim(server: _Server, message: dict, out: list[str]) -> None:
+    """Create one experiment or a matrix of them."""
+    args = message["args"]
+    pr_root = server.project_root(message)
+    matrix = _resolve(message["cwd"], args["matrix"]) if args["matrix"] else None
+    try:
+        result = api.add_experiment(
+            args["name"],
+            project_root=pr_root,
+            matrix=matrix,
+            jobs=args["jobs"],
+            durable=args["durable"],
+            project_name=message["project_name"] or pr_root.name,
+        )
+    except utils.TargetExistsError as exc:
+        raise _Fallback from exc
+    if matrix:
+        n_runs = len(result.roots)
+        out.append(f"✅  Created {n_runs} experiments for matrix {args['matrix']}\n")
+    else:
+        out.append(f"✓  Created {result.roots[0].relative_to(pr_root)}\n")
+
+
+_HANDLERS = {
+    "init-proj": _init_proj,
+    "add-experim": _add_experim,
+}
+
+
+def _dispatch(server: _Server, message: dict) -> dict:
+    """Run one request and build its reply.
+
+    :param server: Daemon with its caches.
+    :param message: Decoded request.
+    :return: Reply for the client.
+    """
+    command = message.get("command")
+    out: list[str] = []
+    if command == "ping":
+        return {"status": 0, "stdout": "", "stderr": ""}
+    if command == "shutdown":
+        server.stopping = True
+        out.append("👋  buildben daemon stopping\n")
+        return {"status": 0, "stdout": "".join(out), "stderr": ""}
+    if command not in _HANDLERS:
+        err = f"💥  Unknown command {command}\n"
+        return {"status": 2, "stdout": "", "stderr": err}
+
+    try:
+        _HANDLERS[command](server, message, out)
+    except _Fallback:
+        return {"fallback": True}
+    except utils.SnapshotError as exc:
+        err = f"{exc}\n"  # < Same text as the SystemExit of env-snapshot
+    except (utils.BuildbenError, OSError) as exc:
+        err = f"💥  {exc}\n"
+    except Exception as exc:  # noqa: BLE001 - a bug must not leave the client hanging
+        err = f"💥  {type(exc).__name__}: {exc}\n"
+    else:
+        return {"status": 0, "stdout": "".join(out), "stderr": ""}
+    return {"status": 1, "stdout": "".join(out), "stderr": err}
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    """Read one JSON request line, write one JSON reply line."""
+
+    def handle(self) -> None:
+        try:
+            message = json.loads(self.rfile.readline())
+        except ValueError:
+            reply = {"status": 2, "stdout": "", "stderr": "💥  Malformed request\n"}
+        else:
+            reply = _dispatch(self.server, message)  # type: ignore[arg-type]
+        self.wfile.write(json.dumps(reply).encode("utf-8") + b"\n")
+
+
+# ================================================================== #
+# === Daemon                                                         #
+# ================================================================== #
+
+
+def _warm_caches() -> None:
+    """Load both template bundles and compile the placeholder matchers."""
+    for tmpl_name in ("_templates_proj", "_templates_experim"):
+        template_bundle.preload_bundle(tmpl_name)
+        template_bundle.source_hashes(tmpl_name)
+    utils.PlaceholderEngine(init_proj._project_placeholders("warm", "warm"))
+    utils.PlaceholderEngine(
+        add_experim._experiment_placeholders("warm", "warm", "warm", "warm")
+    )
+
+
+def serve_socket(path: str, idle_timeout: float = 0) -> None:
+    """Serve requests on *path* until stopped.
+
+    :param path: Unix socket to create; removed again on exit.
+    :param idle_timeout: Seconds without a request before exiting; 0 = never.
+    :return: None.
+    """
+    _warm_caches()
+    old_umask = os.umask(0o177)  # < Socket readable by its owner only
+    try:
+        server = _Server(path, _Handler)
+    finally:
+        os.umask(old_umask)
+    server.timeout = idle_timeout or None
+    try:
+        while not server.stopping:
+            server.handle_request()
+    finally:
+        server.server_close()
+        if os.path.exists(path):
+            os.unlink(path)
+
+
+# ================================================================== #
+# === implementation                                                 #
+# ================================================================== #
+def _run(args: argparse.Namespace) -> None:
+    path = client.socket_path(args.socket)
+
+    if args.stop:
+        try:
+            reply = client.request({"command": "shutdown"}, path, timeout=5)
+        except OSError:
+            sys.exit(f"💥  No buildben daemon listens on {path}")
+        print(reply["stdout"], end="")
+        return
+
+    if os.path.exists(path):
+        try:
+            client.request({"command": "ping"}, path, timeout=1)
+        except (OSError, ValueError):
+            os.unlink(path)  # < Left behind by a daemon that crashed
+        else:
+            sys.exit(f"💥  A buildben daemon already listens on {path}")
+
+    print(f"🛎️  buildben daemon listening on {path} (stop: `bube serve --stop`)")
+    try:
+        serve_socket(path, args.idle_timeout)
+    except KeyboardInterrupt:
+        pass
+    print("👋  buildben daemon stopped")
+
+
+if __name__ == "__main__":
+    _parser = argparse.ArgumentParser()
+    _add_my_parser(_parser.add_subparsers(dest="cmd", required=True))
+    parsed_args = _parser.parse_args()
+    parsed_args.func(parsed_args)
@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""
+buildben.store – content-addressed store for snapshot wheels and sdists.
+
+Blobs live read-only at ``<project_root>/.buildben/store/<sha256>``. The
+wheel and sdist in an experiment's ``_setup`` are hardlinks to them (copies
+across filesystems), so identical builds take disk space once. Every link is
+recorded in ``.buildben/store/refs.sqlite``; ``bube store gc`` drops records
+whose file is gone or changed and removes blobs that neither a record nor an
+``env-snapshot`` cache entry (``.buildben/*-cache/*.json``) refers to.
+
+Writers hold ``.buildben/store/.lock`` shared from adding their first blob
+until its links are recorded, and ``gc`` holds it exclusively, so a
+collection never runs while a snapshot is in flight.
+
+Usage from CLI aggregator:
+    bube store gc [--dry-run]
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import functools
+import json
+import os
+import re
+import secrets
+import shutil
+import sqlite3
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+
+from . import commands, exp_index, utils
+
+_COMMAND = commands.COMMANDS["store"]  # < Arguments are declared statically
+CMD_NAME = _COMMAND.name  # < Name of the CLI-command
+CMD_ALIASES = list(_COMMAND.aliases)  # < Alias shortcut of the CLI-command
+DOC = _COMMAND.doc
+
+try:
+    import fcntl
+except ImportError:  # < Windows
+    fcntl = None  # type: ignore[assignment]
+
+STORE_RELPATH = Path(".buildben") / "store"
+# > env-snapshot caches of store digests; gc keeps the blobs they list
+BUILD_CACHE_RELPATH = Path(".buildben") / "build-cache"
+EXPORT_CACHE_RELPATH = Path(".buildben") / "export-cache"
+WHEELHOUSE_CACHE_RELPATH = Path(".buildben") / "wheelhouse-cache"
+CACHE_RELPATHS = (BUILD_CACHE_RELPATH, EXPORT_CACHE_RELPATH, WHEELHOUSE_CACHE_RELPATH)
+_DIGEST_RE = re.compile(r"^[0-9a-f]{64}$")
+
+
+def _add_my_parser(subparsers: argparse._SubParsersAction) -> None:
+    """Attach the store sub-parser to a parser (e.g. when run as a script).
+
+    :param subparsers: Parent argparse subparser registry.
+    :return: None.
+    """
+    p = commands.add_parser(subparsers, _COMMAND)
+    p.set_defaults(func=_run)
+
+
+# ================================================================== #
+# === Blobs and references                                           #
+# ================================================================== #
+
+
+def blob_path(project_root: Path, digest: str) -> Path:
+    """Return the store location of a blob.
+
+    :param project_root: Project root directory.
+    :param digest: Hex SHA-256 of the blob's content.
+    :return: Path of ``.buildben/store/<digest>``.
+    """
+    return project_root / STORE_RELPATH / digest
+
+
+def _connect(project_root: Path) -> sqlite3.Connection:
+    """Open the reference table, creating it if needed."""
+    store_dir = project_root / STORE_RELPATH
+    store_dir.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(store_dir / "refs.sqlite", timeout=10)
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS refs (path TEXT PRIMARY KEY, digest TEXT NOT NULL)"
+    )
+    return conn
+
+
+def add(project_root: Path, path: Path) -> str:
+    """Move a file into the store.
+
+    :param project_root: Project root directory.
+    :param path: File to store; it is gone afterwards.
+    :return: Hex SHA-256 of its content.
+    """
+    digest = utils.sha256_file(path)
+    blob = blob_path(project_root, digest)
+    if blob.is_file():
+        path.unlink()  # < Same content stored already
+    else:
+        blob.parent.mkdir(parents=True, exist_ok=True)
+        path.chmod(0o444)  # < Hardlinks share it; keep the store intact
+        os.replace(path, blob)
+    return digest
+
+
+def place(project_root: Path, digest: str, target: Path) -> None:
+    """Hardlink a blob to *target*, copying across filesystems.
+
+    The reference is not recorded; see ``link_many``.
+
+    :param project_root: Project root directory.
+    :param digest: Hex SHA-256 of a stored blob.
+    :param target: Destination, e.g. in an experiment's ``_setup``.
+    :return: None.
+    """
+    # > Unique per call, so concurrent snapshots never share a temp file
+    tmp = target.with_name(f".{target.name}.{os.getpid()}.{secrets.token_hex(4)}.tmp")
+    try:
+        try:
+            os.link(blob_path(project_root, digest), tmp)
+        except OSError:
+            shutil.copy2(blob_path(project_root, digest), tmp)
+        os.replace(tmp, target)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+def link_many(
+    project_root: Path, links: Iterable[tuple[Path, str]], jobs: int = 1
+) -> None:
+    """Hardlink blobs and record the references, in one transaction.
+
+    The references are committed once every blob is placed; if placing
+    fails, none of them are.
+
+    :param project_root: Project root directory.
+    :param links: ``(<target path>, <digest>)`` pairs.
+    :param jobs: Maximum number of blobs placed at a time.
+    :return: None.
+    :raises utils.ScaffoldError: If any blob could not be placed.
+    """
+    links = list(links)
+    rows = [
+        (path.relative_to(project_root).as_posix(), digest) for path, digest in links
+    ]
+    conn = _connect(project_root)
+    try:
+        with conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO refs (path, digest) VALUES (?, ?)", rows
+            )
+            utils.run_parallel(
+                {
+                    target: functools.partial(place, project_root, digest, target)
+                    for target, digest in links
+                },
+                jobs=jobs,
+            )
+    finally:
+        conn.close()
+
+
+def link(project_root: Path, digest: str, target: Path) -> None:
+    """Hardlink a blob to *target* and record the reference.
+
+    :param project_root: Project root directory.
+    :param digest: Hex SHA-256 of a stored blob.
+    :param target: Destination, e.g. in an experiment's ``_setup``.
+    :return: None.
+    """
+    link_many(project_root, [(target, digest)])
+
+
+@contextlib.contextmanager
+def locked(project_root: Path, exclusive: bool = False) -> Iterator[None]:
+    """Hold the store lock for the duration of the block.
+
+    Writers take it shared, from their first ``add`` until ``link_many``
+    recorded the links; ``gc`` takes it exclusively. Without ``fcntl``
+    (Windows) nothing is locked.
+
+    :param project_root: Project root directory.
+    :param exclusive: Whether to exclude all other holders.
+    :return: Context manager.
+    """
+    store_dir = project_root / STORE_RELPATH
+    store_dir.mkdir(parents=True, exist_ok=True)
+    with open(store_dir / ".lock", "ab") as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        yield  # < Closing the file releases the lock
+
+
+def has_blobs(project_root: Path, digests: Iterable[str]) -> bool:
+    """Tell whether all given blobs are (still) stored.
+
+    :param project_root: Project root directory.
+    :param digests: Hex SHA-256 digests.
+    :return: True if every blob exists.
+    """
+    return all(blob_path(project_root, digest).is_file() for digest in digests)
+
+
+def _is_live(project_root: Path, relative: str, digest: str) -> bool:
+    """Tell whether a recorded reference still points at its blob."""
+    target = project_root / relative
+    blob = blob_path(project_root, digest)
+    try:
+        if os.path.samefile(target, blob):
+            return True
+    except FileNotFoundError:
+        return False
+    return blob.is_file() and utils.sha256_file(target) == digest  # < A copy
+
+
+def _cached_digests(project_root: Path) -> set[str]:
+    """Return the digests referred to by ``env-snapshot`` cache entries."""
+    digests = set()
+    for cache_relpath in CACHE_RELPATHS:
+        for entry in (project_root / cache_relpath).glob("*.json"):
+            try:
+                files = json.loads(entry.read_text(encoding="utf-8"))
+            except (FileNotFoundError, ValueError):
+                continue  # < Removed meanwhile, or not written by buildben
+            if isinstance(files, dict):
+                digests.update(str(digest) for digest in files.values())
+    return digests
+
+
+def gc(project_root: Path, dry_run: bool = False) -> tuple[int, int, int]:
+    """Remove blobs that no recorded reference or cache entry points at.
+
+    References whose file was deleted or replaced are dropped first. Blobs
+    listed in the ``env-snapshot`` caches stay, so delete those caches to
+    also free cached builds. Waits for running snapshots (see ``locked``).
+
+    :param project_root: Project root directory.
+    :param dry_run: Only report what would be removed.
+    :return: Number of removed blobs, their total size and kept blobs.
+    """
+    store_dir = project_root / STORE_RELPATH
+    if not store_dir.is_dir():
+        return 0, 0, 0
+    with locked(project_root, exclusive=True):
+        return _collect(project_root, dry_run)
+
+
+def _collect(project_root: Path, dry_run: bool) -> tuple[int, int, int]:
+    """Run ``gc`` while holding the store lock exclusively."""
+    store_dir = project_root / STORE_RELPATH
+    conn = _connect(project_root)
+    try:
+        refs = conn.execute("SELECT path, digest FROM refs").fetchall()
+        stale = [
+            (path,) for path, digest in refs if not _is_live(project_root, path, digest)
+        ]
+        if not dry_run:
+            with conn:
+                conn.executemany("DELETE FROM refs WHERE path = ?", stale)
+    finally:
+        conn.close()
+
+    stale_paths = {path for (path,) in stale}
+    live = {digest for path, digest in refs if path not in stale_paths}
+    live |= _cached_digests(project_root)
+    removed = freed = kept = 0
+    for blob in store_dir.iterdir():
+        if not _DIGEST_RE.match(blob.name):
+            continue  # < refs.sqlite, temporary files
+        if blob.name in live:
+            kept += 1
+            continue
+        removed += 1
+        freed += blob.stat().st_size
+        if not dry_run:
+            blob.unlink()
+    return removed, freed, kept
+
+
+# ================================================================== #
+# === implementation                                                 #
+# ================================================================== #
+def _run(args: argparse.Namespace) -> None:
+    """Run a store maintenance action.
+
+    :param args: Parsed CLI arguments.
+    :return: None.
+    """
+    project_root = utils.find_project_root()
+    removed, freed, kept = gc(project_root, dry_run=args.dry_run)
+    verb = "Would remove" if args.dry_run else "Removed"
+    size = exp_index.format_size(freed)
+    print(f"🧹  {verb} {removed} unreferenced blobs ({size}), kept {kept}")
+
+
+if __name__ == "__main__":
+    _parser = argparse.ArgumentParser()
+    _add_my_parser(_parser.add_subparsers(dest="cmd", required=True))
+    parsed_args = _parser.parse_args()
+    parsed_args.func(parsed_args)
@@ -0,0 +1,274 @@
+"""Precompiled template bundles for the scaffold templates.
+
+A bundle packs one template directory into a single file: a JSON header with
+per-template offsets, file modes, content hashes and the positions of every
+placeholder-like token, followed by the raw template bytes. Wheels ship one
+bundle per template directory (see ``setup.py``), so rendering is one
+memory-mapped read plus splicing at known offsets instead of opening and
+scanning every template.
+
+Source checkouts have no bundle and fall back to ``utils.render_templates``.
+"""
+
+from __future__ import annotations
+
+import functools
+import hashlib
+import importlib.resources
+import json
+import mmap
+import re
+import struct
+import sys
+from collections import Counter
+from pathlib import Path
+
+from . import utils
+
+MAGIC = b"BUBETPL1"
+BUNDLE_SUFFIX = ".bundle"
+TEMPLATE_ROOT = Path(__file__).resolve().parent
+# > Every placeholder buildben uses has this shape, e.g. <my_project>, {bb_date}
+TOKEN_RE = re.compile(r"<[A-Za-z_][A-Za-z0-9_ ]*>|\{[A-Za-z_][A-Za-z0-9_ ]*\}")
+_HEADER_LEN = struct.Struct(">Q")
+
+
+# ================================================================== #
+# === Build                                                          #
+# ================================================================== #
+
+
+def compile_bundle(tmpl_dir: Path) -> bytes:
+    """Compile all files of a template directory into bundle bytes.
+
+    :param tmpl_dir: Template directory, e.g. ``_templates_proj``.
+    :return: Bundle file content.
+    """
+    files: dict[str, dict] = {}
+    payload: list[bytes] = []
+    offset = 0
+    for tmpl_fp in sorted(p for p in tmpl_dir.iterdir() if p.is_file()):
+        data = tmpl_fp.read_bytes()
+        try:
+            text = data.decode("utf-8")
+        except UnicodeDecodeError:
+            tokens = []  # < Binary templates are never substituted
+        else:
+            tokens = []
+            char_pos = byte_pos = 0
+            for m in TOKEN_RE.finditer(text):  # < Offsets are stored in bytes
+                byte_pos += len(text[char_pos : m.start()].encode("utf-8"))
+                char_pos = m.start()
+                tokens.append([byte_pos, m.group(0)])
+        files[tmpl_fp.name] = {
+            "offset": offset,
+            "size": len(data),
+            "mode": tmpl_fp.stat().st_mode & 0o7777,
+            "sha256": hashlib.sha256(data).hexdigest(),
+            "tokens": tokens,
+        }
+        payload.append(data)
+        offset += len(data)
+
+    header = json.dumps({"format": 1, "files": files}, separators=(",", ":"))
+    header_bytes = header.encode("utf-8")
+    return b"".join(
+        [MAGIC, _HEADER_LEN.pack(len(header_bytes)), header_bytes, *payload]
+    )
+
+
+def write_bundle(tmpl_dir: Path, out_dir: Path) -> Path:
+    """Compile *tmpl_dir* and write ``<tmpl_dir.name>.bundle`` into *out_dir*.
+
+    :param tmpl_dir: Template directory to compile.
+    :param out_dir: Directory receiving the bundle file.
+    :return: Path of the written bundle.
+    """
+    out_path = out_dir / f"{tmpl_dir.name}{BUNDLE_SUFFIX}"
+    out_path.write_bytes(compile_bundle(tmpl_dir))
+    return out_path
+
+
+# ================================================================== #
+# === Load & render                                                  #
+# ================================================================== #
+
+
+class TemplateBundle:
+    """Memory-mapped view of a compiled template bundle.
+
+    :param path: Bundle file, or only a label if *data* is given.
+    :param data: Bundle bytes to hold in anonymous memory instead of a file.
+    """
+
+    def __init__(self, path: Path, data: bytes | None = None) -> None:
+        if data is None:
+            with open(path, "rb") as fh:
+                self._mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            self._mm = mmap.mmap(-1, len(data))
+            self._mm.write(data)
+        if self._mm[: len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not a buildben template bundle")
+        (header_len,) = _HEADER_LEN.unpack_from(self._mm, len(MAGIC))
+        header_start = len(MAGIC) + _HEADER_LEN.size
+        header = json.loads(self._mm[header_start : header_start + header_len])
+        self.path = path
+        self.files: dict[str, dict] = header["files"]
+        self._payload = header_start + header_len
+        self._view = memoryview(self._mm)
+
+    @staticmethod
+    def supports(engine: utils.PlaceholderEngine) -> bool:
+        """Return whether precomputed token offsets cover all keys of *engine*.
+
+        :param engine: Compiled placeholder engine.
+        :return: True if every key has the bundled token shape.
+        """
+        return all(TOKEN_RE.fullmatch(key) for key in engine.placeholders)
+
+    def data(self, tmpl_fn: str) -> memoryview:
+        """Return the raw bytes of one bundled template.
+
+        :param tmpl_fn: Template filename.
+        :return: Zero-copy view into the mapped bundle.
+        """
+        entry = self.files[tmpl_fn]
+        start = self._payload + entry["offset"]
+        return self._view[start : start + entry["size"]]
+
+    def render(
+        self, tmpl_fn: str, dst_fp: Path, engine: utils.PlaceholderEngine
+    ) -> utils.RenderResult:
+        """Render one bundled template by splicing at its token offsets.
+
+        :param tmpl_fn: Template filename.
+        :param dst_fp: Destination file.
+        :param engine: Compiled placeholder engine.
+        :return: Hit counts, content hash and size of the written file.
+        """
+        entry = self.files[tmpl_fn]
+        view = self.data(tmpl_fn)
+        hits: Counter[str] = Counter()
+        parts: list[bytes | memoryview] = []
+        cursor = 0
+        for start, token in entry["tokens"]:
+            new = engine.placeholders.get(token)
+            if new is None:
+                continue  # < Token-shaped text that is not a placeholder
+            parts.append(view[cursor:start])
+            parts.append(new.encode("utf-8"))
+            cursor = start + len(token.encode("utf-8"))
+            hits[token] += 1
+        parts.append(view[cursor:])
+
+        with open(dst_fp, "wb") as fh:
+            fh.writelines(parts)
+        dst_fp.chmod(entry["mode"])
+        if not hits:  # < Unchanged template, the bundled hash is the output hash
+            return utils.RenderResult(hits, entry["sha256"], entry["size"])
+        digest = hashlib.sha256()
+        for part in parts:
+            digest.update(part)
+        return utils.RenderResult(hits, digest.hexdigest(), sum(map(len, parts)))
+
+
+@functools.cache
+def load_bundle(tmpl_name: str) -> TemplateBundle | None:
+    """Load the packaged bundle for a template directory, if one was built.
+
+    :param tmpl_name: Template directory name, e.g. ``_templates_proj``.
+    :return: Loaded bundle, or None in source checkouts without bundles.
+    """
+    resource = importlib.resources.files("buildben") / f"{tmpl_name}{BUNDLE_SUFFIX}"
+    if not resource.is_file():
+        return None
+    with importlib.resources.as_file(resource) as path:
+        return TemplateBundle(path)
+
+
+_PRELOADED: dict[str, TemplateBundle] = {}
+
+
+def preload_bundle(tmpl_name: str) -> TemplateBundle:
+    """Keep a bundle in memory for the rest of the process (``bube serve``).
+
+    Source checkouts have no packaged bundle, so the template directory is
+    compiled in memory once; later edits to it are not picked up.
+
+    :param tmpl_name: Template directory name, e.g. ``_templates_proj``.
+    :return: The packaged or freshly compiled bundle.
+    """
+    bundle = _PRELOADED.get(tmpl_name) or load_bundle(tmpl_name)
+    if bundle is None:
+        tmpl_dir = TEMPLATE_ROOT / tmpl_name
+        bundle = TemplateBundle(tmpl_dir, compile_bundle(tmpl_dir))
+    _PRELOADED[tmpl_name] = bundle
+    return bundle
+
+
+@functools.cache
+def source_hashes(tmpl_name: str) -> dict[str, str]:
+    """Return the SHA-256 of every template source file.
+
+    Bundles carry precomputed hashes; source checkouts hash the files once
+    per process. Callers must not mutate the returned dict.
+
+    :param tmpl_name: Template directory name, e.g. ``_templates_proj``.
+    :return: ``{<template_filename>: <sha256>}``.
+    """
+    bundle = _PRELOADED.get(tmpl_name) or load_bundle(tmpl_name)
+    if bundle is not None:
+        return {tmpl_fn: entry["sha256"] for tmpl_fn, entry in bundle.files.items()}
+    return {
+        tmpl_fp.name: utils.sha256_file(tmpl_fp)
+        for tmpl_fp in sorted((TEMPLATE_ROOT / tmpl_name).iterdir())
+        if tmpl_fp.is_file()
+    }
+
+
+def render_templates(
+    transfers: dict[str, Path],
+    tmpl_name: str,
+    placeholders: dict[str, str] | utils.PlaceholderEngine,
+    jobs: int = 1,
+) -> dict[Path, utils.RenderResult]:
+    """Render templates from the packaged bundle, or from the directory.
+
+    :param transfers: ``{<template_filename>: <destination_filepath>}``.
+    :param tmpl_name: Template directory name, e.g. ``_templates_proj``.
+    :param placeholders: Replacement mapping or an already compiled engine.
+    :param jobs: Maximum number of worker threads.
+    :return: Render result per destination file.
+    :raises utils.ScaffoldError: If any template could not be rendered.
+    """
+    engine = (
+        placeholders
+        if isinstance(placeholders, utils.PlaceholderEngine)
+        else utils.PlaceholderEngine(placeholders)
+    )
+    bundle = _PRELOADED.get(tmpl_name) or load_bundle(tmpl_name)
+    if (
+        bundle is None
+        or not bundle.supports(engine)
+        or not transfers.keys() <= bundle.files.keys()
+    ):
+        return utils.render_templates(
+            transfers, TEMPLATE_ROOT / tmpl_name, engine, jobs=jobs
+        )
+
+    results = utils.run_parallel(
+        {
+            dst_fp: functools.partial(bundle.render, tmpl_fn, dst_fp, engine)
+            for tmpl_fn, dst_fp in transfers.items()
+        },
+        jobs=jobs,
+    )
+    return results
+
+
+if __name__ == "__main__":
+    # > python -m buildben.template_bundle OUT_DIR
+    _out_dir = Path(sys.argv[1]) if len(sys.argv) > 1 else Path.cwd()
+    for _name in ("_templates_proj", "_templates_experim"):
+        print(write_bundle(TEMPLATE_ROOT / _name, _out_dir))
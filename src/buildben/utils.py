@@ -2,13 +2,62 @@
 
 # %%
 import os
+import re
 import shlex
 import sys
 import subprocess
 import shutil
+import functools
+import hashlib
+import json
+import contextlib
+import secrets
+import threading
+import time
 from pathlib import Path
 import ast
-from collections.abc import Iterable, Sequence
+from collections import Counter
+from collections.abc import (
+    Awaitable,
+    Callable,
+    Coroutine,
+    Iterable,
+    Iterator,
+    Mapping,
+    Sequence,
+)
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, NamedTuple
+
+
+# %%
+# =====================================================================
+# === Errors
+# =====================================================================
+
+
+class BuildbenError(RuntimeError):
+    """Base class of the errors buildben raises for expected failures."""
+
+
+class InvalidNameError(BuildbenError, ValueError):
+    """Raised when a project or experiment name cannot be used."""
+
+
+class TargetExistsError(BuildbenError, FileExistsError):
+    """Raised when a scaffold target exists and overwriting was not allowed."""
+
+
+class ProjectRootNotFoundError(BuildbenError):
+    """Raised when no project root can be found above a directory."""
+
+
+class SnapshotError(BuildbenError):
+    """Raised when an environment snapshot step fails."""
+
+
+class RestoreError(BuildbenError):
+    """Raised when a snapshot cannot be restored into a virtual environment."""
 
 
 # %%
@@ -22,12 +71,14 @@ def run_command(
     *,
     cwd: Path | None = None,
     quiet: bool = True,
+    echo_errors: bool = True,
 ) -> str:
     """Run a subprocess command and return stripped stdout.
 
     :param command: Executable and arguments to run without shell expansion.
     :param cwd: Optional working directory for the subprocess.
     :param quiet: Whether to suppress stdout on successful completion.
+    :param echo_errors: Whether to print the command and its stderr on failure.
     :return: Captured stdout without leading or trailing whitespace.
     :raises subprocess.CalledProcessError: If the command exits non-zero.
     """
@@ -40,9 +91,11 @@ def run_command(
     )
 
     if result.returncode != 0:
-        command_text = shlex.join(command)
-        print(f"\n!!\n!! Error executing command:\n{command_text}\n", file=sys.stderr)
-        print(result.stderr, "!!\n!!\n", file=sys.stderr)
+        if echo_errors:
+            command_text = shlex.join(command)
+            _m = f"\n!!\n!! Error executing command:\n{command_text}\n"
+            print(_m, file=sys.stderr)
+            print(result.stderr, "!!\n!!\n", file=sys.stderr)
         raise subprocess.CalledProcessError(
             result.returncode,
             list(command),
@@ -56,6 +109,81 @@ def run_command(
     return result.stdout.strip()
 
 
+async def run_checked(
+    command: list[str],
+    *,
+    cwd: Path,
+    failure_hint: str,
+    error: type[BuildbenError] = SnapshotError,
+) -> str:
+    """Run a required command and convert failures into buildben errors.
+
+    :param command: Executable and arguments to run.
+    :param cwd: Working directory for the command.
+    :param failure_hint: Message shown if the command fails.
+    :param error: Error type to raise, e.g. ``RestoreError``.
+    :return: Captured stdout without surrounding whitespace.
+    :raises SnapshotError: If the command is missing or exits non-zero (or
+        *error*).
+    """
+    import asyncio  # < Only env-snapshot and env-restore pay for asyncio
+
+    try:
+        process = await asyncio.create_subprocess_exec(
+            *command,
+            cwd=cwd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+    except FileNotFoundError as exc:
+        raise error(f"{failure_hint}\n{command[0]}: not found") from exc
+    try:
+        stdout, stderr = await process.communicate()
+    except asyncio.CancelledError:  # < A concurrent phase failed
+        process.kill()
+        await process.wait()
+        raise
+    if process.returncode != 0:
+        stderr_text = stderr.decode("utf-8", errors="replace").strip()
+        detail = f"\n{stderr_text}" if stderr_text else ""
+        raise error(f"{failure_hint}{detail}")
+    return stdout.decode("utf-8", errors="replace").strip()
+
+
+async def gather_phases(*phases: Awaitable) -> list:
+    """Run phases concurrently, cancelling the rest if one fails.
+
+    :param phases: Coroutines to run, e.g. ``run_checked`` calls.
+    :return: Their results, in order.
+    :raises BuildbenError: The first failure of any phase.
+    """
+    import asyncio
+
+    tasks = [asyncio.ensure_future(phase) for phase in phases]
+    try:
+        return await asyncio.gather(*tasks)
+    finally:
+        for task in tasks:
+            task.cancel()  # < No-op for finished tasks
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def run_phases[R](phases: Coroutine[Any, Any, R]) -> R:
+    """Run a coroutine to completion, also from inside a running event loop.
+
+    :param phases: Coroutine to run.
+    :return: Its result.
+    """
+    import asyncio
+
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(phases)
+    with ThreadPoolExecutor(max_workers=1) as pool:  # < e.g. a Jupyter kernel
+        return pool.submit(asyncio.run, phases).result()
+
+
 if __name__ == "__main__":
     print(run_command(["ls", "-l", "-a"]))
 
@@ -64,16 +192,81 @@ if __name__ == "__main__":
 # =====================================================================
 # === Git
 # =====================================================================
-def git_init(PROOT: Path) -> None:
-    """Initialize a git repository in the given project root directory."""
+def git_init(PROOT: Path, quiet: bool = False) -> None:
+    """Initialize a git repository in the given project root directory.
 
-    subprocess.run(["git", "init", "--initial-branch", "main"], cwd=PROOT, check=True)
-    subprocess.run(["git", "add", "."], cwd=PROOT, check=True)
-    subprocess.run(
+    :param PROOT: Project root directory.
+    :param quiet: Whether to capture git's output instead of printing it.
+    :return: None.
+    :raises ScaffoldError: If git is missing or a git command fails.
+    """
+    for command in (
+        ["git", "init", "--initial-branch", "main"],
+        ["git", "add", "."],
         ["git", "commit", "-m", "Initial scaffold from buildben"],
-        cwd=PROOT,
-        check=True,
-    )
+    ):
+        try:
+            subprocess.run(
+                command, cwd=PROOT, check=True, capture_output=quiet, text=True
+            )
+        except subprocess.CalledProcessError as exc:
+            detail = (exc.stderr or "").strip() or f"exit status {exc.returncode}"
+            raise ScaffoldError(
+                [(PROOT, RuntimeError(f"{shlex.join(command)}: {detail}"))]
+            ) from exc
+        except OSError as exc:
+            raise ScaffoldError([(PROOT, exc)]) from exc
+
+
+# %%
+# =====================================================================
+# === Parallel
+# =====================================================================
+
+
+class ScaffoldError(BuildbenError):
+    """Raised when one or more paths of a scaffold could not be materialized.
+
+    :ivar failures: ``(path, exception)`` pairs, sorted by path.
+    """
+
+    def __init__(self, failures: list[tuple[Path, BaseException]]) -> None:
+        self.failures = sorted(failures, key=lambda failure: str(failure[0]))
+        details = "\n".join(f"  {path}: {exc}" for path, exc in self.failures)
+        super().__init__(f"{len(self.failures)} scaffold step(s) failed:\n{details}")
+
+
+def run_parallel[R](tasks: dict[Path, Callable[[], R]], jobs: int = 1) -> dict[Path, R]:
+    """Run one task per path, on a bounded thread pool if *jobs* > 1.
+
+    Every task runs even if others fail. Failures are raised together
+    afterwards, in path order, so the error does not depend on scheduling.
+
+    :param tasks: ``{<path>: <zero-argument callable>}``.
+    :param jobs: Maximum number of worker threads. ``1`` runs serially.
+    :return: Task results by path, in the order of *tasks*.
+    :raises ScaffoldError: If any task raised.
+    """
+    results: dict[Path, R] = {}
+    failures: list[tuple[Path, BaseException]] = []
+    if jobs <= 1 or len(tasks) <= 1:
+        for path, task in tasks.items():
+            try:
+                results[path] = task()
+            except Exception as exc:  # noqa: BLE001 - re-raised in ScaffoldError
+                failures.append((path, exc))
+    else:
+        with ThreadPoolExecutor(max_workers=min(jobs, len(tasks))) as pool:
+            futures = {path: pool.submit(task) for path, task in tasks.items()}
+        for path, future in futures.items():
+            exc = future.exception()
+            if exc is None:
+                results[path] = future.result()
+            else:
+                failures.append((path, exc))
+    if failures:
+        raise ScaffoldError(failures)
+    return results
 
 
 # %%
@@ -82,26 +275,161 @@ def git_init(PROOT: Path) -> None:
 # =====================================================================
 
 
+ROOT_SENTINELS = (".git", "pyproject.toml", "setup.py")
+_ROOT_CACHE_SIZE = 256  # < Start directories remembered on disk
+_RACY_NS = 2_000_000_000  # < Fresher mtimes may hide a change in the same tick
+_root_cache: dict[str, dict] | None = None  # < Loaded once per process
+_root_cache_lock = threading.Lock()  # < Shared by daemon and worker threads
+
+
+class ProjectRoot(NamedTuple):
+    """A project root and the sentinel that identified it."""
+
+    path: Path
+    sentinel: str  # < e.g. ".git", or "$PROJECT_ROOT" if set by the environment
+
+
+def _root_cache_path() -> Path:
+    """Return the on-disk project-root cache file.
+
+    Prefers ``$BUILDBEN_CACHE_DIR``, then ``$XDG_RUNTIME_DIR/buildben`` (local
+    tmpfs, even when the home directory is on NFS), then the XDG cache dir.
+    """
+    cache_dir = os.getenv("BUILDBEN_CACHE_DIR")
+    if not cache_dir and os.getenv("XDG_RUNTIME_DIR"):
+        cache_dir = os.path.join(os.environ["XDG_RUNTIME_DIR"], "buildben")
+    if not cache_dir:
+        xdg_cache = os.getenv("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+        cache_dir = os.path.join(xdg_cache, "buildben")
+    return Path(cache_dir) / "project-roots.json"
+
+
+def _load_root_cache() -> dict[str, dict]:
+    """Return the in-process cache; the caller holds ``_root_cache_lock``."""
+    global _root_cache
+    if _root_cache is None:
+        try:
+            _root_cache = json.loads(_root_cache_path().read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            _root_cache = {}
+    return _root_cache
+
+
+def _store_root_cache(key: str, entry: dict) -> None:
+    """Remember a lookup; the cache is best effort and never raises."""
+    with _root_cache_lock:  # < Also serializes the per-process temp file
+        cache = _load_root_cache()
+        cache.pop(key, None)
+        cache[key] = entry
+        while len(cache) > _ROOT_CACHE_SIZE:
+            del cache[next(iter(cache))]  # < Oldest lookup first
+        path = _root_cache_path()
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+            tmp_path.write_text(json.dumps(cache), encoding="utf-8")
+            os.replace(tmp_path, path)
+        except OSError:
+            pass
+
+
+def _mtimes_match(mtimes: dict[str, int]) -> bool:
+    """Return whether no directory of a cached lookup changed since."""
+    try:
+        return all(os.stat(d).st_mtime_ns == ns for d, ns in mtimes.items())
+    except OSError:
+        return False
+
+
+def _scan_for_root(
+    here: str, sentinels: Sequence[str]
+) -> tuple[str, str, dict[str, int]] | None:
+    """Walk upward from *here*, listing each directory once.
+
+    :param here: Absolute start directory.
+    :param sentinels: Entry names that mark a project root, by priority.
+    :return: Root, matched sentinel and the mtimes of all visited directories,
+        or None if no ancestor holds a sentinel.
+    """
+    wanted = set(sentinels)
+    mtimes: dict[str, int] = {}
+    directory = here
+    while True:
+        try:
+            with os.scandir(directory) as entries:
+                found = {entry.name for entry in entries if entry.name in wanted}
+            mtimes[directory] = os.stat(directory).st_mtime_ns
+        except OSError:
+            found = set()  # < Unreadable level, keep walking up
+        if found:
+            sentinel = next(s for s in sentinels if s in found)
+            return directory, sentinel, mtimes
+        parent = os.path.dirname(directory)
+        if parent == directory:
+            return None
+        directory = parent
+
+
+def locate_project_root(
+    start: Path | None = None,
+    sentinels: Sequence[str] = ROOT_SENTINELS,
+    *,
+    use_cache: bool = True,
+    environ: Mapping[str, str] | None = None,
+) -> ProjectRoot:
+    """Find the project root above *start* and the sentinel that marks it.
+
+    ``$PROJECT_ROOT`` wins if set. Otherwise each ancestor is listed once with
+    ``os.scandir`` (instead of one ``stat`` per sentinel and level), and the
+    result is cached on disk per start directory. A cached root is reused
+    while the mtimes of all directories visited by the lookup are unchanged,
+    which costs one ``stat`` per level.
+
+    :param start: Directory to start from; defaults to the cwd.
+    :param sentinels: Entry names that mark a project root, by priority.
+    :param use_cache: Whether to read and update the on-disk cache.
+    :param environ: Environment to read ``$PROJECT_ROOT`` from, e.g. a
+        client's; ``os.environ`` if None.
+    :return: Root directory and matched sentinel.
+    :raises ProjectRootNotFoundError: If no ancestor holds a sentinel.
+    """
+    env_root = (os.environ if environ is None else environ).get("PROJECT_ROOT")
+    if env_root:
+        return ProjectRoot(Path(env_root).resolve(), "$PROJECT_ROOT")  # !! Early exit
+
+    # > Symlinks resolved, like Path.resolve(), so roots are canonical paths
+    here = os.path.realpath(start if start is not None else os.getcwd())
+    key = f"{here}\0{':'.join(sentinels)}"
+    if use_cache:
+        with _root_cache_lock:
+            entry = _load_root_cache().get(key)
+        if entry is not None and _mtimes_match(entry["mtimes"]):
+            return ProjectRoot(Path(entry["root"]), entry["sentinel"])
+
+    found = _scan_for_root(here, sentinels)
+    if found is None:
+        raise ProjectRootNotFoundError(
+            f"Not inside a project; looked for {tuple(sentinels)} starting at {here}"
+        )
+    root, sentinel, mtimes = found
+    if use_cache and max(mtimes.values()) < time.time_ns() - _RACY_NS:
+        _store_root_cache(key, {"root": root, "sentinel": sentinel, "mtimes": mtimes})
+    return ProjectRoot(Path(root), sentinel)
+
+
 def find_project_root(
     start: Path | None = None,
-    sentinels: Sequence[str] = (".git", "pyproject.toml", "setup.py"),
+    sentinels: Sequence[str] = ROOT_SENTINELS,
+    environ: Mapping[str, str] | None = None,
 ) -> Path:
     """
-    Returns environment variable "PROJECT_ROOT". Otherwise, falls back
-    to Walk upward from *start* (or cwd) until we find a sentinel that
-    marks the project root. Raises RuntimeError if none found.
+    Returns environment variable "PROJECT_ROOT" (of *environ*, if given).
+    Otherwise, falls back to Walk upward from *start* (or cwd) until we find
+    a sentinel that marks the project root. Raises ProjectRootNotFoundError
+    (a RuntimeError) if none found. See ``locate_project_root`` for the
+    matched sentinel.
     """
-    env_root = os.getenv("PROJECT_ROOT")
-    if env_root:
-        return Path(env_root).resolve()  # !! Early exit
-
-    here = (start or Path.cwd()).resolve()
-    for candidate in [here, *here.parents]:
-        if any((candidate / s).exists() for s in sentinels):
-            return candidate  # < Found!
-    raise RuntimeError(
-        f"Not inside a project; looked for {sentinels} starting at {here}"
-    )
+    return locate_project_root(start, sentinels, environ=environ).path
 
 
 if __name__ == "__main__":
@@ -120,12 +448,88 @@ if __name__ == "__main__":
 # =====================================================================
 
 
-def copy_templates(transfers: dict[str, Path], tmpl_dir: Path) -> None:
-    """Copy template files to the project root"""
-    for tmpl_fn, dst_fp in transfers.items():
-        tmpl_fp = tmpl_dir / tmpl_fn
-        shutil.copy2(tmpl_fp, dst_fp, follow_symlinks=False)
-    print(f"✓  Templates copied from {tmpl_dir}")
+class RenderResult(NamedTuple):
+    """Outcome of rendering one template."""
+
+    hits: Counter[str]  # < Placeholder hit counts
+    sha256: str  # < Hash of the written content
+    size: int  # < Bytes written
+
+
+def render_template(
+    tmpl_fp: Path, dst_fp: Path, engine: "PlaceholderEngine"
+) -> RenderResult:
+    """Render one template to its destination with a single read and write.
+
+    Templates with placeholder hits are substituted in memory; binary and
+    placeholder-free templates are written back verbatim from the bytes
+    already read. The file mode of the template is kept in both cases.
+
+    :param tmpl_fp: Template source file.
+    :param dst_fp: Destination file.
+    :param engine: Compiled placeholder engine.
+    :return: Hit counts, content hash and size of the written file.
+    """
+    data = tmpl_fp.read_bytes()
+    hits: Counter[str] = Counter()
+    try:
+        rendered, hits = engine.render(data.decode("utf-8"))
+    except UnicodeDecodeError:
+        pass  # < Binary templates are copied verbatim
+    if hits:
+        data = rendered.encode("utf-8")
+    dst_fp.write_bytes(data)
+    shutil.copymode(tmpl_fp, dst_fp)
+    return RenderResult(hits, hashlib.sha256(data).hexdigest(), len(data))
+
+
+def render_templates(
+    transfers: dict[str, Path],
+    tmpl_dir: Path,
+    placeholders: "dict[str, str] | PlaceholderEngine",
+    jobs: int = 1,
+) -> dict[Path, RenderResult]:
+    """Render template files into place, substituting placeholders on the way.
+
+    :param transfers: ``{<template_filename>: <destination_filepath>}``.
+    :param tmpl_dir: Directory containing the template files.
+    :param placeholders: Replacement mapping or an already compiled engine.
+    :param jobs: Maximum number of worker threads.
+    :return: Render result per destination file.
+    :raises ScaffoldError: If any template could not be rendered.
+    """
+    engine = (
+        placeholders
+        if isinstance(placeholders, PlaceholderEngine)
+        else PlaceholderEngine(placeholders)
+    )
+    results = run_parallel(
+        {
+            dst_fp: functools.partial(
+                render_template, tmpl_dir / tmpl_fn, dst_fp, engine
+            )
+            for tmpl_fn, dst_fp in transfers.items()
+        },
+        jobs=jobs,
+    )
+    return results
+
+
+def create_directories(directories: Iterable[Path], jobs: int = 1) -> None:
+    """Create directories (with parents), on *jobs* threads.
+
+    :param directories: Directories to create. Existing ones are kept.
+    :param jobs: Maximum number of worker threads.
+    :return: None.
+    :raises ScaffoldError: If any directory could not be created.
+    """
+    run_parallel(
+        {
+            directory: functools.partial(directory.mkdir, parents=True, exist_ok=True)
+            for directory in directories
+        },
+        jobs=jobs,
+    )
 
 
 # %%
@@ -138,6 +542,112 @@ def warn_dir_overwrite(dir: Path) -> None:
             sys.exit("Aborted by user")
 
 
+def warn_dirs_overwrite(dirs: Iterable[Path]) -> None:
+    """Ask once before a batch run overwrites existing directories"""
+    existing = [dir for dir in dirs if dir.exists()]
+    if not existing:
+        return
+    listing = "\n".join(f"    {dir}" for dir in existing)
+    _m = f"⚠️  {len(existing)} directories exist and files may be overwritten:\n"
+    answer = input(f"{_m}{listing}\nContinue? [y/N] ").lower()
+    if answer not in {"y", "yes"}:
+        sys.exit("Aborted by user")
+
+
+# %%
+# =====================================================================
+# === Staging
+# =====================================================================
+
+
+def _fsync_path(path: Path) -> None:
+    """Flush one file or directory to stable storage."""
+    if path.is_dir() and os.name != "posix":
+        return  # < Directories cannot be opened for fsync on Windows
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _publish_staged(staging_dir: Path, final_dir: Path) -> list[Path]:
+    """Move a staged tree to its final location.
+
+    :param staging_dir: Fully written staging directory.
+    :param final_dir: Destination directory.
+    :return: Directories whose entries changed, for a later fsync.
+    """
+    if not final_dir.exists():
+        os.rename(staging_dir, final_dir)  # < One atomic step
+        return [final_dir.parent]
+
+    # > The user agreed to overwrite: merge file by file, each replace is atomic
+    touched: list[Path] = []
+    for dirpath, _dirnames, filenames in os.walk(staging_dir):
+        target_dir = final_dir / Path(dirpath).relative_to(staging_dir)
+        target_dir.mkdir(exist_ok=True)
+        touched.append(target_dir)
+        for filename in filenames:
+            os.replace(Path(dirpath) / filename, target_dir / filename)
+    return touched
+
+
+@contextlib.contextmanager
+def staged_directory(
+    final_dir: Path, *, durable: bool = False, jobs: int = 1
+) -> Iterator[Path]:
+    """Build a directory tree next to *final_dir* and publish it in one step.
+
+    The caller writes into the yielded sibling staging directory. On success a
+    new *final_dir* appears with a single ``rename``, so other processes see
+    either no directory or a complete one. An existing *final_dir* is merged
+    with per-file ``os.replace``. On any error, including Ctrl-C, the staging
+    directory is removed and *final_dir* is left as it was.
+
+    :param final_dir: Directory to publish.
+    :param durable: If True, fsync the whole staged batch once before
+        publishing, instead of paying an fsync per written file.
+    :param jobs: Maximum number of worker threads for the fsync pass.
+    :return: Context manager yielding the staging directory.
+    """
+    final_dir.parent.mkdir(parents=True, exist_ok=True)
+    while True:
+        staging_dir = (
+            final_dir.parent / f".{final_dir.name}.{secrets.token_hex(4)}.bube-staging"
+        )
+        try:
+            staging_dir.mkdir()  # < Unlike mkdtemp, respects the umask
+            break
+        except FileExistsError:
+            continue
+
+    try:
+        yield staging_dir
+        if durable:
+            staged = [staging_dir] + [
+                Path(root) / name
+                for root, dirs, files in os.walk(staging_dir)
+                for name in (*files, *dirs)
+            ]
+            run_parallel(
+                {path: functools.partial(_fsync_path, path) for path in staged},
+                jobs=jobs,
+            )
+        touched = _publish_staged(staging_dir, final_dir)
+        if durable:
+            for directory in touched:
+                _fsync_path(directory)
+    finally:
+        shutil.rmtree(staging_dir, ignore_errors=True)
+
+
+def sha256_file(path: Path) -> str:
+    """Return the hex SHA-256 of a file's content."""
+    with open(path, "rb") as fh:
+        return hashlib.file_digest(fh, "sha256").hexdigest()
+
+
 # %%
 # =====================================================================
 # === Create __init__.py
@@ -261,18 +771,79 @@ def create_init_dot_py(
 # =====================================================================
 
 
+@functools.cache
+def _placeholder_pattern(keys: tuple[str, ...]) -> re.Pattern[str]:
+    """Compile one alternation that matches every placeholder key.
+
+    Longer keys come first, so overlapping keys resolve to the longest match.
+    The pattern only depends on the keys, so it is shared between invocations
+    that substitute different values.
+
+    :param keys: Placeholder keys, sorted for a stable cache key.
+    :return: Compiled matcher for all keys.
+    """
+    if not keys:
+        return re.compile(r"(?!x)x")  # < Never matches
+    ordered = sorted(keys, key=len, reverse=True)
+    return re.compile("|".join(re.escape(key) for key in ordered))
+
+
+class PlaceholderEngine:
+    """Single-pass placeholder substitution compiled from a replacement mapping.
+
+    Every file is rewritten in one scan, no matter how many placeholders are
+    defined. Build one engine and reuse it for all files of a scaffold.
+    """
+
+    def __init__(self, placeholders: dict[str, str]) -> None:
+        self.placeholders = dict(placeholders)
+        self.pattern = _placeholder_pattern(tuple(sorted(self.placeholders)))
+
+    def render(self, text: str) -> tuple[str, Counter[str]]:
+        """Substitute all placeholders in *text* in one pass.
+
+        :param text: Template text.
+        :return: Rendered text and the hit count of each placeholder found.
+        """
+        hits: Counter[str] = Counter()
+
+        def _replace(match: re.Match[str]) -> str:
+            key = match.group(0)
+            hits[key] += 1
+            return self.placeholders[key]
+
+        return self.pattern.sub(_replace, text), hits
+
+
 def substitute_placeholders(
-    filepaths: list[Path], placeholders: dict[str, str]
-) -> None:
-    """Substitute placeholders in a string"""
+    filepaths: list[Path], placeholders: dict[str, str] | PlaceholderEngine
+) -> dict[Path, Counter[str]]:
+    """Substitute placeholders in files, rewriting only files with hits.
+
+    :param filepaths: Files to rewrite in place.
+    :param placeholders: Replacement mapping or an already compiled engine.
+    :return: Placeholder hit counts per file.
+    """
+    engine = (
+        placeholders
+        if isinstance(placeholders, PlaceholderEngine)
+        else PlaceholderEngine(placeholders)
+    )
+    hits_per_file: dict[Path, Counter[str]] = {}
     for fp in filepaths:
-        fp: Path
         text = fp.read_text(encoding="utf-8")
-        for old, new in placeholders.items():
-            text = text.replace(old, new)
-        fp.write_text(text, encoding="utf-8")
-        # > Pathlib closes the file automatically
-    print(f"✓  Placeholders substituted: {list(placeholders.keys())}")
+        rendered, hits = engine.render(text)
+        if hits:  # < Untouched files are not written back
+            fp.write_text(rendered, encoding="utf-8")
+        hits_per_file[fp] = hits
+    total = sum(sum(hits.values()) for hits in hits_per_file.values())
+    print(f"✓  Placeholders substituted: {total} hits in {len(filepaths)} files")
+    return hits_per_file
+
+
+if __name__ == "__main__":
+    _engine = PlaceholderEngine({"<my_project>": "demo", "{my_project}": "demo"})
+    print(_engine.render("import <my_project>  # {my_project}"))
 
 
 # %%
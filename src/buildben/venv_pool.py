@@ -0,0 +1,333 @@
+"""Pool of restored snapshot venvs, shared by experiments with the same lock.
+
+Venvs live at ``<project_root>/.buildben/venv-pool/<key>``, keyed by the
+digest of ``requirements.lock``, the digests of the project wheels and the
+requested Python. ``env-restore`` links an experiment's ``.venv`` to a
+matching pooled venv (or clones it) instead of installing again, and
+``exp-run`` runs commands in it directly.
+
+``.buildben/venv-pool/pool.sqlite`` records each venv's size and last use.
+When the pool outgrows its quota, the least recently used venvs are removed;
+experiment ``.venv`` links to them dangle until the next ``env-restore``.
+
+Venvs are built next to the pool and renamed into place, one build per key
+at a time (``building``). ``exp-run`` and ``env-restore`` hold a venv
+shared (``in_use``) while they use it; eviction skips venvs held that way.
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import datetime as dt
+import hashlib
+import os
+import shutil
+import sqlite3
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+
+from . import commands, utils
+
+try:
+    import fcntl
+except ImportError:  # < Windows
+    fcntl = None  # type: ignore[assignment]
+
+POOL_RELPATH = Path(".buildben") / "venv-pool"
+QUOTA_ENV = "BUILDBEN_VENV_POOL_QUOTA"
+DEFAULT_QUOTA = 20 * 1024**3
+_FICLONE = 0x40049409  # < Linux ioctl sharing another file's extents (reflink)
+
+
+def default_quota() -> int:
+    """Return the pool quota from ``$BUILDBEN_VENV_POOL_QUOTA`` or 20 GiB.
+
+    :return: Quota in bytes.
+    :raises utils.RestoreError: If the environment variable is malformed.
+    """
+    raw = os.environ.get(QUOTA_ENV)
+    if not raw:
+        return DEFAULT_QUOTA
+    try:
+        return commands.size_bytes(raw)
+    except argparse.ArgumentTypeError as exc:
+        raise utils.RestoreError(f"${QUOTA_ENV}: {exc}") from exc
+
+
+def pool_key(lock_path: Path, wheels: Iterable[Path], python: str | None) -> str:
+    """Return the pool key of a snapshot environment.
+
+    :param lock_path: The snapshot's ``requirements.lock``.
+    :param wheels: Project wheels installed on top of the lock.
+    :param python: Requested Python version or interpreter, if any.
+    :return: Hex digest.
+    """
+    key_parts = [f"lock={utils.sha256_file(lock_path)}"]
+    key_parts += sorted(f"wheel={utils.sha256_file(wheel)}" for wheel in wheels)
+    key_parts.append(f"python={python or ''}")
+    return hashlib.sha256("\0".join(key_parts).encode("utf-8")).hexdigest()
+
+
+def venv_path(project_root: Path, key: str) -> Path:
+    """Return the location of a pooled venv.
+
+    :param project_root: Project root directory.
+    :param key: Pool key, see ``pool_key``.
+    :return: Path of ``.buildben/venv-pool/<key>``.
+    """
+    return project_root / POOL_RELPATH / key
+
+
+def staging_path(project_root: Path, key: str) -> Path:
+    """Return where a pooled venv is built before ``add`` moves it in place.
+
+    :param project_root: Project root directory.
+    :param key: Pool key, see ``pool_key``.
+    :return: Path of ``.buildben/venv-pool/.<key>.tmp``.
+    """
+    return project_root / POOL_RELPATH / f".{key}.tmp"
+
+
+@contextlib.contextmanager
+def _locked(path: Path, exclusive: bool, blocking: bool = True) -> Iterator[bool]:
+    """Hold an ``flock`` on *path* for the duration of the block.
+
+    :param path: Lock file; created if needed.
+    :param exclusive: Whether to exclude all other holders.
+    :param blocking: Whether to wait for other holders.
+    :return: Context manager yielding whether the lock is held; always True
+        without ``fcntl`` (Windows), where nothing is locked.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "ab") as lock_file:
+        if fcntl is not None:
+            operation = fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH
+            try:
+                fcntl.flock(lock_file, operation | (0 if blocking else fcntl.LOCK_NB))
+            except BlockingIOError:
+                yield False
+                return
+        yield True  # < Closing the file releases the lock
+
+
+def building(project_root: Path, key: str) -> contextlib.AbstractContextManager:
+    """Serialize lookups and builds of one pool key.
+
+    :param project_root: Project root directory.
+    :param key: Pool key, see ``pool_key``.
+    :return: Context manager holding the key's build lock exclusively.
+    """
+    return _locked(project_root / POOL_RELPATH / f".{key}.build", exclusive=True)
+
+
+def in_use(project_root: Path, key: str) -> contextlib.AbstractContextManager:
+    """Keep a pooled venv from being evicted while the block runs.
+
+    :param project_root: Project root directory.
+    :param key: Pool key, see ``pool_key``.
+    :return: Context manager holding the key's use lock shared.
+    """
+    return _locked(project_root / POOL_RELPATH / f".{key}.lock", exclusive=False)
+
+
+def _connect(project_root: Path) -> sqlite3.Connection:
+    """Open the pool table, creating it if needed."""
+    pool_dir = project_root / POOL_RELPATH
+    pool_dir.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(pool_dir / "pool.sqlite", timeout=10)
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS venvs (key TEXT PRIMARY KEY, size INTEGER NOT "
+        "NULL, created TEXT NOT NULL, last_used TEXT NOT NULL)"
+    )
+    return conn
+
+
+def _now() -> str:
+    return dt.datetime.now().isoformat(timespec="microseconds")
+
+
+def lookup(project_root: Path, key: str) -> Path | None:
+    """Return a pooled venv and mark it as used.
+
+    :param project_root: Project root directory.
+    :param key: Pool key, see ``pool_key``.
+    :return: The venv directory, or None if it is not pooled.
+    """
+    conn = _connect(project_root)
+    try:
+        with conn:
+            found = conn.execute(
+                "UPDATE venvs SET last_used = ? WHERE key = ?", (_now(), key)
+            ).rowcount
+    finally:
+        conn.close()
+    venv = venv_path(project_root, key)
+    return venv if found and venv.is_dir() else None
+
+
+def venv_size(venv: Path) -> int:
+    """Return the size of a venv's files, counting hardlinked files once.
+
+    :param venv: Virtual environment directory.
+    :return: Size in bytes.
+    """
+    seen: set[tuple[int, int]] = set()
+    size = 0
+    for dirpath, _dirnames, filenames in os.walk(venv):
+        for name in filenames:
+            stat = os.lstat(os.path.join(dirpath, name))
+            if (stat.st_dev, stat.st_ino) not in seen:
+                seen.add((stat.st_dev, stat.st_ino))
+                size += stat.st_size
+    return size
+
+
+def add(project_root: Path, key: str, staging: Path) -> Path:
+    """Move a venv built at *staging* into the pool and record it.
+
+    Call it while holding ``building`` for *key*.
+
+    :param project_root: Project root directory.
+    :param key: Pool key, see ``pool_key``.
+    :param staging: Built venv, usually ``staging_path(project_root, key)``.
+    :return: The pooled venv, ``venv_path(project_root, key)``.
+    """
+    venv = venv_path(project_root, key)
+    _relocate(staging, staging, venv)
+    shutil.rmtree(venv, ignore_errors=True)  # < Left without a record, e.g. by a crash
+    os.rename(staging, venv)
+    size = venv_size(venv)
+    now = _now()
+    conn = _connect(project_root)
+    try:
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO venvs (key, size, created, last_used) "
+                "VALUES (?, ?, ?, ?)",
+                (key, size, now, now),
+            )
+    finally:
+        conn.close()
+    return venv
+
+
+def evict(project_root: Path, quota: int, keep: Iterable[str] = ()) -> tuple[int, int]:
+    """Remove least recently used venvs until the pool fits its quota.
+
+    Venvs held by ``in_use`` are skipped.
+
+    :param project_root: Project root directory.
+    :param quota: Maximum total size in bytes.
+    :param keep: Keys never to evict, e.g. the venv about to be used.
+    :return: Number of removed venvs and their total size.
+    """
+    keep = set(keep)
+    with contextlib.ExitStack() as held:
+        conn = _connect(project_root)
+        try:
+            rows = conn.execute(
+                "SELECT key, size FROM venvs ORDER BY last_used, key"
+            ).fetchall()
+            total = sum(size for _key, size in rows)
+            evicted = []
+            for key, size in rows:
+                if total <= quota:
+                    break
+                if key in keep:
+                    continue
+                lock_path = project_root / POOL_RELPATH / f".{key}.lock"
+                if held.enter_context(_locked(lock_path, True, blocking=False)):
+                    evicted.append((key, size))
+                    total -= size
+            with conn:
+                conn.executemany(
+                    "DELETE FROM venvs WHERE key = ?",
+                    [(key,) for key, _size in evicted],
+                )
+        finally:
+            conn.close()
+        for key, _size in evicted:
+            shutil.rmtree(venv_path(project_root, key), ignore_errors=True)
+    return len(evicted), sum(size for _key, size in evicted)
+
+
+# ================================================================== #
+# === Cloning                                                        #
+# ================================================================== #
+
+
+def _reflink(src_fd: int, dst_fd: int) -> bool:
+    """Share the blocks of one open file with another, if the OS can."""
+    if fcntl is None:
+        return False
+    try:
+        fcntl.ioctl(dst_fd, _FICLONE, src_fd)
+    except OSError:  # < Not Linux, or the filesystem has no reflinks
+        return False
+    return True
+
+
+def _clone_file(source: Path, target: Path) -> None:
+    """Copy a file, sharing its blocks (reflink) where the filesystem can."""
+    with open(source, "rb") as src, open(target, "wb") as dst:
+        if not _reflink(src.fileno(), dst.fileno()):
+            shutil.copyfileobj(src, dst, 1024 * 1024)
+    shutil.copystat(source, target)
+
+
+def _relocate(venv: Path, old: Path, new: Path) -> None:
+    """Rewrite the paths in a venv that name *old* to name *new* instead.
+
+    Symlinks and scripts (shebangs, ``activate``) are rewritten; the venv
+    itself is not moved.
+
+    :param venv: Virtual environment directory.
+    :param old: Location the venv was created at.
+    :param new: Location it is moved or copied to.
+    :return: None.
+    """
+    old_prefix, new_prefix = os.fsencode(old), os.fsencode(new)
+    for dirpath, dirnames, filenames in os.walk(venv):
+        for name in (*dirnames, *filenames):
+            path = Path(dirpath) / name
+            if path.is_symlink():
+                link = os.fsencode(os.readlink(path))
+                if link.startswith(old_prefix):
+                    path.unlink()
+                    os.symlink(os.fsdecode(new_prefix + link[len(old_prefix) :]), path)
+
+    scripts_dir = venv / ("Scripts" if os.name == "nt" else "bin")
+    for script in scripts_dir.iterdir():
+        if script.is_symlink() or not script.is_file():
+            continue
+        content = script.read_bytes()
+        if old_prefix in content:
+            tmp_path = script.with_name(f".{script.name}.tmp")
+            tmp_path.write_bytes(content.replace(old_prefix, new_prefix))
+            shutil.copystat(script, tmp_path)
+            os.replace(tmp_path, script)
+
+
+def clone_venv(source: Path, target: Path) -> None:
+    """Clone a venv copy-on-write and relocate its scripts to *target*.
+
+    Files are reflinked where supported (btrfs, XFS, ...) and copied
+    otherwise. Scripts naming the source venv (shebangs, ``activate``) are
+    rewritten to name the clone.
+
+    :param source: Pooled venv.
+    :param target: New venv directory; must not exist.
+    :return: None.
+    """
+    target.mkdir(parents=True)
+    for dirpath, dirnames, filenames in os.walk(source):
+        relative = Path(dirpath).relative_to(source)
+        (target / relative).mkdir(exist_ok=True)
+        for name in (*dirnames, *filenames):
+            path = Path(dirpath) / name
+            if path.is_symlink():
+                os.symlink(os.readlink(path), target / relative / name)
+            elif name in filenames:
+                _clone_file(path, target / relative / name)
+    _relocate(target, source, target)
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+buildben.verify – report drift between a project and its scaffold manifest.
+
+Only files whose size is unchanged but whose mtime moved are hashed.
+``--refresh`` records the new mtimes of files whose content still matches,
+so the next run skips hashing them.
+
+Usage from CLI aggregator:
+    bube verify [--refresh] [-j N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import functools
+import sys
+from pathlib import Path
+
+from . import commands, manifest, utils
+
+_COMMAND = commands.COMMANDS["verify"]  # < Arguments are declared statically
+CMD_NAME = _COMMAND.name  # < Name of the CLI-command
+CMD_ALIASES = list(_COMMAND.aliases)  # < Alias shortcut of the CLI-command
+DOC = _COMMAND.doc
+
+
+def _add_my_parser(subparsers: argparse._SubParsersAction) -> None:
+    """Attach the verify sub-parser to a parser (e.g. when run as a script).
+
+    :param subparsers: Parent argparse subparser registry.
+    :return: None.
+    """
+    p = commands.add_parser(subparsers, _COMMAND)
+    p.set_defaults(func=_run)
+
+
+def _check_files(
+    project_root: Path, files: dict[str, dict], jobs: int
+) -> tuple[list[str], list[str], list[str]]:
+    """Compare generated files against their manifest entries.
+
+    Stat metadata is checked first. Only files with the recorded size but a
+    different mtime are hashed, in parallel.
+
+    :param project_root: Project root the manifest paths are relative to.
+    :param files: Manifest file entries.
+    :param jobs: Maximum number of hashing threads.
+    :return: Missing, modified, and touched (same content, new mtime) paths.
+    """
+    missing: list[str] = []
+    modified: list[str] = []
+    to_hash: dict[Path, str] = {}
+    for relative, entry in files.items():
+        path = project_root / relative
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            missing.append(relative)
+            continue
+        if stat.st_size != entry.get("size", stat.st_size):
+            modified.append(relative)  # < A size change needs no hash
+        elif stat.st_mtime_ns != entry.get("mtime_ns"):
+            to_hash[path] = relative
+
+    digests = utils.run_parallel(
+        {path: functools.partial(utils.sha256_file, path) for path in to_hash},
+        jobs=jobs,
+    )
+    touched: list[str] = []
+    for path, relative in to_hash.items():
+        if digests[path] == files[relative]["sha256"]:
+            touched.append(relative)
+        else:
+            modified.append(relative)
+    return sorted(missing), sorted(modified), sorted(touched)
+
+
+def _run(args: argparse.Namespace) -> None:
+    """Report drift between a project and its scaffold manifest.
+
+    :param args: Parsed CLI arguments.
+    :return: None.
+    :raises SystemExit: With status 1 if any file is missing or modified.
+    """
+    project_root = utils.find_project_root()
+    scaffold_manifest = manifest.load_manifest(project_root)
+    if scaffold_manifest is None:
+        sys.exit(f"💥  {project_root} has no {manifest.MANIFEST_RELPATH}")
+
+    files = scaffold_manifest["files"]
+    try:
+        missing, modified, touched = _check_files(project_root, files, args.jobs)
+    except utils.ScaffoldError as exc:
+        sys.exit(f"💥  {exc}")
+
+    for relative in missing:
+        print(f"✗  missing:  {relative}")
+    for relative in modified:
+        print(f"✗  modified: {relative}")
+
+    if args.refresh and touched:
+        with manifest.locked(project_root):
+            # > Re-read, so entries written since the check are not reverted
+            fresh = manifest.load_manifest(project_root) or scaffold_manifest
+            for relative in touched:
+                entry = fresh["files"].get(relative)
+                if entry and entry["sha256"] == files[relative]["sha256"]:
+                    entry["mtime_ns"] = (project_root / relative).stat().st_mtime_ns
+            manifest.write_manifest(project_root, fresh)
+        print(f"🔄  Refreshed mtimes of {len(touched)} unchanged files")
+
+    matching = len(files) - len(missing) - len(modified)
+    print(f"✓  {matching}/{len(files)} generated files match the scaffold manifest")
+    if missing or modified:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    _parser = argparse.ArgumentParser()
+    _add_my_parser(_parser.add_subparsers(dest="cmd", required=True))
+    parsed_args = _parser.parse_args()
+    parsed_args.func(parsed_args)
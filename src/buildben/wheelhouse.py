@@ -0,0 +1,156 @@
+"""Rebuild wheel files from the unpacked wheels in uv's cache.
+
+uv keeps every wheel it installed unpacked below ``<uv cache>/archive-v0``
+(one directory per wheel, holding the package files and its ``.dist-info``).
+``env-snapshot --wheelhouse`` zips those directories back into wheels, so a
+snapshot can be reinstalled with ``uv pip install --offline --find-links``.
+
+Wheels are zipped deterministically (sorted entries, fixed timestamps,
+``RECORD`` last): the same cached wheel always yields the same bytes, so the
+artifact store keeps one copy however many snapshots include it. Their
+digests differ from the index's, which is why the wheelhouse carries its own
+hash-pinned ``requirements.txt`` and ``SHA256SUMS``.
+"""
+
+from __future__ import annotations
+
+import os
+import zipfile
+from pathlib import Path
+from typing import NamedTuple
+
+from .lock_diff import Pin, normalize_name
+
+WHEELHOUSE_DIRNAME = "_wheelhouse"
+REQUIREMENTS_NAME = "requirements.txt"
+SHA256SUMS_NAME = "SHA256SUMS"
+_UV_ARCHIVE_BUCKET = "archive-v0"  # < Unpacked wheels, one directory each
+_ZIP_EPOCH = (1980, 1, 1, 0, 0, 0)
+
+
+class CachedWheel(NamedTuple):
+    """One unpacked wheel in the uv cache."""
+
+    root: Path  # < Directory holding the package files and the dist-info
+    dist_info: str  # < e.g. ``typing_extensions-4.12.2.dist-info``
+    filename: str  # < Wheel file name reconstructed from the dist-info
+
+
+def _wheel_filename(root: Path, dist_info: str) -> str | None:
+    """Reconstruct the wheel file name from a dist-info's ``WHEEL`` file."""
+    try:
+        lines = (root / dist_info / "WHEEL").read_text(encoding="utf-8").splitlines()
+    except (FileNotFoundError, NotADirectoryError, UnicodeDecodeError):
+        return None
+    pythons: dict[str, None] = {}
+    abis: dict[str, None] = {}
+    platforms: dict[str, None] = {}
+    build = None
+    for line in lines:
+        key, _, value = line.partition(":")
+        if key.strip() == "Tag":
+            python, abi, platform = value.strip().split("-", 2)
+            pythons[python], abis[abi], platforms[platform] = None, None, None
+        elif key.strip() == "Build":
+            build = value.strip()
+    if not pythons:
+        return None
+    stem = dist_info[: -len(".dist-info")]
+    tag = "-".join(".".join(part) for part in (pythons, abis, platforms))
+    return f"{stem}-{build}-{tag}.whl" if build else f"{stem}-{tag}.whl"
+
+
+def find_cached_wheels(cache_dir: Path) -> dict[tuple[str, str], list[CachedWheel]]:
+    """Index the unpacked wheels of a uv cache by name and version.
+
+    :param cache_dir: uv cache directory, as printed by ``uv cache dir``.
+    :return: Cached wheels by ``(<normalized name>, <version>)``; one
+        version may have wheels for several platforms.
+    """
+    wheels: dict[tuple[str, str], list[CachedWheel]] = {}
+    try:
+        archives = os.scandir(cache_dir / _UV_ARCHIVE_BUCKET)
+    except FileNotFoundError:
+        return wheels
+    with archives:
+        for archive in archives:
+            if not archive.is_dir():
+                continue
+            root = Path(archive.path)
+            with os.scandir(root) as entries:
+                dist_infos = [
+                    entry.name for entry in entries if entry.name.endswith(".dist-info")
+                ]
+            for dist_info in dist_infos:
+                filename = _wheel_filename(root, dist_info)
+                if filename is None:
+                    continue
+                name, _, version = dist_info[: -len(".dist-info")].partition("-")
+                key = (normalize_name(name), version)
+                known = {wheel.filename for wheel in wheels.get(key, [])}
+                if filename not in known:  # < The same wheel unpacked twice
+                    wheels.setdefault(key, []).append(
+                        CachedWheel(root, dist_info, filename)
+                    )
+    return wheels
+
+
+def pack_wheel(wheel: CachedWheel, out_dir: Path) -> Path:
+    """Zip an unpacked wheel back into a wheel file.
+
+    :param wheel: Cached wheel, see ``find_cached_wheels``.
+    :param out_dir: Directory to write the wheel into.
+    :return: Path of the written wheel.
+    """
+    record = f"{wheel.dist_info}/RECORD"
+    members = sorted(
+        (path.relative_to(wheel.root).as_posix(), path)
+        for path in wheel.root.rglob("*")
+        if path.is_file()
+    )
+    members.sort(key=lambda member: member[0] == record)  # < RECORD goes last
+    target = out_dir / wheel.filename
+    with zipfile.ZipFile(target, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for arcname, path in members:
+            info = zipfile.ZipInfo(arcname, date_time=_ZIP_EPOCH)
+            mode = 0o755 if os.access(path, os.X_OK) else 0o644
+            info.external_attr = (0o100000 | mode) << 16
+            info.compress_type = zipfile.ZIP_DEFLATED
+            archive.writestr(info, path.read_bytes())
+    return target
+
+
+def requirements_text(
+    pins: list[Pin], digests: dict[tuple[str, str], list[str]]
+) -> str:
+    """Render hash-pinned requirements for the wheels of a wheelhouse.
+
+    :param pins: Pins that have wheels, in lock order.
+    :param digests: SHA-256 digests of each pin's wheels by
+        ``(<normalized name>, <version>)``.
+    :return: Content of the wheelhouse's ``requirements.txt``.
+    """
+    lines = [
+        "# Install offline, from the experiment directory, with:",
+        (
+            f"#   uv pip install --offline --find-links {WHEELHOUSE_DIRNAME} "
+            f"-r {WHEELHOUSE_DIRNAME}/{REQUIREMENTS_NAME}"
+        ),
+    ]
+    for pin in pins:
+        marker = f" ; {pin.marker}" if pin.marker else ""
+        hashes = "".join(
+            f" \\\n    --hash=sha256:{digest}"
+            for digest in sorted(digests[pin.name, pin.version])
+        )
+        lines.append(f"{pin.name}=={pin.version}{marker}{hashes}")
+    return "\n".join(lines) + "\n"
+
+
+def sha256sums_text(files: dict[str, str]) -> str:
+    """Render a ``sha256sum -c`` manifest.
+
+    :param files: SHA-256 digests by file name.
+    :return: One ``<digest>  <name>`` line per file, sorted by name.
+    """
+    return "".join(f"{digest}  {name}\n" for name, digest in sorted(files.items()))
@@ -0,0 +1,105 @@
+"""Tests for the in-process buildben.api."""
+
+from __future__ import annotations
+
+import json
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from buildben import api
+
+
+def test_scaffold_project_returns_generated_paths(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    """Assert the API scaffolds silently and reports what it wrote."""
+    result = api.scaffold_project("demo_api", tmp_path, jobs=2)
+
+    assert result.root == tmp_path / "demo_api"
+    assert result.root / "pyproject.toml" in result.paths
+    assert all(path.is_file() for path in result.paths)
+    assert result.bytes_written == sum(p.stat().st_size for p in result.paths)
+    assert result.seconds > 0
+    assert capsys.readouterr().out == ""
+
+    with pytest.raises(api.TargetExistsError):
+        api.scaffold_project("demo_api", tmp_path)
+    with pytest.raises(api.InvalidNameError):
+        api.scaffold_project("not-a-name", tmp_path)
+
+
+def test_add_experiment_creates_matrix_runs(tmp_path: Path) -> None:
+    """Assert experiments are created from in-memory parameter sets."""
+    project = api.scaffold_project("demo_api", tmp_path)
+
+    result = api.add_experiment(
+        "sweep", project_root=project.root, matrix=[{"lr": 0.1}, {"lr": 0.01}]
+    )
+
+    assert [root.name[-3:] for root in result.roots] == ["000", "001"]
+    params = json.loads((result.roots[1] / "params.json").read_text("utf-8"))
+    assert params == {"lr": 0.01}
+    assert result.roots[0] / "run.py" in result.paths
+    with pytest.raises(api.TargetExistsError):
+        api.add_experiment("sweep", project_root=project.root, matrix=[{}, {}])
+
+    grid = tmp_path / "grid.toml"
+    grid.write_text('[grid]\nlr = "0.1"\n', encoding="utf-8")
+    with pytest.raises(api.ScaffoldError, match="lr must be a list"):
+        api.add_experiment("scalar", project_root=project.root, matrix=grid)
+    grid.write_text("[other]\nlr = 0.1\n", encoding="utf-8")
+    with pytest.raises(api.ScaffoldError, match="neither"):
+        api.add_experiment("empty", project_root=project.root, matrix=grid)
+    grid.write_text("[grid]\nlr = []\nseed = [1]\n", encoding="utf-8")
+    with pytest.raises(api.ScaffoldError, match="lr is empty"):
+        api.add_experiment("nogrid", project_root=project.root, matrix=grid)
+    grid.write_text('grid = "lr"\n', encoding="utf-8")
+    with pytest.raises(api.ScaffoldError, match="grid must be a table"):
+        api.add_experiment("flat", project_root=project.root, matrix=grid)
+    grid.write_text("runs = [1, 2]\n", encoding="utf-8")
+    with pytest.raises(api.ScaffoldError, match="array of tables"):
+        api.add_experiment("ints", project_root=project.root, matrix=grid)
+
+
+def test_concurrent_add_experiment_keeps_all_manifest_entries(
+    tmp_path: Path,
+) -> None:
+    """Assert parallel add-experim runs merge into the project manifest."""
+    project = api.scaffold_project("demo_api", tmp_path)
+    names = [f"exp{i}" for i in range(8)]
+
+    with ThreadPoolExecutor(max_workers=len(names)) as pool:
+        results = list(
+            pool.map(
+                lambda name: api.add_experiment(name, project_root=project.root),
+                names,
+            )
+        )
+
+    manifest_path = project.root / ".buildben" / "manifest.json"
+    files = json.loads(manifest_path.read_text("utf-8"))["files"]
+    for result in results:
+        (root,) = result.roots
+        assert f"experiments/{root.name}/run.py" in files
+
+
+def test_scaffold_project_wraps_git_failures(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Assert a missing git surfaces as ScaffoldError, not a raw OSError."""
+    monkeypatch.setenv("PATH", str(tmp_path / "no-bin"))
+
+    with pytest.raises(api.ScaffoldError, match="git"):
+        api.scaffold_project("demo_api", tmp_path, git_init=True)
+
+
+def test_snapshot_env_raises_instead_of_exiting(tmp_path: Path) -> None:
+    """Assert snapshot failures surface as SnapshotError, not SystemExit."""
+    project = api.scaffold_project("demo_api", tmp_path)
+
+    with pytest.raises(api.SnapshotError, match="inside the project root"):
+        api.snapshot_env(tmp_path, project_root=project.root)
+    with pytest.raises(api.SnapshotError, match="uv.lock"):
+        api.snapshot_env("experiments/x", project_root=project.root)
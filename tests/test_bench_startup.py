@@ -0,0 +1,52 @@
+"""Tests for the startup benchmark comparison in benchmarks/startup.py."""
+
+from __future__ import annotations
+
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+BENCH_PATH = Path(__file__).resolve().parents[1] / "benchmarks" / "startup.py"
+_spec = importlib.util.spec_from_file_location("bench_startup", BENCH_PATH)
+assert _spec is not None and _spec.loader is not None
+bench = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(bench)
+
+IMPORTTIME = """\
+import time: self [us] | cumulative | imported package
+import time:       100 |        100 |   _io
+import time:       200 |       1500 | argparse
+import time:       300 |        300 |   re
+import time:        50 |       2000 | buildben.cli
+"""
+
+
+def test_parse_importtime_sums_top_level_imports() -> None:
+    """Assert nested imports are listed but counted once via their parent."""
+    modules, total = bench.parse_importtime("noise\n" + IMPORTTIME)
+
+    assert modules == ["_io", "argparse", "buildben.cli", "re"]
+    assert total == 3500
+
+
+def test_compare_flags_slowdowns_and_new_imports() -> None:
+    """Assert regressions beyond the tolerance and new modules are reported."""
+    case = {"cold_ms": 100.0, "warm_ms": 50.0, "import_ms": 20.0, "modules": ["re"]}
+    baseline = {"python": bench._python_version(), "cases": {"help": case}}
+    current = {"help": {**case, "warm_ms": 80.0, "modules": ["re", "subprocess"]}}
+
+    regressions = bench.compare(current, baseline, tolerance=0.25, slack_ms=5.0)
+
+    assert len(regressions) == 2
+    assert regressions[0].startswith("help: warm_ms 80.0 > 67.5")
+    assert regressions[1] == "help: new imports subprocess"
+    assert not bench.compare({"help": case}, baseline, tolerance=0.25, slack_ms=5.0)
+
+
+def test_invoke_fails_on_unexpected_exit(tmp_path: Path) -> None:
+    """Assert a crashing command aborts the benchmark instead of being timed."""
+    with pytest.raises(SystemExit, match="exited 2"):
+        bench._invoke(["--no-such-flag"], cwd=tmp_path, pycache=tmp_path / "pyc")
+    with pytest.raises(SystemExit, match="expected 1"):
+        bench._invoke(["--help"], cwd=tmp_path, pycache=tmp_path, expect=(1, ""))
@@ -0,0 +1,51 @@
+"""Tests for the lazy buildben CLI registry."""
+
+from __future__ import annotations
+
+import importlib
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from buildben import commands
+
+SRC_DIR = Path(__file__).resolve().parents[1] / "src"
+
+
+def test_help_imports_no_command_module() -> None:
+    """Assert building the parser and printing help stays on the registry."""
+    code = (
+        "import sys\n"
+        "from buildben import cli\n"
+        "cli.build_parser().parse_args(['proj', '--help'])\n"
+    )
+    check = (
+        "import atexit, sys\n"
+        "atexit.register(lambda: print(sorted(m for m in sys.modules"
+        " if m.startswith('buildben') or m == 'subprocess'), file=sys.stderr))\n"
+    )
+    env = {**os.environ, "PYTHONPATH": str(SRC_DIR)}
+    result = subprocess.run(
+        [sys.executable, "-c", check + code],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=False,
+    )
+
+    assert "--from-spec" in result.stdout
+    assert result.stderr.strip() == "['buildben', 'buildben.cli', 'buildben.commands']"
+
+
+@pytest.mark.parametrize("command", commands.COMMANDS.values(), ids=str)
+def test_registry_matches_command_modules(command: commands.Command) -> None:
+    """Assert every registered command resolves to a module with a handler."""
+    module = importlib.import_module(command.module)
+
+    assert callable(module._run)
+    assert module.CMD_NAME == command.name
+    for alias in command.aliases:
+        assert commands.resolve(alias) is command
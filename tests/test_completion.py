@@ -0,0 +1,56 @@
+"""Tests for the static shell completion scripts."""
+
+from __future__ import annotations
+
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from buildben import api, cli, completion
+
+
+@pytest.mark.skipif(shutil.which("bash") is None, reason="needs bash")
+def test_bash_completion_reads_experiment_index(tmp_path: Path) -> None:
+    """Assert the bash script completes aliases, flags and indexed experiments."""
+    project = api.scaffold_project("demo_comp", tmp_path)
+    experiment = api.add_experiment("smoke", project_root=project.root)
+    script = tmp_path / "bube.bash"
+    script.write_text(completion.bash_script(cli.build_parser()), encoding="utf-8")
+
+    def _complete(*words: str) -> list[str]:
+        result = subprocess.run(
+            [
+                "bash",
+                "-c",
+                (
+                    f'source "{script}"; COMP_WORDS=(bube "$@"); '
+                    'COMP_CWORD=$#; _bube; printf "%s\\n" "${COMPREPLY[@]}"'
+                ),
+                "bash",
+                *words,
+            ],
+            cwd=project.root / "src",
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        return result.stdout.split()
+
+    assert _complete("sn") == ["snp"]
+    assert "--matrix" in _complete("exp", "--")
+    assert _complete("snp", "exp") == [f"experiments/{experiment.roots[0].name}"]
+
+
+def test_zsh_and_fish_scripts_list_aliases() -> None:
+    """Assert every command and alias appears in the zsh and fish scripts."""
+    parser = cli.build_parser()
+    zsh = completion.zsh_script(parser)
+    fish = completion.fish_script(parser)
+
+    for name in ("init-proj", "proj", "exp", "snp", "verify", "completion"):
+        assert f"'{name}:" in zsh
+        assert f"-a {name} " in fish
+    assert "_bube_experiments" in zsh
+    assert "(__bube_experiments)" in fish
@@ -0,0 +1,217 @@
+"""Tests for env-restore with a stubbed uv."""
+
+from __future__ import annotations
+
+import os
+import platform
+import sys
+from pathlib import Path
+
+import pytest
+
+from buildben import api, env_restore, exp_run, utils, venv_pool
+
+
+@pytest.fixture
+def snapshotted(tmp_path: Path) -> Path:
+    """Return a project with one snapshotted experiment, ``base``."""
+    (tmp_path / "pyproject.toml").write_text("[project]\nname = 'demo'\n")
+    experiment = tmp_path / "experiments" / "2026-10-01_base"
+    (experiment / "_setup").mkdir(parents=True)
+    (experiment / "_setup" / "requirements.lock").write_text("numpy==2.1\n")
+    (experiment / "_setup" / "demo-0.1-py3-none-any.whl").write_bytes(b"wheel")
+    (experiment / "experiment.env").write_text(
+        "COMMIT_HASH=abc1234\n"
+        "LOCK_FILE=experiments/2026-10-01_base/_setup/requirements.lock\n"
+    )
+    return tmp_path
+
+
+@pytest.fixture
+def fake_uv(monkeypatch: pytest.MonkeyPatch) -> list[list[str]]:
+    """Replace uv with a stub; ``uv venv`` links the running interpreter."""
+    calls: list[list[str]] = []
+    run_checked = utils.run_checked
+
+    async def fake_run_checked(command: list[str], **kwargs) -> str:
+        if command[0] != "uv":
+            return await run_checked(command, **kwargs)
+        calls.append(command)
+        if command[1] == "venv":
+            python = env_restore.venv_python(Path(command[2]))
+            python.parent.mkdir(parents=True)
+            os.symlink(sys.executable, python)
+        return ""
+
+    monkeypatch.setattr(utils, "run_checked", fake_run_checked)
+    return calls
+
+
+def test_restore_installs_lock_and_project_wheel(
+    snapshotted: Path, fake_uv: list[list[str]]
+) -> None:
+    """Assert a short name restores into EXPERIMENT/.venv with linked packages."""
+    experiment = snapshotted / "experiments" / "2026-10-01_base"
+    result = api.restore_env("base", project_root=snapshotted)
+
+    assert result.venv == experiment / ".venv"
+    assert result.python_version == platform.python_version()
+    assert not result.offline and not result.reused
+    venv, install, wheel = fake_uv
+    pooled = Path(os.readlink(result.venv))
+    assert pooled.parent == snapshotted / venv_pool.POOL_RELPATH
+    staging = venv_pool.staging_path(snapshotted, pooled.name)
+    assert venv[:3] == ["uv", "venv", str(staging)]  # < Renamed into place after
+    assert install[install.index("--link-mode") + 1] == env_restore.DEFAULT_LINK_MODE
+    assert install[-2:] == ["-r", str(experiment / "_setup" / "requirements.lock")]
+    project_wheel = experiment / "_setup" / "demo-0.1-py3-none-any.whl"
+    assert wheel[-2:] == ["--no-deps", str(project_wheel)]
+
+    with pytest.raises(api.RestoreError, match="--force"):
+        api.restore_env("base", project_root=snapshotted)
+    result = api.restore_env(
+        "base", project_root=snapshotted, force=True, pool=False, link_mode="copy"
+    )
+    assert not result.venv.is_symlink()
+    assert fake_uv[-3][:3] == ["uv", "venv", str(result.venv)]
+    assert "copy" in fake_uv[-2]
+
+
+def test_restore_prefers_wheelhouse_offline(
+    snapshotted: Path, fake_uv: list[list[str]]
+) -> None:
+    """Assert a recorded wheelhouse is installed from offline."""
+    experiment = snapshotted / "experiments" / "2026-10-01_base"
+    wheelhouse_dir = experiment / "_wheelhouse"
+    wheelhouse_dir.mkdir()
+    (wheelhouse_dir / "requirements.txt").write_text("numpy==2.1\n")
+    with (experiment / "experiment.env").open("a") as env:
+        env.write("WHEELHOUSE=experiments/2026-10-01_base/_wheelhouse\n")
+
+    result = api.restore_env(
+        "experiments/2026-10-01_base",
+        project_root=snapshotted,
+        venv=snapshotted / "venvs" / "base",
+    )
+
+    assert result.offline
+    assert result.python == env_restore.venv_python(snapshotted / "venvs" / "base")
+    venv, install, _wheel = fake_uv
+    assert "--offline" in venv and "--offline" in install
+    assert install[install.index("--find-links") + 1] == str(wheelhouse_dir)
+    assert install[-1] == str(wheelhouse_dir / "requirements.txt")
+
+
+def test_restore_requires_a_snapshot(snapshotted: Path) -> None:
+    """Assert experiments without experiment.env are rejected with a hint."""
+    (snapshotted / "experiments" / "2026-10-02_fresh").mkdir()
+
+    with pytest.raises(api.RestoreError, match="bube env-snapshot"):
+        api.restore_env("2026-10-02_fresh", project_root=snapshotted)
+    with pytest.raises(api.RestoreError, match="no experiment 'missing'"):
+        api.restore_env("missing", project_root=snapshotted)
+
+
+def test_restore_resolves_symlinked_project_roots(
+    snapshotted: Path, tmp_path_factory: pytest.TempPathFactory
+) -> None:
+    """Assert experiments are found through a symlinked root, and only inside."""
+    link = tmp_path_factory.mktemp("link") / "project"
+    link.symlink_to(snapshotted, target_is_directory=True)
+
+    snapshot = env_restore.read_snapshot(link, "experiments/2026-10-01_base")
+    assert snapshot.experiment_dir == snapshotted / "experiments" / "2026-10-01_base"
+    outside = tmp_path_factory.mktemp("outside")
+    with pytest.raises(api.RestoreError, match="not inside the project"):
+        env_restore.read_snapshot(link, str(outside))
+
+
+def test_pool_reuses_venv_for_same_lock(
+    snapshotted: Path, fake_uv: list[list[str]]
+) -> None:
+    """Assert a second experiment with the same lock installs nothing."""
+    first = api.restore_env("base", project_root=snapshotted)
+    experiment = snapshotted / "experiments" / "2026-10-02_rerun"
+    (experiment / "_setup").mkdir(parents=True)
+    for name in ("requirements.lock", "demo-0.1-py3-none-any.whl"):
+        (experiment / "_setup" / name).write_bytes(
+            (first.experiment_dir / "_setup" / name).read_bytes()
+        )
+    (experiment / "experiment.env").write_text(
+        "COMMIT_HASH=def5678\n"
+        "LOCK_FILE=experiments/2026-10-02_rerun/_setup/requirements.lock\n"
+    )
+    calls = len(fake_uv)
+
+    second = api.restore_env(experiment, project_root=snapshotted)
+    assert second.reused
+    assert len(fake_uv) == calls
+    assert second.venv.resolve() == first.venv.resolve()
+
+    cloned = api.restore_env(
+        experiment, project_root=snapshotted, venv=snapshotted / "clone", clone=True
+    )
+    assert cloned.reused and not cloned.venv.is_symlink()
+    assert cloned.python.is_symlink()
+    assert cloned.python_version == platform.python_version()
+
+
+def test_pool_evicts_least_recently_used(
+    snapshotted: Path, fake_uv: list[list[str]]
+) -> None:
+    """Assert a full pool drops its least recently used venv after a build."""
+    lock = snapshotted / "experiments" / "2026-10-01_base" / "_setup"
+    first = api.restore_env("base", project_root=snapshotted)
+    (lock / "requirements.lock").write_text("numpy==2.2\n")
+
+    second = api.restore_env(
+        "base", project_root=snapshotted, venv=snapshotted / "other", pool_quota=1
+    )
+    assert not second.reused
+    assert not first.venv.exists()  # < Dangling link to the evicted venv
+    assert second.venv.resolve().is_dir()
+
+
+def test_pool_never_evicts_venvs_in_use(
+    snapshotted: Path, fake_uv: list[list[str]]
+) -> None:
+    """Assert eviction skips held venvs and builds are moved in once complete."""
+    lock = snapshotted / "experiments" / "2026-10-01_base" / "_setup"
+    first = api.restore_env("base", project_root=snapshotted)
+    pooled = first.venv.resolve()
+    (lock / "requirements.lock").write_text("numpy==2.2\n")
+
+    with venv_pool.in_use(snapshotted, pooled.name):
+        second = api.restore_env(
+            "base", project_root=snapshotted, venv=snapshotted / "other", pool_quota=1
+        )
+    assert pooled.is_dir()
+    assert second.venv.resolve().parent == pooled.parent
+    assert not list(pooled.parent.glob(".*.tmp"))  # < Staging renamed into place
+    assert venv_pool.evict(snapshotted, 1, keep=[second.venv.resolve().name])[0] == 1
+    assert not pooled.exists()
+
+
+def test_clone_venv_relocates_scripts(tmp_path: Path) -> None:
+    """Assert scripts and symlinks naming the source venv name the clone."""
+    source = tmp_path / "pool" / "venv"
+    (source / "bin").mkdir(parents=True)
+    (source / "bin" / "tool").write_text(f"#!{source}/bin/python\nrun()\n")
+    (source / "bin" / "python").symlink_to(source / "bin" / "python3")
+    (source / "pyvenv.cfg").write_text("home = /usr/bin\n")
+
+    venv_pool.clone_venv(source, tmp_path / "clone")
+
+    clone = tmp_path / "clone"
+    assert (clone / "bin" / "tool").read_text() == f"#!{clone}/bin/python\nrun()\n"
+    assert os.readlink(clone / "bin" / "python") == str(clone / "bin" / "python3")
+    assert (clone / "pyvenv.cfg").read_text() == "home = /usr/bin\n"
+
+
+def test_exp_run_activates_venv(tmp_path: Path) -> None:
+    """Assert commands see the venv first on PATH and as VIRTUAL_ENV."""
+    environ = exp_run.venv_environ(tmp_path / "venv")
+
+    assert environ["VIRTUAL_ENV"] == str(tmp_path / "venv")
+    scripts = str(env_restore.venv_python(tmp_path / "venv").parent)
+    assert environ["PATH"].split(os.pathsep)[0] == scripts
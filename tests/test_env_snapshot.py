@@ -0,0 +1,266 @@
+"""Tests for env-snapshot internals that run without uv."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import subprocess
+import time
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from buildben import env_snapshot, exp_index, utils
+
+
+def _git(*args: str, cwd: Path) -> None:
+    subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True)
+
+
+@pytest.fixture
+def git_project(tmp_path: Path) -> Path:
+    """Return a committed git repository with uv.lock and experiments/."""
+    (tmp_path / "pyproject.toml").write_text("[project]\nname = 'demo'\n")
+    (tmp_path / "uv.lock").write_text("version = 1\n")
+    (tmp_path / "experiments").mkdir()
+    _git("init", "--initial-branch", "main", cwd=tmp_path)
+    _git("config", "user.email", "test@example.com", cwd=tmp_path)
+    _git("config", "user.name", "Buildben Test", cwd=tmp_path)
+    _git("add", ".", cwd=tmp_path)
+    _git("commit", "-m", "init", cwd=tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+def fake_uv(monkeypatch: pytest.MonkeyPatch) -> list[list[str]]:
+    """Replace uv with a stub that records its calls; git stays real.
+
+    ``uv export`` writes the project's ``requirements.in`` if there is one;
+    the uv cache is ``.uv-cache`` in the project, and ``uv pip install``
+    unpacks a wheel into it for every requirement without a marker.
+    """
+    calls: list[list[str]] = []
+    run_checked = utils.run_checked
+
+    async def fake_run_checked(command: list[str], **kwargs) -> str:
+        if command[0] != "uv":
+            return await run_checked(command, **kwargs)
+        calls.append(command)
+        if command[1] == "build":
+            out_dir = Path(command[command.index("--out-dir") + 1])
+            out_dir.mkdir(parents=True, exist_ok=True)
+            (out_dir / "demo-0.1-py3-none-any.whl").write_bytes(b"wheel")
+            (out_dir / "demo-0.1.tar.gz").write_bytes(b"sdist")
+            (out_dir / ".gitignore").write_text("*")
+        elif command[1] == "export":
+            output = Path(command[command.index("--output-file") + 1])
+            source = kwargs["cwd"] / "requirements.in"
+            text = source.read_text() if source.is_file() else "numpy==2.0\n"
+            output.write_text(text)
+        elif command[1:3] == ["cache", "dir"]:
+            return str(kwargs["cwd"] / ".uv-cache")
+        elif command[1:3] == ["pip", "install"]:
+            requirements = Path(command[command.index("-r") + 1]).read_text()
+            for line in requirements.splitlines():
+                if ";" not in line:
+                    _cache_wheel(kwargs["cwd"] / ".uv-cache", *line.split("=="))
+        return "uv 0.0.0 (test)"
+
+    monkeypatch.setattr(utils, "run_checked", fake_run_checked)
+    return calls
+
+
+def _cache_wheel(cache_dir: Path, name: str, version: str) -> None:
+    """Unpack a tiny wheel into a uv cache, the way uv does."""
+    root = cache_dir / "archive-v0" / f"{name}-{version}"
+    dist_info = root / f"{name}-{version}.dist-info"
+    dist_info.mkdir(parents=True)
+    (root / f"{name}.py").write_text(f"VERSION = {version!r}\n")
+    (dist_info / "WHEEL").write_text("Wheel-Version: 1.0\nTag: py3-none-any\n")
+    (dist_info / "RECORD").write_text(f"{name}.py,,\n")
+
+
+def _builds(calls: list[list[str]]) -> int:
+    return sum(command[1] == "build" for command in calls)
+
+
+def test_build_cache_builds_each_tree_once(
+    git_project: Path, fake_uv: list[list[str]]
+) -> None:
+    """Assert snapshots of one commit share a build and dirty trees bypass it."""
+    snapshots = [
+        env_snapshot._snapshot(git_project, f"experiments/{name}")
+        for name in ("a", "b", "c")  # < Untracked experiments keep the tree clean
+    ]
+
+    assert _builds(fake_uv) == 1
+    wheels = [snapshot.artifacts[0] for snapshot in snapshots]
+    assert wheels[0].name == "demo-0.1-py3-none-any.whl"
+    assert len({wheel.stat().st_ino for wheel in wheels}) == 1  # < Hardlinked
+    assert not (snapshots[0].experiment_dir / "_setup" / ".gitignore").exists()
+
+    (git_project / "pyproject.toml").write_text("[project]\nname = 'changed'\n")
+    env_snapshot._snapshot(git_project, "experiments/a")
+    env_snapshot._snapshot(git_project, "experiments/b", build_cache=False)
+    assert _builds(fake_uv) == 3
+    # > Rebuilt archives with the same content are stored once
+    assert len(list((git_project / ".buildben" / "store").glob("?" * 64))) == 3
+
+
+def test_snapshot_runs_build_and_export_concurrently(
+    git_project: Path, fake_uv: list[list[str]], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Assert a snapshot takes about as long as its slowest phase."""
+    uv_build = env_snapshot._uv_build
+    export_lock = env_snapshot._export_lock
+
+    async def slow_build(*args) -> None:
+        await asyncio.sleep(0.5)
+        await uv_build(*args)
+
+    async def slow_export(*args, **kwargs) -> str:
+        await asyncio.sleep(0.5)
+        return await export_lock(*args, **kwargs)
+
+    monkeypatch.setattr(env_snapshot, "_uv_build", slow_build)
+    monkeypatch.setattr(env_snapshot, "_export_lock", slow_export)
+
+    started = time.perf_counter()
+    snapshot = env_snapshot._snapshot(git_project, "experiments/a", build_cache=False)
+    assert time.perf_counter() - started < 0.9
+
+    commit = asyncio.run(env_snapshot._current_commit(git_project))
+    assert snapshot.commit_hash == commit.hash
+    assert len(commit.tree_hash) == 40
+    env_text = (git_project / "experiments" / "a" / "experiment.env").read_text()
+    assert env_text.startswith(f"COMMIT_HASH={commit.hash}\n")
+    tags = subprocess.run(
+        ["git", "tag"], cwd=git_project, capture_output=True, text=True, check=True
+    )
+    assert tags.stdout.split() == [f"env-snapshot-{commit.hash}"]
+
+
+def test_snapshot_many_fans_out_one_build(
+    git_project: Path, fake_uv: list[list[str]]
+) -> None:
+    """Assert globbed experiments share one build, one lock and one commit."""
+    for name in ("2026-10-01_a", "2026-10-02_b", "2026-11-01_c"):
+        (git_project / "experiments" / name).mkdir()
+
+    snapshots = env_snapshot._snapshot_many(
+        git_project, ["experiments/2026-10-*", "experiments/2026-11-01_c"], jobs=4
+    )
+
+    assert [snapshot.experiment_dir.name for snapshot in snapshots] == [
+        "2026-10-01_a",
+        "2026-10-02_b",
+        "2026-11-01_c",
+    ]
+    assert [command[1] for command in fake_uv].count("build") == 1
+    assert [command[1] for command in fake_uv].count("export") == 1
+    locks = {snapshot.lock_path.stat().st_ino for snapshot in snapshots}
+    assert len(locks) == 1
+    assert snapshots[0].lock_path.read_text() == "numpy==2.0\n"
+    rows = exp_index.list_experiments(git_project)
+    assert {row["snapshot_commit"] for row in rows} == {snapshots[0].commit_hash}
+
+    with pytest.raises(env_snapshot.utils.SnapshotError, match="matched no"):
+        env_snapshot._snapshot_many(git_project, ["experiments/1999-*"])
+
+
+def test_export_cache_and_lock_diff(
+    git_project: Path, fake_uv: list[list[str]]
+) -> None:
+    """Assert unchanged locks skip uv export and changed ones are diffed."""
+    first = env_snapshot._snapshot(git_project, "experiments/a")
+    second = env_snapshot._snapshot(git_project, "experiments/b")
+    assert [command[1] for command in fake_uv].count("export") == 1
+    assert second.lock_path.stat().st_ino == first.lock_path.stat().st_ino
+    assert first.lock_diff is None and second.lock_diff is None
+
+    (git_project / "requirements.in").write_text("numpy==2.1\nrich==13.9.4\n")
+    (git_project / "uv.lock").write_text("version = 1\nrevision = 2\n")
+    lines: list[str] = []
+    third = env_snapshot._snapshot(git_project, "experiments/c", log=lines.append)
+
+    assert [command[1] for command in fake_uv].count("export") == 2
+    assert third.lock_diff is not None
+    diff = json.loads(third.lock_diff.read_text())
+    assert diff == {
+        "previous": "experiments/b/_setup/requirements.lock",
+        "added": {"rich": "13.9.4"},
+        "removed": {},
+        "upgraded": {"numpy": ["2.0", "2.1"]},
+        "downgraded": {},
+        "changed": {},
+    }
+    assert any("1 added, 0 removed, 1 upgraded" in line for line in lines)
+
+    # > Re-snapshotting with the same lock drops the stale diff
+    again = env_snapshot._snapshot(git_project, "experiments/c")
+    assert again.lock_diff is None
+    setup_dir = git_project / "experiments" / "c" / "_setup"
+    assert not (setup_dir / "lock-diff.json").exists()
+
+
+def test_wheelhouse_collects_cached_and_missing_wheels(
+    git_project: Path, fake_uv: list[list[str]]
+) -> None:
+    """Assert --wheelhouse rezips cached wheels, fetches missing ones, caches."""
+    (git_project / "requirements.in").write_text(
+        "numpy==2.1 \\\n    --hash=sha256:00\n"
+        "rich==13.9.4\n"
+        "pywin32==308 ; sys_platform == 'win32'\n"
+    )
+    _cache_wheel(git_project / ".uv-cache", "numpy", "2.1")
+    lines: list[str] = []
+    first = env_snapshot._snapshot(
+        git_project, "experiments/a", log=lines.append, with_wheelhouse=True
+    )
+
+    wheelhouse_dir = git_project / "experiments" / "a" / "_wheelhouse"
+    assert first.wheelhouse == wheelhouse_dir
+    assert sorted(path.name for path in wheelhouse_dir.iterdir()) == [
+        "SHA256SUMS",
+        "numpy-2.1-py3-none-any.whl",
+        "requirements.txt",
+        "rich-13.9.4-py3-none-any.whl",
+    ]
+    installs = [command for command in fake_uv if command[1:3] == ["pip", "install"]]
+    assert len(installs) == 1  # < Only for rich and pywin32
+    assert any("No wheel for pywin32==308" in line for line in lines)
+
+    wheel = wheelhouse_dir / "numpy-2.1-py3-none-any.whl"
+    with zipfile.ZipFile(wheel) as archive:
+        assert archive.namelist()[-1] == "numpy-2.1.dist-info/RECORD"
+        assert archive.read("numpy.py") == b"VERSION = '2.1'\n"
+    digest = hashlib.sha256(wheel.read_bytes()).hexdigest()
+    assert f"{digest}  {wheel.name}\n" in (wheelhouse_dir / "SHA256SUMS").read_text()
+    requirements = (wheelhouse_dir / "requirements.txt").read_text()
+    assert f"numpy==2.1 \\\n    --hash=sha256:{digest}\n" in requirements
+    assert "pywin32" not in requirements
+    env_text = (git_project / "experiments" / "a" / "experiment.env").read_text()
+    assert "WHEELHOUSE=experiments/a/_wheelhouse\n" in env_text
+    assert env_snapshot.install_hint(git_project, first.env_path) == (
+        "uv pip install --offline --find-links experiments/a/_wheelhouse "
+        "-r experiments/a/_wheelhouse/requirements.txt"
+    )
+
+    calls = len(fake_uv)
+    second = env_snapshot._snapshot(git_project, "experiments/b", with_wheelhouse=True)
+    reruns = {command[1] for command in fake_uv[calls:]}
+    assert not reruns & {"export", "cache", "pip"}  # < Lock and wheelhouse cached
+    second_wheel = second.wheelhouse / wheel.name
+    assert second_wheel.stat().st_ino == wheel.stat().st_ino
+
+
+def test_snapshot_reports_failure_hint(git_project: Path) -> None:
+    """Assert a missing commit surfaces the existing failure hint."""
+    empty = git_project / "empty"
+    empty.mkdir()
+    _git("init", cwd=empty)
+
+    with pytest.raises(env_snapshot.utils.SnapshotError, match="at least one commit"):
+        asyncio.run(env_snapshot._current_commit(empty))
@@ -0,0 +1,56 @@
+"""Tests for the SQLite experiment index."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from buildben import api, exp_index
+
+
+def test_index_tracks_created_and_snapshotted_experiments(tmp_path: Path) -> None:
+    """Assert add_experiment indexes runs and a rebuild picks up snapshots."""
+    project = api.scaffold_project("demo_idx", tmp_path)
+    root = project.root
+    smoke = api.add_experiment("smoke", project_root=root).roots[0]
+    api.add_experiment("sweep", project_root=root, matrix=[{"lr": 1}, {"lr": 2}])
+
+    rows = exp_index.list_experiments(root)
+    assert [row["name"] for row in rows] == ["smoke", "sweep_000", "sweep_001"]
+    assert all(row["snapshot_commit"] is None for row in rows)
+
+    # > What env-snapshot leaves behind, written without uv
+    setup_dir = smoke / "_setup"
+    setup_dir.mkdir()
+    (setup_dir / "requirements.lock").write_text("numpy==2.0\n", encoding="utf-8")
+    (setup_dir / "demo_idx-0.1.0-py3-none-any.whl").write_bytes(b"w" * 2048)
+    lock_rel = (setup_dir / "requirements.lock").relative_to(root).as_posix()
+    (smoke / "experiment.env").write_text(
+        f"COMMIT_HASH=abc1234\nLOCK_FILE={lock_rel}\n", encoding="utf-8"
+    )
+    (root / "experiments" / "handmade").mkdir()
+
+    assert exp_index.rebuild(root, jobs=4) == 4
+    listed = (root / exp_index.COMPLETION_RELPATH).read_text("utf-8").split()
+    assert "experiments/handmade" in listed and len(listed) == 4
+    row = exp_index.find_experiment(root, "smoke")
+    assert row["path"] == smoke.relative_to(root).as_posix()
+    assert row["snapshot_commit"] == "abc1234"
+    assert row["lock_file"] == lock_rel
+    assert row["lock_size"] == len("numpy==2.0\n")
+    assert json.loads(row["artifacts"]) == {"demo_idx-0.1.0-py3-none-any.whl": 2048}
+    assert exp_index.format_size(row["artifacts_size"]) == "2.0 KiB"
+    handmade = exp_index.find_experiment(root, "experiments/handmade/")
+    assert handmade["name"] == "handmade"
+    assert exp_index.find_experiment(root, "missing") is None
+
+
+def test_first_index_update_scans_existing_experiments(tmp_path: Path) -> None:
+    """Assert experiments made before the index existed are not left out."""
+    project = api.scaffold_project("demo_idx", tmp_path)
+    (project.root / "experiments" / "older").mkdir(parents=True)
+
+    api.add_experiment("smoke", project_root=project.root)
+
+    names = [row["name"] for row in exp_index.list_experiments(project.root)]
+    assert sorted(names) == ["older", "smoke"]
@@ -0,0 +1,111 @@
+"""Tests for the pure-Python git metadata reader."""
+
+from __future__ import annotations
+
+import os
+import subprocess
+from pathlib import Path
+
+from buildben import git_meta
+
+
+def _git(*args: str, cwd: Path, **env: str) -> str:
+    result = subprocess.run(
+        ["git", *args],
+        cwd=cwd,
+        env={**os.environ, **env},
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return result.stdout.strip()
+
+
+def test_read_head_matches_git_log(tmp_path: Path) -> None:
+    """Assert HEAD, refs and index hints agree with the git CLI."""
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "mod.py").write_text("x = 1\n")
+    (tmp_path / "experiments").mkdir()
+    (tmp_path / "experiments" / "notes.md").write_text("notes\n")
+    _git("init", "--initial-branch", "main", cwd=tmp_path)
+    _git("config", "user.email", "test@example.com", cwd=tmp_path)
+    _git("config", "user.name", "Buildben Test", cwd=tmp_path)
+    _git("add", ".", cwd=tmp_path)
+    # > Dates keep the committer's own UTC offset
+    _git("commit", "-m", "init", cwd=tmp_path, GIT_COMMITTER_DATE="1767303245 +0530")
+
+    def git_log() -> str:
+        return _git("log", "-1", "--format=%H|%h|%cd|%T", "--date=iso", cwd=tmp_path)
+
+    head = git_meta.read_head(tmp_path / "src")
+    assert head is not None
+    assert "|".join(head) == git_log()
+    assert head.date.endswith(" +0530")
+    _git("config", "core.abbrev", "10", cwd=tmp_path)
+    assert "|".join(git_meta.read_head(tmp_path)) == git_log()
+
+    _git("tag", "-a", "v1", "-m", "v1", cwd=tmp_path)
+    _git("pack-refs", "--all", cwd=tmp_path)  # < Branch and tag only packed
+    assert "|".join(git_meta.read_head(tmp_path)) == git_log()
+    assert git_meta.tag_exists(tmp_path, "v1") is True
+    assert git_meta.tag_exists(tmp_path, "v2") is False
+
+    assert git_meta.index_changes(tmp_path) is None
+    (tmp_path / "experiments" / "notes.md").write_text("longer notes\n")
+    assert git_meta.index_changes(tmp_path) is True
+    assert git_meta.index_changes(tmp_path, exclude=("experiments/",)) is None
+    assert git_meta.index_changes(tmp_path / "src") is None
+    (tmp_path / "src" / "mod.py").unlink()
+    assert git_meta.index_changes(tmp_path / "src") is True
+
+    _git("gc", "--quiet", cwd=tmp_path)  # < Commit now lives in a packfile only
+    assert git_meta.read_head(tmp_path) is None
+
+
+def test_abbreviation_accounts_for_packed_objects(tmp_path: Path) -> None:
+    """Assert short hashes match git when prefixes collide inside packfiles."""
+    _git("init", cwd=tmp_path)
+    _git("config", "core.abbrev", "4", cwd=tmp_path)  # < Makes collisions likely
+
+    def git_stdin(*args: str, text: str) -> list[str]:
+        return subprocess.run(
+            ["git", *args],
+            cwd=tmp_path,
+            input=text,
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout.split("\n")[:-1]
+
+    blobs = [f"blob {i}\n" for i in range(1500)]
+    packed = git_stdin(
+        "hash-object", "-w", "--stdin-paths", text=_write_blobs(tmp_path, blobs[:1000])
+    )
+    git_stdin("pack-objects", ".git/objects/pack/pack", text="\n".join(packed) + "\n")
+    _git("prune-packed", cwd=tmp_path)  # < Now only in the packfile
+    loose = git_stdin(
+        "hash-object", "-w", "--stdin-paths", text=_write_blobs(tmp_path, blobs[1000:])
+    )
+    object_ids = packed + loose
+
+    tree = git_stdin(
+        "mktree", text="".join(f"100644 blob {oid}\t{oid}\n" for oid in object_ids)
+    )[0]
+    expected = {
+        line.split("\t")[1]: line.split("\t")[0].split()[2]
+        for line in git_stdin("ls-tree", "--abbrev", tree, text="")
+    }
+    dirs = git_meta.find_git_dirs(tmp_path)
+    assert dirs is not None
+    assert {oid: git_meta._abbreviate(dirs, oid) for oid in object_ids} == expected
+    assert any(len(expected[oid]) > 4 for oid in packed)
+
+
+def _write_blobs(directory: Path, blobs: list[str]) -> str:
+    """Write blobs to files and return their paths, one per line."""
+    paths = []
+    for i, blob in enumerate(blobs):
+        path = directory / f"blob-{i}"
+        path.write_text(blob)
+        paths.append(f"{path}\n")
+    return "".join(paths)
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import argparse
+import json
 import os
 import shutil
 import subprocess
@@ -75,6 +76,11 @@ def bube_test_project(
         target_dir=str(tmp_path),
         git_init=False,
         github_user="github-user",
+        jobs=4,
+        durable=False,
+        update=False,
+        force=False,
+        from_spec=None,
     )
     scaffolder._run(args)
 
@@ -462,6 +468,8 @@ def test_buildben_wheel_includes_all_template_assets(tmp_path: Path) -> None:
     assert "buildben/_templates_proj/_CHANGELOG.md" in names
     assert "buildben/_templates_proj/_TODO.md" in names
     assert "buildben/_templates_proj/_src-cli-app.py.tmpl" in names
+    assert "buildben/_templates_proj.bundle" in names
+    assert "buildben/_templates_experim.bundle" in names
 
 
 def test_experiment_scaffold_is_minimal_and_runnable(
@@ -541,3 +549,188 @@ def test_env_snapshot_writes_uv_snapshot_outputs(bube_test_project: Path) -> Non
     assert any(setup_dir.glob("*.tar.gz"))
     assert "COMMIT_HASH=" in env_text
     assert "LOCK_FILE=experiments/smoke/_setup/requirements.lock" in env_text
+
+    # > A second snapshot of the same commit reuses the cached build
+    _run(
+        [sys.executable, "-m", "buildben.cli", "env-snapshot", "experiments/again"],
+        cwd=proot,
+        env=env,
+    )
+    wheel = next(setup_dir.glob("*.whl"))
+    again = proot / "experiments" / "again" / "_setup" / wheel.name
+    assert again.stat().st_ino == wheel.stat().st_ino
+
+
+def test_update_rerenders_only_changed_templates(bube_test_project: Path) -> None:
+    """Assert --update rewrites stale templates and keeps user-edited files."""
+    import buildben.init_proj as scaffolder
+    from buildben import utils
+
+    proot = bube_test_project
+    manifest_path = proot / ".buildben" / "manifest.json"
+    scaffold_manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+    fresh_justfile = (proot / "justfile").read_text(encoding="utf-8")
+
+    # > Pretend two templates changed upstream; the user edited one of the files
+    (proot / "justfile").write_text("old render\n", encoding="utf-8")
+    (proot / "README.md").write_text("my own readme\n", encoding="utf-8")
+    for relative in ("justfile", "README.md"):
+        scaffold_manifest["files"][relative]["source_sha256"] = "outdated"
+    scaffold_manifest["files"]["justfile"]["sha256"] = utils.sha256_file(
+        proot / "justfile"
+    )
+    manifest_path.write_text(json.dumps(scaffold_manifest), encoding="utf-8")
+    pyproject_mtime = (proot / "pyproject.toml").stat().st_mtime_ns
+
+    scaffolder._run(
+        argparse.Namespace(
+            name="bube_test_tmp",
+            target_dir=str(proot.parent),
+            git_init=False,
+            github_user="github-user",
+            jobs=1,
+            durable=False,
+            update=True,
+            force=False,
+            from_spec=None,
+        )
+    )
+
+    assert (proot / "justfile").read_text(encoding="utf-8") == fresh_justfile
+    assert (proot / "README.md").read_text(encoding="utf-8") == "my own readme\n"
+    assert (proot / "pyproject.toml").stat().st_mtime_ns == pyproject_mtime
+    updated_manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+    assert updated_manifest["files"]["justfile"]["source_sha256"] != "outdated"
+    assert updated_manifest["files"]["README.md"]["source_sha256"] == "outdated"
+    assert sorted(p.name for p in proot.parent.iterdir()) == ["bube_test_tmp"]
+
+
+def test_verify_reports_scaffold_drift(bube_test_project: Path) -> None:
+    """Assert verify hashes only stat-changed files and flags real drift."""
+    proot = bube_test_project
+    env = _project_env(proot)
+    env["PROJECT_ROOT"] = str(proot)
+    verify_cmd = [sys.executable, "-m", "buildben.cli", "verify"]
+
+    _run(verify_cmd, cwd=proot, env=env)
+
+    # > Same content, new mtime: matches, refreshed on request
+    os.utime(proot / "justfile", ns=(0, 0))
+    _run([*verify_cmd, "--refresh"], cwd=proot, env=env)
+    manifest_text = (proot / ".buildben" / "manifest.json").read_text(encoding="utf-8")
+    assert json.loads(manifest_text)["files"]["justfile"]["mtime_ns"] == 0
+
+    (proot / "TODO.md").write_text("edited\n", encoding="utf-8")
+    (proot / "src" / "bube_test_tmp" / "cli" / "__init__.py").unlink()
+    result = subprocess.run(
+        verify_cmd, cwd=str(proot), env=env, text=True, capture_output=True, check=False
+    )
+
+    assert result.returncode == 1
+    assert "modified: TODO.md" in result.stdout
+    assert "missing:  src/bube_test_tmp/cli/__init__.py" in result.stdout
+
+
+def test_init_proj_scaffolds_batch_from_spec(tmp_path: Path) -> None:
+    """Assert one invocation scaffolds every project of TOML and JSONL specs."""
+    env = os.environ.copy()
+    env["PYTHONPATH"] = str(Path(__file__).resolve().parents[1] / "src")
+    toml_spec = tmp_path / "projects.toml"
+    toml_spec.write_text(
+        (
+            "[defaults]\n"
+            'target_dir = "students"\n'
+            'github_user = "course-org"\n\n'
+            "[[project]]\n"
+            'name = "alice_proj"\n'
+            'github_user = "alice"\n\n'
+            "[[project]]\n"
+            'name = "bob_proj"\n\n'
+            "[[project]]\n"
+            'name = "carol_proj"\n'
+            'target_dir = "staff"\n'
+        ),
+        encoding="utf-8",
+    )
+    jsonl_spec = tmp_path / "projects.jsonl"
+    jsonl_spec.write_text('{"name": "dave_proj"}\n', encoding="utf-8")
+
+    _run(
+        [sys.executable, "-m", "buildben.cli", "proj", "--from-spec", str(toml_spec)]
+        + ["-j", "3"],
+        cwd=tmp_path,
+        env=env,
+    )
+    env.update(
+        GIT_AUTHOR_NAME="Buildben Test",
+        GIT_AUTHOR_EMAIL="test@example.com",
+        GIT_COMMITTER_NAME="Buildben Test",
+        GIT_COMMITTER_EMAIL="test@example.com",
+    )
+    result = subprocess.run(
+        [sys.executable, "-m", "buildben.cli", "proj", "--from-spec", str(jsonl_spec)]
+        + ["--git-init", "--durable"],
+        cwd=tmp_path,
+        env=env,
+        text=True,
+        capture_output=True,
+        check=False,
+    )
+    assert result.returncode == 0, result.stderr
+    assert "Initialized empty Git repository" not in result.stdout  # < Quiet git
+    assert (tmp_path / "dave_proj" / ".git").is_dir()
+
+    for project_root in (
+        tmp_path / "students" / "alice_proj",
+        tmp_path / "students" / "bob_proj",
+        tmp_path / "staff" / "carol_proj",
+        tmp_path / "dave_proj",
+    ):
+        assert (project_root / ".buildben" / "manifest.json").is_file()
+    alice_pyproject = tmp_path / "students" / "alice_proj" / "pyproject.toml"
+    bob_manifest = tmp_path / "students" / "bob_proj" / ".buildben" / "manifest.json"
+    assert "alice" in alice_pyproject.read_text(encoding="utf-8")
+    bob_placeholders = json.loads(bob_manifest.read_text(encoding="utf-8"))
+    assert bob_placeholders["placeholders"]["<github_user>"] == "course-org"
+
+
+def test_add_experim_expands_parameter_matrix(bube_test_project: Path) -> None:
+    """Assert one add-experim call creates a directory per matrix run."""
+    proot = bube_test_project
+    env = _project_env(proot)
+    matrix = proot / "grid.toml"
+    matrix.write_text(
+        (
+            "[grid]\n"
+            "lr = [0.1, 0.01]\n"
+            'optimizer = ["sgd", "adam"]\n\n'
+            "[[runs]]\n"
+            "lr = 1.0\n"
+            'optimizer = "lbfgs"\n'
+        ),
+        encoding="utf-8",
+    )
+
+    _run(
+        [sys.executable, "-m", "buildben.cli", "exp", "sweep", "--matrix", "grid.toml"]
+        + ["-j", "4"],
+        cwd=proot,
+        env=env,
+    )
+
+    run_dirs = sorted((proot / "experiments").glob("*_sweep_*"))
+    params = [
+        json.loads((run_dir / "params.json").read_text(encoding="utf-8"))
+        for run_dir in run_dirs
+    ]
+    assert [run_dir.name[-4:] for run_dir in run_dirs] == [
+        "_000",
+        "_001",
+        "_002",
+        "_003",
+        "_004",
+    ]
+    assert params[0] == {"lr": 0.1, "optimizer": "sgd"}
+    assert params[3] == {"lr": 0.01, "optimizer": "adam"}
+    assert params[4] == {"lr": 1.0, "optimizer": "lbfgs"}
+    assert run_dirs[2].name in (run_dirs[2] / "run.py").read_text(encoding="utf-8")
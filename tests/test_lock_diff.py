@@ -0,0 +1,52 @@
+"""Tests for the requirements lock parser and diff."""
+
+from __future__ import annotations
+
+from buildben import lock_diff
+
+EXPORTED = """\
+# This file was autogenerated by uv via the following command:
+#    uv export --format requirements.txt --all-extras --all-groups
+-e ./packages/helper
+NumPy==2.1.3 \\
+    --hash=sha256:0123 \\
+    --hash=sha256:4567
+    # via demo
+pywin32==308 ; sys_platform == 'win32' \\
+    --hash=sha256:89ab
+typing-extensions[dev]==4.12.2
+zope.interface @ https://example.com/zope_interface-7.0.tar.gz
+"""
+
+
+def test_parse_requirements_reads_uv_export() -> None:
+    """Assert pins are read across hashes, markers, extras and comments."""
+    assert lock_diff.parse_requirements(EXPORTED) == {
+        "numpy": "2.1.3",
+        "pywin32": "308",
+        "typing-extensions": "4.12.2",
+        "zope-interface": "https://example.com/zope_interface-7.0.tar.gz",
+    }
+
+
+def test_diff_requirements_orders_versions() -> None:
+    """Assert version changes are classified with pre/post-release ordering."""
+    old = {"a": "1.0", "b": "1.0rc1", "c": "1.0.post1", "d": "2.10", "gone": "1"}
+    new = {"a": "1.0.1", "b": "1.0", "c": "1.0", "d": "2.9", "new": "3"}
+    old.update(same="1.0", zeros="2.0.0rc1")
+    new.update(same="1.0.0", zeros="2rc1")  # < Equal versions are unchanged
+    url_1, url_2 = "https://example.com/u-1.0.tar.gz", "https://example.com/u-2.0.zip"
+    old.update(url=url_1, pinned="1.0", unpinned=url_1, same_url=url_2)
+    new.update(url=url_2, pinned=url_1, unpinned="1.0", same_url=url_2)
+
+    assert lock_diff.diff_requirements(old, new) == {
+        "added": {"new": "3"},
+        "removed": {"gone": "1"},
+        "upgraded": {"a": ["1.0", "1.0.1"], "b": ["1.0rc1", "1.0"]},
+        "downgraded": {"c": ["1.0.post1", "1.0"], "d": ["2.10", "2.9"]},
+        "changed": {
+            "pinned": ["1.0", url_1],
+            "unpinned": [url_1, "1.0"],
+            "url": [url_1, url_2],
+        },
+    }
@@ -0,0 +1,146 @@
+"""Tests for the bube serve daemon and client forwarding."""
+
+from __future__ import annotations
+
+import socket
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from buildben import api, cli, client, serve
+
+
+def test_client_forwards_to_running_daemon(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    """Assert scaffold requests run in the daemon and existing targets fall back."""
+    socket_path = str(tmp_path / "bube.sock")
+    monkeypatch.setenv("BUILDBEN_SOCKET", socket_path)
+    monkeypatch.delenv("BUILDBEN_NO_DAEMON", raising=False)
+    monkeypatch.delenv("PROJECT_NAME", raising=False)
+    monkeypatch.chdir(tmp_path)
+    daemon = threading.Thread(target=serve.serve_socket, args=(socket_path,))
+    daemon.start()
+    while not Path(socket_path).exists():
+        time.sleep(0.01)
+    parser = cli.build_parser()
+
+    try:
+        proj_args = parser.parse_args(["proj", "demo_srv", "-j", "2"])
+        assert client.forward("init-proj", proj_args) == 0
+        assert "demo_srv scaffold complete" in capsys.readouterr().out
+        assert (tmp_path / "demo_srv" / "pyproject.toml").is_file()
+        # > The overwrite prompt needs the client's terminal
+        assert client.forward("init-proj", proj_args) is None
+
+        monkeypatch.chdir(tmp_path / "demo_srv" / "src")
+        exp_args = parser.parse_args(["exp", "smoke"])
+        assert client.forward("add-experim", exp_args) == 0
+        assert "✓  Created experiments/" in capsys.readouterr().out
+        assert len(list((tmp_path / "demo_srv" / "experiments").glob("*_smoke"))) == 1
+
+        # > uv and git must run with the client's environment
+        snp_args = parser.parse_args(["snp", "experiments/x"])
+        assert client.forward("env-snapshot", snp_args) is None
+        git_args = parser.parse_args(["proj", "demo_git", "--git-init"])
+        assert client.forward("init-proj", git_args) is None
+    finally:
+        client.request({"command": "shutdown"}, socket_path, timeout=5)
+        daemon.join(timeout=5)
+
+    assert not daemon.is_alive()
+    assert not Path(socket_path).exists()
+    assert client.forward("init-proj", proj_args) is None  # < No daemon: local
+
+
+def test_client_ignores_sockets_of_other_users(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Assert a socket owned by someone else is never connected to."""
+    socket_path = tmp_path / "bube.sock"
+    socket_path.touch()
+    monkeypatch.setenv("BUILDBEN_SOCKET", str(socket_path))
+    monkeypatch.delenv("BUILDBEN_NO_DAEMON", raising=False)
+    monkeypatch.setattr(client.os, "getuid", lambda: socket_path.stat().st_uid + 1)
+    monkeypatch.setattr(client, "_connect", pytest.fail)
+    proj_args = cli.build_parser().parse_args(["proj", "demo_srv"])
+
+    assert client.forward("init-proj", proj_args) is None
+
+
+def test_daemon_resolves_with_the_client_environment(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Assert the daemon's own $PROJECT_ROOT never redirects a request."""
+    socket_path = str(tmp_path / "bube.sock")
+    project_a = api.scaffold_project("proj_a", tmp_path).root
+    project_b = api.scaffold_project("proj_b", tmp_path).root
+    args = vars(cli.build_parser().parse_args(["exp", "smoke"]))
+    del args["cmd"]
+    monkeypatch.setenv("PROJECT_ROOT", str(project_a))  # < The daemon's .envrc
+    daemon = threading.Thread(target=serve.serve_socket, args=(socket_path,))
+    daemon.start()
+    while not Path(socket_path).exists():
+        time.sleep(0.01)
+
+    try:
+        for project_root, env_root in ((project_b, None), (project_a, project_a)):
+            reply = client.request(
+                {
+                    "command": "add-experim",
+                    "cwd": str(project_b / "src"),
+                    "project_root": env_root and str(env_root),
+                    "project_name": None,
+                    "args": args,
+                },
+                socket_path,
+                timeout=30,
+            )
+            assert reply["status"] == 0, reply
+            assert len(list((project_root / "experiments").glob("*_smoke"))) == 1
+    finally:
+        client.request({"command": "shutdown"}, socket_path, timeout=5)
+        daemon.join(timeout=5)
+
+
+def test_client_reports_a_daemon_that_never_replies(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    """Assert a sent request is never repeated locally, and unknown errors reply."""
+    socket_path = str(tmp_path / "bube.sock")
+    monkeypatch.setenv("BUILDBEN_SOCKET", socket_path)
+    monkeypatch.delenv("BUILDBEN_NO_DAEMON", raising=False)
+    monkeypatch.chdir(tmp_path)
+    proj_args = cli.build_parser().parse_args(["proj", "demo_srv"])
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as listener:
+        listener.bind(socket_path)
+        listener.listen(1)
+
+        def crash() -> None:
+            conn, _ = listener.accept()
+            with conn:
+                conn.recv(65536)  # < Dies before answering
+
+        daemon = threading.Thread(target=crash)
+        daemon.start()
+        try:
+            assert client.forward("init-proj", proj_args) == 1
+        finally:
+            daemon.join(timeout=5)
+    assert "gave no reply" in capsys.readouterr().err
+    assert not (tmp_path / "demo_srv").exists()
+
+    def boom(server: object, message: dict, out: list[str]) -> None:
+        raise KeyError("args")
+
+    monkeypatch.setitem(serve._HANDLERS, "init-proj", boom)
+    reply = serve._dispatch(None, {"command": "init-proj"})  # type: ignore[arg-type]
+    assert reply["status"] == 1
+    assert "KeyError" in reply["stderr"]
@@ -0,0 +1,78 @@
+"""Tests for the content-addressed artifact store."""
+
+from __future__ import annotations
+
+import fcntl
+import json
+import shutil
+from pathlib import Path
+
+import pytest
+
+from buildben import store, utils
+
+
+def test_store_deduplicates_and_collects_unreferenced_blobs(tmp_path: Path) -> None:
+    """Assert equal files share one blob and gc keeps only referenced blobs."""
+    setup_a = tmp_path / "experiments" / "a" / "_setup"
+    setup_b = tmp_path / "experiments" / "b" / "_setup"
+    setup_a.mkdir(parents=True)
+    setup_b.mkdir(parents=True)
+    for content, name in ((b"wheel", "x.whl"), (b"wheel", "y.whl"), (b"sdist", "z")):
+        (tmp_path / name).write_bytes(content)
+    wheel = store.add(tmp_path, tmp_path / "x.whl")
+    assert store.add(tmp_path, tmp_path / "y.whl") == wheel
+    sdist = store.add(tmp_path, tmp_path / "z")
+    assert not (tmp_path / "x.whl").exists()
+
+    store.link(tmp_path, wheel, setup_a / "demo.whl")
+    store.link(tmp_path, wheel, setup_b / "demo.whl")
+    store.link(tmp_path, sdist, setup_b / "demo.tar.gz")
+    assert (setup_a / "demo.whl").stat().st_ino == (setup_b / "demo.whl").stat().st_ino
+    assert (setup_a / "demo.whl").read_bytes() == b"wheel"
+
+    assert store.gc(tmp_path) == (0, 0, 2)
+    shutil.rmtree(setup_b.parent)
+    assert store.gc(tmp_path, dry_run=True) == (1, len(b"sdist"), 1)
+    assert store.has_blobs(tmp_path, [wheel, sdist])
+    assert store.gc(tmp_path) == (1, len(b"sdist"), 1)
+    assert not store.has_blobs(tmp_path, [sdist])
+
+    (setup_a / "demo.whl").unlink()
+    (setup_a / "demo.whl").write_bytes(b"rebuilt by hand")  # < No longer a ref
+    assert store.gc(tmp_path) == (1, len(b"wheel"), 0)
+
+
+def test_gc_keeps_cached_blobs_and_waits_for_writers(tmp_path: Path) -> None:
+    """Assert cache entries are gc roots and gc excludes running snapshots."""
+    (tmp_path / "wheel").write_bytes(b"wheel")
+    wheel = store.add(tmp_path, tmp_path / "wheel")
+    cache_entry = tmp_path / store.BUILD_CACHE_RELPATH / "key.json"
+    cache_entry.parent.mkdir(parents=True)
+    cache_entry.write_text(json.dumps({"demo.whl": wheel}), encoding="utf-8")
+    assert store.gc(tmp_path) == (0, 0, 1)
+    cache_entry.unlink()
+
+    with (
+        store.locked(tmp_path),
+        open(tmp_path / store.STORE_RELPATH / ".lock", "ab") as lock_file,
+        pytest.raises(BlockingIOError),  # < What gc would wait for
+    ):
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    assert store.gc(tmp_path) == (1, len(b"wheel"), 0)
+
+
+def test_link_many_records_nothing_if_placing_fails(tmp_path: Path) -> None:
+    """Assert references are committed together with their hardlinks."""
+    (tmp_path / "wheel").write_bytes(b"wheel")
+    wheel = store.add(tmp_path, tmp_path / "wheel")
+    setup_dir = tmp_path / "experiments" / "a" / "_setup"
+    setup_dir.mkdir(parents=True)
+
+    with pytest.raises(utils.ScaffoldError):
+        store.link_many(
+            tmp_path, [(setup_dir / "a.whl", wheel), (tmp_path / "gone" / "b", wheel)]
+        )
+    (setup_dir / "a.whl").unlink()
+    store.link(tmp_path, wheel, setup_dir / "a.whl")
+    assert store.gc(tmp_path) == (0, 0, 1)
@@ -0,0 +1,46 @@
+"""Tests for precompiled template bundles."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from buildben import template_bundle, utils
+from buildben.init_proj import _project_placeholders
+
+
+@pytest.mark.parametrize("tmpl_name", ["_templates_proj", "_templates_experim"])
+def test_bundle_render_matches_directory_render(tmpl_name: str, tmp_path: Path) -> None:
+    """Assert splicing at bundled offsets equals searching the template files."""
+    tmpl_dir = template_bundle.TEMPLATE_ROOT / tmpl_name
+    bundle = template_bundle.TemplateBundle(
+        template_bundle.write_bundle(tmpl_dir, tmp_path)
+    )
+    engine = utils.PlaceholderEngine(
+        {
+            **_project_placeholders("bundle_demo", "octocat"),
+            "<experiment_name>": "smoke",
+            "<experiment name>": "smoke",
+            "<experiment_name_full>": "2026-01-01_smoke",
+        }
+    )
+    assert bundle.supports(engine)
+
+    for tmpl_fp in sorted(tmpl_dir.iterdir()):
+        from_dir = tmp_path / f"dir{tmpl_fp.name}"
+        from_bundle = tmp_path / f"bundle{tmpl_fp.name}"
+        dir_result = utils.render_template(tmpl_fp, from_dir, engine)
+        bundle_result = bundle.render(tmpl_fp.name, from_bundle, engine)
+
+        assert from_bundle.read_bytes() == from_dir.read_bytes(), tmpl_fp.name
+        assert bundle_result == dir_result
+        assert bundle_result.sha256 == utils.sha256_file(from_bundle)
+        assert from_bundle.stat().st_mode == from_dir.stat().st_mode
+
+
+def test_bundle_rejects_keys_without_token_shape() -> None:
+    """Assert engines with unbundled key shapes fall back to searching."""
+    assert not template_bundle.TemplateBundle.supports(
+        utils.PlaceholderEngine({"MY_PROJECT": "demo"})
+    )
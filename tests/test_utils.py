@@ -0,0 +1,207 @@
+"""Unit tests for buildben.utils helpers."""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import pytest
+
+from buildben import utils
+
+
+def test_placeholder_engine_renders_in_one_pass_with_hit_counts() -> None:
+    """Assert every placeholder is replaced and counted in a single scan."""
+    engine = utils.PlaceholderEngine(
+        {
+            "<experiment_name>": "smoke",
+            "<experiment_name_full>": "2026-01-01_smoke",
+            "{my_project}": "demo",
+        }
+    )
+
+    rendered, hits = engine.render(
+        "<experiment_name_full> <experiment_name> {my_project} {my_project}"
+    )
+
+    assert rendered == "2026-01-01_smoke smoke demo demo"
+    assert hits == {
+        "<experiment_name_full>": 1,
+        "<experiment_name>": 1,
+        "{my_project}": 2,
+    }
+
+
+def test_placeholder_engine_shares_pattern_across_values() -> None:
+    """Assert engines with the same keys reuse one compiled matcher."""
+    first = utils.PlaceholderEngine({"<a>": "1", "<b>": "2"})
+    second = utils.PlaceholderEngine({"<b>": "x", "<a>": "y"})
+
+    assert first.pattern is second.pattern
+    assert utils.PlaceholderEngine({}).render("<a>") == ("<a>", {})
+
+
+def test_substitute_placeholders_reports_hits_per_file(tmp_path: Path) -> None:
+    """Assert files are rewritten in place and hits are reported per file."""
+    with_hits = tmp_path / "with_hits.txt"
+    without_hits = tmp_path / "without_hits.txt"
+    with_hits.write_text("name = <my_project>\n", encoding="utf-8")
+    without_hits.write_text("plain\n", encoding="utf-8")
+
+    hits = utils.substitute_placeholders(
+        [with_hits, without_hits], {"<my_project>": "demo"}
+    )
+
+    assert with_hits.read_text(encoding="utf-8") == "name = demo\n"
+    assert hits[with_hits] == {"<my_project>": 1}
+    assert not hits[without_hits]
+
+
+def test_render_templates_substitutes_and_keeps_modes(tmp_path: Path) -> None:
+    """Assert templates are rendered in one stage with modes and binaries kept."""
+    tmpl_dir = tmp_path / "templates"
+    out_dir = tmp_path / "out"
+    tmpl_dir.mkdir()
+    out_dir.mkdir()
+    (tmpl_dir / "_script.sh").write_text("echo <my_project>\n", encoding="utf-8")
+    (tmpl_dir / "_script.sh").chmod(0o755)
+    (tmpl_dir / "_plain.txt").write_text("no placeholders\n", encoding="utf-8")
+    (tmpl_dir / "_logo.bin").write_bytes(b"\x89PNG\xff\x00<my_project>")
+
+    results = utils.render_templates(
+        transfers={
+            "_script.sh": out_dir / "script.sh",
+            "_plain.txt": out_dir / "plain.txt",
+            "_logo.bin": out_dir / "logo.bin",
+        },
+        tmpl_dir=tmpl_dir,
+        placeholders={"<my_project>": "demo"},
+    )
+
+    assert (out_dir / "script.sh").read_text(encoding="utf-8") == "echo demo\n"
+    assert (out_dir / "script.sh").stat().st_mode & 0o777 == 0o755
+    assert (out_dir / "plain.txt").read_text(encoding="utf-8") == "no placeholders\n"
+    assert (out_dir / "logo.bin").read_bytes() == b"\x89PNG\xff\x00<my_project>"
+    assert results[out_dir / "script.sh"].hits == {"<my_project>": 1}
+    assert results[out_dir / "script.sh"].size == len(b"echo demo\n")
+    assert results[out_dir / "logo.bin"].sha256 == utils.sha256_file(
+        out_dir / "logo.bin"
+    )
+    assert not results[out_dir / "logo.bin"].hits
+
+
+def test_run_parallel_aggregates_failures_in_path_order(tmp_path: Path) -> None:
+    """Assert all tasks run and failures are reported sorted by path."""
+    ran: list[str] = []
+
+    def _ok(name: str) -> str:
+        ran.append(name)
+        return name
+
+    def _fail(name: str) -> str:
+        ran.append(name)
+        raise OSError(f"cannot write {name}")
+
+    tasks = {
+        tmp_path / "c": lambda: _fail("c"),
+        tmp_path / "a": lambda: _fail("a"),
+        tmp_path / "b": lambda: _ok("b"),
+    }
+
+    with pytest.raises(utils.ScaffoldError) as exc_info:
+        utils.run_parallel(tasks, jobs=3)
+
+    assert sorted(ran) == ["a", "b", "c"]
+    assert [path.name for path, _ in exc_info.value.failures] == ["a", "c"]
+    assert utils.run_parallel({tmp_path / "b": lambda: "ok"}, jobs=3) == {
+        tmp_path / "b": "ok"
+    }
+
+
+def test_staged_directory_publishes_complete_tree(tmp_path: Path) -> None:
+    """Assert staged trees appear at once and leave no staging directory."""
+    final_dir = tmp_path / "proj"
+
+    with utils.staged_directory(final_dir, durable=True, jobs=2) as staging_dir:
+        assert staging_dir.parent == tmp_path
+        (staging_dir / "src").mkdir()
+        (staging_dir / "src" / "main.py").write_text("x = 1\n", encoding="utf-8")
+        assert not final_dir.exists()
+
+    assert (final_dir / "src" / "main.py").read_text(encoding="utf-8") == "x = 1\n"
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["proj"]
+
+
+def test_staged_directory_discards_failed_scaffold(tmp_path: Path) -> None:
+    """Assert an interrupted scaffold leaves neither project nor staging dir."""
+    final_dir = tmp_path / "proj"
+
+    with (
+        pytest.raises(KeyboardInterrupt),
+        utils.staged_directory(final_dir) as staging_dir,
+    ):
+        (staging_dir / "half.txt").write_text("partial", encoding="utf-8")
+        raise KeyboardInterrupt
+
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_staged_directory_merges_into_existing_dir(tmp_path: Path) -> None:
+    """Assert confirmed overwrites replace files and keep unrelated ones."""
+    final_dir = tmp_path / "proj"
+    final_dir.mkdir()
+    (final_dir / "keep.txt").write_text("mine", encoding="utf-8")
+    (final_dir / "justfile").write_text("old", encoding="utf-8")
+
+    with utils.staged_directory(final_dir) as staging_dir:
+        (staging_dir / "justfile").write_text("new", encoding="utf-8")
+
+    assert (final_dir / "keep.txt").read_text(encoding="utf-8") == "mine"
+    assert (final_dir / "justfile").read_text(encoding="utf-8") == "new"
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["proj"]
+
+
+def test_locate_project_root_caches_and_invalidates(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Assert lookups report the sentinel, hit the cache and see new sentinels."""
+    monkeypatch.setenv("BUILDBEN_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.delenv("PROJECT_ROOT", raising=False)
+    monkeypatch.setattr(utils, "_root_cache", None)
+    proj = tmp_path / "proj"
+    deep = proj / "src" / "pkg"
+    deep.mkdir(parents=True)
+    (proj / "pyproject.toml").write_text("", encoding="utf-8")
+    for directory in (deep, deep.parent, proj):
+        os.utime(directory, ns=(1_000_000_000, 1_000_000_000))  # < Not racy
+
+    assert utils.locate_project_root(deep) == (proj, "pyproject.toml")
+    assert (tmp_path / "cache" / "project-roots.json").is_file()
+
+    monkeypatch.setattr(utils, "_root_cache", None)  # < Next process
+    with monkeypatch.context() as m:
+        m.setattr(os, "scandir", None)  # < A cache hit lists nothing
+        assert utils.find_project_root(deep) == proj
+
+    (deep / "setup.py").write_text("", encoding="utf-8")  # < Bumps deep's mtime
+    assert utils.locate_project_root(deep) == (deep, "setup.py")
+    with pytest.raises(utils.ProjectRootNotFoundError):
+        utils.locate_project_root(tmp_path / "cache", sentinels=("no-such-file",))
+
+
+def test_locate_project_root_resolves_symlinks(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Assert a symlinked start directory finds the root of its target."""
+    monkeypatch.setenv("BUILDBEN_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.delenv("PROJECT_ROOT", raising=False)
+    monkeypatch.setattr(utils, "_root_cache", None)
+    proj = tmp_path / "proj"
+    (proj / "src").mkdir(parents=True)
+    (proj / "pyproject.toml").write_text("", encoding="utf-8")
+    outside = tmp_path / "outside"
+    outside.mkdir()
+    (outside / "src").symlink_to(proj / "src", target_is_directory=True)
+    (outside / "setup.py").write_text("", encoding="utf-8")  # < Not its root
+
+    assert utils.locate_project_root(outside / "src") == (proj, "pyproject.toml")